@@ -25,6 +25,15 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = SQLModel.metadata
 
+# Schema objects managed by hand-written migrations (PostgreSQL-only search
+# column/indexes) that are intentionally absent from the SQLModel metadata.
+UNMANAGED_OBJECTS = {"searchVector", "ix_novel_search_vector", "ix_novel_title_trgm"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return name not in UNMANAGED_OBJECTS
+
+
 # Override sqlalchemy.url with DATABASE_URL from environment
 _database_url = os.environ.get("DATABASE_URL", config.get_main_option("sqlalchemy.url"))
 if _database_url and _database_url.startswith("postgresql://"):
@@ -38,6 +47,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -47,7 +57,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,43 @@
+"""add novel full text search
+
+Revision ID: a4d9c2e7f1b3
+Revises: 12aba248c961
+Create Date: 2026-10-17 10:12:31.204518
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d9c2e7f1b3'
+down_revision: str | Sequence[str] | None = '12aba248c961'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Generated tsvector (title > author > synopsis) + GIN, and a trigram
+    # index on title for fuzzy/substring matches. PostgreSQL only.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        """
+        ALTER TABLE novel ADD COLUMN "searchVector" tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(author, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(synopsis, '')), 'C')
+        ) STORED
+        """
+    )
+    op.execute('CREATE INDEX ix_novel_search_vector ON novel USING gin ("searchVector")')
+    op.execute("CREATE INDEX ix_novel_title_trgm ON novel USING gin (title gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_novel_title_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_novel_search_vector")
+    op.execute('ALTER TABLE novel DROP COLUMN IF EXISTS "searchVector"')
@@ -0,0 +1,36 @@
+"""partial reset token index
+
+Revision ID: a7d3e5c2f816
+Revises: f1c7d94b2e36
+Create Date: 2026-10-17 18:05:12.447301
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e5c2f816'
+down_revision: str | Sequence[str] | None = 'f1c7d94b2e36'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Expired tokens are useless; clear them so the partial index starts small
+    op.execute(
+        'UPDATE "user" SET "resetTokenHash" = NULL, "resetTokenExpires" = NULL '
+        'WHERE "resetTokenHash" IS NOT NULL '
+        'AND ("resetTokenExpires" IS NULL OR "resetTokenExpires" <= now() AT TIME ZONE \'utc\')'
+    )
+    op.drop_index(op.f('ix_user_resetTokenHash'), table_name='user')
+    op.create_index('ix_user_resetTokenHash', 'user', ['resetTokenHash'], unique=False, postgresql_where=sa.text('"resetTokenHash" IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_resetTokenHash', table_name='user', postgresql_where=sa.text('"resetTokenHash" IS NOT NULL'))
+    op.create_index(op.f('ix_user_resetTokenHash'), 'user', ['resetTokenHash'], unique=False)
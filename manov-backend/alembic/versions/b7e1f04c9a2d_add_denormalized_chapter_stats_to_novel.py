@@ -0,0 +1,46 @@
+"""add denormalized chapter stats to novel
+
+Revision ID: b7e1f04c9a2d
+Revises: a4d9c2e7f1b3
+Create Date: 2026-10-17 11:03:57.418220
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1f04c9a2d'
+down_revision: str | Sequence[str] | None = 'a4d9c2e7f1b3'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('novel', sa.Column('chapterCount', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('novel', sa.Column('latestChapterNum', sa.Integer(), nullable=True))
+    op.add_column('novel', sa.Column('latestChapterAt', sa.DateTime(), nullable=True))
+
+    # Backfill (same computation as crud.sync_novel_chapter_stats)
+    op.execute(
+        """
+        UPDATE novel SET
+            "chapterCount" = (SELECT count(*) FROM chapter WHERE chapter."novelId" = novel.id),
+            "latestChapterNum" = (SELECT max(chapter."chapterNum") FROM chapter WHERE chapter."novelId" = novel.id),
+            "latestChapterAt" = (
+                SELECT max(chaptertranslation."createdAt")
+                FROM chaptertranslation JOIN chapter ON chaptertranslation."chapterId" = chapter.id
+                WHERE chapter."novelId" = novel.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('novel', 'latestChapterAt')
+    op.drop_column('novel', 'latestChapterNum')
+    op.drop_column('novel', 'chapterCount')
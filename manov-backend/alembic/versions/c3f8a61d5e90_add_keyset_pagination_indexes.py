@@ -0,0 +1,35 @@
+"""add keyset pagination indexes
+
+Revision ID: c3f8a61d5e90
+Revises: b7e1f04c9a2d
+Create Date: 2026-10-17 11:48:20.663105
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a61d5e90'
+down_revision: str | Sequence[str] | None = 'b7e1f04c9a2d'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_novel_updatedAt_id', 'novel', ['updatedAt', 'id'], unique=False)
+    op.create_index('ix_review_novelId_createdAt_id', 'review', ['novelId', 'createdAt', 'id'], unique=False)
+    op.create_index('ix_comment_novelId_createdAt_id', 'comment', ['novelId', 'createdAt', 'id'], unique=False)
+    op.create_index('ix_comment_chapterId_createdAt_id', 'comment', ['chapterId', 'createdAt', 'id'], unique=False)
+    op.create_index('ix_notification_userId_createdAt_id', 'notification', ['userId', 'createdAt', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notification_userId_createdAt_id', table_name='notification')
+    op.drop_index('ix_comment_chapterId_createdAt_id', table_name='comment')
+    op.drop_index('ix_comment_novelId_createdAt_id', table_name='comment')
+    op.drop_index('ix_review_novelId_createdAt_id', table_name='review')
+    op.drop_index('ix_novel_updatedAt_id', table_name='novel')
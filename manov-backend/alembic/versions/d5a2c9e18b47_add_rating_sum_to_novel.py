@@ -0,0 +1,50 @@
+"""add rating sum to novel
+
+Revision ID: d5a2c9e18b47
+Revises: c3f8a61d5e90
+Create Date: 2026-10-17 13:12:40.551803
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a2c9e18b47'
+down_revision: str | Sequence[str] | None = 'c3f8a61d5e90'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('novel', sa.Column('ratingSum', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill all three aggregates (same computation as crud.reconcile_novel_rating_stats):
+    # every review counts, a legacy rating only when that user has no review.
+    op.execute(
+        """
+        WITH scores AS (
+            SELECT review."novelId" AS novel_id, review.score AS score FROM review
+            UNION ALL
+            SELECT rating."novelId", rating.score FROM rating
+            WHERE NOT EXISTS (
+                SELECT 1 FROM review
+                WHERE review."userId" = rating."userId" AND review."novelId" = rating."novelId"
+            )
+        )
+        UPDATE novel SET
+            "ratingSum" = (SELECT coalesce(sum(score), 0) FROM scores WHERE scores.novel_id = novel.id),
+            "ratingCount" = (SELECT count(score) FROM scores WHERE scores.novel_id = novel.id),
+            "averageRating" = (
+                SELECT coalesce(avg(CAST(score AS FLOAT)), 0) FROM scores WHERE scores.novel_id = novel.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('novel', 'ratingSum')
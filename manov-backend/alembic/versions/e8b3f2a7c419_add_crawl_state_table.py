@@ -0,0 +1,51 @@
+"""add crawl state table
+
+Revision ID: e8b3f2a7c419
+Revises: d5a2c9e18b47
+Create Date: 2026-10-17 15:02:11.204816
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3f2a7c419'
+down_revision: str | Sequence[str] | None = 'd5a2c9e18b47'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('crawlstate',
+    sa.Column('novelId', sa.Integer(), nullable=False),
+    sa.Column('lastUrl', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('lastChapterNum', sa.Integer(), nullable=True),
+    sa.Column('nextUrl', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('lastSuccessAt', sa.DateTime(), nullable=True),
+    sa.Column('errorCount', sa.Integer(), nullable=False),
+    sa.Column('lastError', sa.Text(), nullable=True),
+    sa.Column('updatedAt', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['novelId'], ['novel.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('novelId')
+    )
+
+    # Seed from each novel's newest chapter, which is what resume used to look up.
+    # nextUrl is unknown, so the first resume re-reads that chapter for its next link.
+    op.execute(
+        """
+        INSERT INTO crawlstate ("novelId", "lastUrl", "lastChapterNum", "lastSuccessAt", "errorCount", "updatedAt")
+        SELECT novel.id, chapter."sourceUrl", chapter."chapterNum", novel."latestChapterAt", 0, CURRENT_TIMESTAMP
+        FROM novel
+        JOIN chapter ON chapter."novelId" = novel.id AND chapter."chapterNum" = novel."latestChapterNum"
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('crawlstate')
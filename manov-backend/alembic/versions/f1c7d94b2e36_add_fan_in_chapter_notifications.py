@@ -0,0 +1,45 @@
+"""add fan-in chapter notifications
+
+Revision ID: f1c7d94b2e36
+Revises: e8b3f2a7c419
+Create Date: 2026-10-17 16:40:27.918532
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7d94b2e36'
+down_revision: str | Sequence[str] | None = 'e8b3f2a7c419'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('novelchapterevent',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('novelId', sa.Integer(), nullable=False),
+    sa.Column('chapterId', sa.Integer(), nullable=False),
+    sa.Column('chapterNum', sa.Integer(), nullable=False),
+    sa.Column('message', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('createdAt', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['chapterId'], ['chapter.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['novelId'], ['novel.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_novelchapterevent_chapterId'), 'novelchapterevent', ['chapterId'], unique=False)
+    op.create_index('ix_novelchapterevent_novelId_createdAt_id', 'novelchapterevent', ['novelId', 'createdAt', 'id'], unique=False)
+    op.add_column('library', sa.Column('lastSeenAt', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('library', 'lastSeenAt')
+    op.drop_index('ix_novelchapterevent_novelId_createdAt_id', table_name='novelchapterevent')
+    op.drop_index(op.f('ix_novelchapterevent_chapterId'), table_name='novelchapterevent')
+    op.drop_table('novelchapterevent')
@@ -4,9 +4,17 @@ import os
 
 from sqlmodel import select
 
+from app.crud import (
+    get_crawl_state,
+    record_crawl_error,
+    record_crawl_success,
+    sync_novel_chapter_stats,
+)
 from app.database import AsyncSessionLocal, engine
 from app.models import Chapter, ChapterTranslation, Novel
 from app.services.scraper_crawler import NovelCrawler
+from app.services.translation_cache import TranslationCache
+from app.services.translation_pool import TranslationJob, TranslationPool
 from app.services.translator import LLMTranslator
 from app.utils.slug import generate_slug
 
@@ -103,7 +111,8 @@ async def main():
         print(f"🔗 Slug: {novel_slug}")
 
         # 2. Init Database & Translator
-        translator = LLMTranslator()
+        translator = LLMTranslator(cache=TranslationCache())
+        pool = TranslationPool(translator)
 
         # 3. Ensure Novel Entry Exists
         novel = await retry_async_op(
@@ -142,70 +151,17 @@ async def main():
         # 4. Start Crawling (Sync Blocking)
         print("\n🕷️  Starting Crawler (This might take a while)...")
 
-        # Check for last chapter in DB or Local Files to resume
+        # Resume from the novel's crawl state (one primary-key lookup)
         crawler_start_url = START_URL
         start_chapter_num = metadata.get("chapter_num", 1)
 
-        # A. Check Database
-        last_db_chapter = await retry_async_op(
-            session.scalar,
-            select(Chapter)
-            .where(Chapter.novelId == novel.id)
-            .order_by(Chapter.chapterNum.desc())
-            .limit(1),
-        )
-
-        # B. Check Local Files
-        last_local_chapter_num = 0
-        last_local_url = None
-
-        if os.path.exists(novel_data_folder):
-            files = sorted([f for f in os.listdir(novel_data_folder) if f.endswith(".json")])
-            if files:
-                for f in reversed(files):
-                    try:
-                        num = int(f.split("_")[1].split(".")[0])
-                        if num > last_local_chapter_num:
-                            last_local_chapter_num = num
-                            with open(os.path.join(novel_data_folder, f), encoding="utf-8") as jf:
-                                d = json.load(jf)
-                                if "source_url" in d:
-                                    last_local_url = d["source_url"]
-                                    break
-                    except Exception:
-                        pass
-
-        print(
-            f"📊 State Check: DB Last={last_db_chapter.chapterNum if last_db_chapter else 'None'} | Local Last={last_local_chapter_num}"
-        )
-
-        # Decision Logic: Use the furthest point
-        resume_candidate_url = None
-        resume_candidate_num = 0
-
-        if last_db_chapter and last_db_chapter.chapterNum >= last_local_chapter_num:
-            resume_candidate_num = last_db_chapter.chapterNum
-            resume_candidate_url = last_db_chapter.sourceUrl
-            print("👉 Resuming from DATABASE record.")
-        elif last_local_chapter_num > 0 and last_local_url:
-            resume_candidate_num = last_local_chapter_num
-            resume_candidate_url = last_local_url
-            print("👉 Resuming from LOCAL FILES (cached).")
-
-        if resume_candidate_url:
-            print(f"🔄 Auto-Resuming Crawler from Chapter {resume_candidate_num}...")
-            print(f"   URL: {resume_candidate_url}")
-            crawler_start_url = resume_candidate_url
-
-            print("   🕵️  Verifying real chapter number from URL...")
-            resume_metadata = await asyncio.to_thread(extract_novel_metadata, crawler_start_url)
-            if resume_metadata and "chapter_num" in resume_metadata:
-                real_num = resume_metadata["chapter_num"]
-                print(f"   ✅ Real Chapter Number on Page: {real_num}")
-                start_chapter_num = real_num
-            else:
-                print("   ⚠️ Could not verify real number, falling back to candidate logic.")
-                start_chapter_num = resume_candidate_num
+        state = await retry_async_op(get_crawl_state, session, novel.id)
+        if state and (state.nextUrl or state.lastUrl):
+            crawler_start_url = state.nextUrl or state.lastUrl
+            # nextUrl is the chapter after lastChapterNum; lastUrl is re-checked at the end
+            start_chapter_num = state.lastChapterNum + (1 if state.nextUrl else 0)
+            print(f"🔄 Auto-Resuming Crawler after Chapter {state.lastChapterNum}...")
+            print(f"   URL: {crawler_start_url}")
 
         crawler = NovelCrawler(output_dir=novel_data_folder)
         await asyncio.to_thread(
@@ -215,9 +171,15 @@ async def main():
             start_counter=start_chapter_num,
         )
 
-        # 5. Process & Translate (Async Loop)
+        # 5. Process & Translate (parallel translation, sequential commits)
         print("\n📝 Processing & Translating Chapters...")
         files = sorted(os.listdir(novel_data_folder))
+        existing = set(
+            await retry_async_op(
+                session.scalars, select(Chapter.chapterNum).where(Chapter.novelId == novel.id)
+            )
+        )
+        jobs: list[TranslationJob] = []
 
         for filename in files:
             if not filename.endswith(".json"):
@@ -230,40 +192,34 @@ async def main():
             except Exception:
                 continue
 
-            existing_chapter = await retry_async_op(
-                session.scalar,
-                select(Chapter).where(
-                    Chapter.novelId == novel.id,
-                    Chapter.chapterNum == chapter_num,
-                ),
-            )
-
-            if existing_chapter:
+            if chapter_num in existing:
                 print(f"⏭️  Chapter {chapter_num} exist. Skipping.")
                 continue
 
-            print(f"🔨 Processing Chapter {chapter_num}...")
-
             with open(filepath, encoding="utf-8") as f:
                 data = json.load(f)
+            jobs.append(TranslationJob(chapter_num, data["title"], data["content"], payload=data))
+
+        print(f"   🤖 Translating {len(jobs)} chapters, {pool.concurrency} at a time...")
+        async for result in pool.translate_in_order(jobs):
+            chapter_num = result.job.chapter_num
+            data = result.job.payload
+            if not result.ok:
+                print(f"   ❌ Translation of Chapter {chapter_num} failed: {result.error}")
+                await record_crawl_error(
+                    session, novel.id, f"Ch {chapter_num} translation: {result.error}"
+                )
+                continue
 
-            raw_content = data["content"]
-            raw_title = data["title"]
-            source_url = data.get("source_url")
-
-            print("   🤖 Translating Title & Content...")
-            translated_title = await retry_async_op(translator.translate, raw_title)
-            translated_content = await retry_async_op(translator.translate, raw_content)
-
-            print("   💾 Saving to Postgres...")
+            print(f"   💾 Saving Chapter {chapter_num} to Postgres...")
 
             try:
                 new_chapter = Chapter(
                     novelId=novel.id,
                     chapterNum=chapter_num,
-                    rawTitle=raw_title,
-                    rawContent=raw_content,
-                    sourceUrl=source_url,
+                    rawTitle=data["title"],
+                    rawContent=data["content"],
+                    sourceUrl=data.get("source_url"),
                 )
                 session.add(new_chapter)
                 await session.commit()
@@ -272,16 +228,26 @@ async def main():
                 translation = ChapterTranslation(
                     chapterId=new_chapter.id,
                     language="EN",
-                    title=translated_title,
-                    content=translated_content,
+                    title=result.title,
+                    content=result.content,
                 )
                 session.add(translation)
+                await session.flush()
+                await sync_novel_chapter_stats(session, [novel.id])
+                await record_crawl_success(
+                    session, novel.id, chapter_num, data.get("source_url"), data.get("next_url")
+                )
                 await session.commit()
             except Exception as e:
                 print(f"   ❌ FAILED to save Chapter {chapter_num}: {e}")
+                await session.rollback()
                 continue
 
-            print(f"✅ Chapter {chapter_num} Done!")
+            print(f"✅ Chapter {chapter_num} Done! ({result.elapsed:.1f}s)")
+
+        if jobs:
+            print(f"📈 Translation: {pool.metrics.summary()}")
+            print(f"🧠 Translation memory: {translator.cache.summary()}")
 
     await engine.dispose()
     print("\n🎉 Batch Processing Complete!")
@@ -15,6 +15,54 @@ class Settings(BaseSettings):
     FRONTEND_URL: str = "https://manov.pascarz.site"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 1 week
     RESET_TOKEN_EXPIRE_MINUTES: int = 60  # 1 hour
+    JWT_BACKEND: str = "jose"  # "jose" | "pyjwt" (opt-in, optional install); "auto" = jose
+    JWT_DECODE_CACHE_SIZE: int = 4096  # verified tokens kept until their exp; 0 disables
+    RESET_TOKEN_SWEEP_SECONDS: float = 600.0  # how often expired reset tokens are cleared
+    RESET_TOKEN_SWEEP_BATCH: int = 500  # users updated per sweep transaction
+
+    # Password hashing (bcrypt, off the event loop)
+    BCRYPT_ROUNDS: int = 12  # cost factor; older hashes are upgraded on login
+    PASSWORD_HASH_WORKERS: int = 2  # threads running bcrypt
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # waiting calls before logins get 503
+
+    # API keys (MCP agents): verified keys cached per worker, lastUsedAt written in batches
+    API_KEY_CACHE_TTL_SECONDS: float = 30.0  # also the worst-case revocation lag across workers
+    API_KEY_CACHE_MAX_ENTRIES: int = 1024
+    API_KEY_LAST_USED_FLUSH_SECONDS: float = 60.0
+
+    # View counting (write-behind buffer)
+    VIEW_COUNTER_BACKEND: str = "memory"  # "memory" | "redis"
+    VIEW_COUNT_FLUSH_SECONDS: float = 10.0
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Crawler (shared async Playwright browser)
+    CRAWL_BROWSER_PAGES: int = 2  # pages in the pool = novels crawled at once
+    CRAWL_HEADLESS: bool = False  # headed so Cloudflare can be solved by hand
+    CRAWL_DELAY_MIN: float = 2.0  # per-host politeness delay, seconds
+    CRAWL_DELAY_MAX: float = 4.0
+    CRAWL_PREFETCH: int = 2  # fetched pages buffered ahead of the consumer
+    CRAWL_PARSE_WORKERS: int = 2  # threads cleaning chapter HTML
+    CRAWL_HTTP_FAST_PATH: bool = True  # try plain HTTP before rendering in the browser
+    CRAWL_HTTP_TIMEOUT: float = 20.0
+    CRAWL_HTTP_MAX_CONNECTIONS: int = 10
+    CHAPTER_PARSER: str = "auto"  # "auto" | "selectolax" | "lxml" | "bs4"
+
+    # Translation (local LLM server)
+    TRANSLATION_CONCURRENCY: int = 4  # chapters translated in parallel
+    TRANSLATION_REQUEST_TIMEOUT: float = 300.0  # seconds per LLM request
+    TRANSLATION_CHAPTER_TIMEOUT: float = 900.0  # seconds per chapter (all passes)
+    TRANSLATION_CHUNK_TOKENS: int = 1500  # paragraph-chunk budget per LLM prompt
+    TRANSLATION_MAX_PARALLEL_REQUESTS: int = 4  # in-flight LLM requests per translator
+    TRANSLATION_CACHE_PATH: str = "translation_cache.db"  # SQLite translation memory
+    TRANSLATION_CACHE_MAX_ENTRIES: int = 200_000  # chapters + paragraphs, LRU evicted
+
+    # Notifications
+    NOTIFICATION_MODE: str = "fanout"  # "fanout" (row per follower) | "fanin" (row per chapter)
+    NOTIFICATION_FANIN_WINDOW_DAYS: int = 30  # chapter events older than this drop out of feeds
+
+    # Admin NDJSON chapter ingestion (POST /admin/novels/{id}/chapters/stream)
+    ADMIN_INGEST_BATCH_SIZE: int = 100  # chapters validated + inserted per commit
+    ADMIN_INGEST_MAX_LINE_BYTES: int = 1_048_576  # one chapter per line
 
 
 settings = Settings()
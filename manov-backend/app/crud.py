@@ -1,25 +1,39 @@
 """Reusable async CRUD operations."""
 
-from sqlalchemy import func, or_
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta
+
+from sqlalchemy import Float, and_, bindparam, case, cast, func, insert, literal, or_, union_all
 from sqlalchemy import update as sa_update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 from sqlmodel import delete, select
 
+from app.config import settings
 from app.models import (
+    ApiKey,
     Chapter,
     ChapterTranslation,
     Comment,
+    CrawlState,
     Genre,
     History,
     Library,
     Notification,
     Novel,
+    NovelChapterEvent,
     NovelGenreLink,
     Rating,
     Review,
     User,
+    utc_now,
 )
+from app.utils.cursor import encode_cursor, keyset_after, next_cursor, source_keyset_after
+from app.utils.search import novel_search_filter, novel_search_order
+
+# Values per IN (...) list; keeps bind parameters well under the PostgreSQL
+# (32767) and SQLite (32766) limits. Multi-row INSERTs are paged by SQLAlchemy.
+BULK_INSERT_BATCH = 1000
 
 
 # ---------------------------------------------------------------------------
@@ -41,18 +55,15 @@ async def get_novels(
     sort_order: str = "desc",
     status: str = "",
     genre_id: int = 0,
-) -> list[tuple[Novel, int]]:
-    chapter_count_subq = (
-        select(func.count(Chapter.id))
-        .where(Chapter.novelId == Novel.id)
-        .correlate(Novel)
-        .scalar_subquery()
-    )
+    cursor: str = "",
+) -> tuple[list[Novel], str | None]:
+    """Return a page of novels and the cursor for the next page.
 
-    query = (
-        select(Novel, chapter_count_subq.label("chapter_count"))
-        .options(selectinload(Novel.genres))
-    )
+    ``cursor`` (from a previous call) switches to keyset pagination on
+    ``(sort_by, id)``; it is only supported for non-nullable sort columns
+    and raises ``ValueError`` otherwise or when malformed.
+    """
+    query = select(Novel).options(selectinload(Novel.genres))
 
     # --- Filters ---
     if status:
@@ -67,56 +78,44 @@ async def get_novels(
             )
         )
 
-    # --- Sorting ---
-    sort_column = getattr(Novel, sort_by, Novel.updatedAt)
-    if sort_order == "asc":
-        query = query.order_by(sort_column.asc())
+    # --- Sorting (id breaks ties so keyset pages are stable) ---
+    sort_column = Novel.__table__.c.get(sort_by, Novel.__table__.c.updatedAt)
+    descending = sort_order != "asc"
+    if cursor:
+        if sort_column.nullable:
+            raise ValueError(f"Cursor pagination is not supported for sort_by={sort_by}")
+        query = query.where(keyset_after(sort_column, Novel.id, cursor, descending))
+    if descending:
+        query = query.order_by(sort_column.desc(), Novel.id.desc())
     else:
-        query = query.order_by(sort_column.desc())
+        query = query.order_by(sort_column.asc(), Novel.id.asc())
 
     query = query.offset(skip).limit(limit)
     result = await session.execute(query)
-    return list(result.all())
+    novels = list(result.scalars().all())
+    if sort_column.nullable:
+        return novels, None
+    return novels, next_cursor(novels, limit, sort_column.name)
 
 
 async def search_novels(
     session: AsyncSession, query: str, skip: int = 0, limit: int = 20
-) -> list[tuple[Novel, int]]:
-    chapter_count_subq = (
-        select(func.count(Chapter.id))
-        .where(Chapter.novelId == Novel.id)
-        .correlate(Novel)
-        .scalar_subquery()
-    )
-
-    search_pattern = f"%{query}%"
+) -> list[Novel]:
+    # Full-text + trigram on PostgreSQL, ILIKE fallback elsewhere (see app.utils.search)
     result = await session.execute(
-        select(Novel, chapter_count_subq.label("chapter_count"))
+        select(Novel)
         .options(selectinload(Novel.genres))
-        .where(
-            or_(
-                Novel.title.ilike(search_pattern),
-                Novel.author.ilike(search_pattern),
-                Novel.synopsis.ilike(search_pattern),
-            )
-        )
-        .order_by(Novel.updatedAt.desc())
+        .where(novel_search_filter(session, query))
+        .order_by(*novel_search_order(session, query))
         .offset(skip)
         .limit(limit)
     )
-    return list(result.all())
+    return list(result.scalars().all())
 
 
 async def count_search_results(session: AsyncSession, query: str) -> int:
-    search_pattern = f"%{query}%"
     count = await session.scalar(
-        select(func.count(Novel.id)).where(
-            or_(
-                Novel.title.ilike(search_pattern),
-                Novel.author.ilike(search_pattern),
-                Novel.synopsis.ilike(search_pattern),
-            )
-        )
+        select(func.count(Novel.id)).where(novel_search_filter(session, query))
     )
     return count or 0
 
@@ -126,29 +125,30 @@ async def count_novels(session: AsyncSession) -> int:
     return count or 0
 
 
-async def increment_view_count(session: AsyncSession, novel_id: int) -> None:
-    novel = await session.get(Novel, novel_id)
-    if novel:
-        novel.viewCount += 1
+async def increment_view_count(
+    session: AsyncSession, novel_id: int, amount: int = 1, commit: bool = True
+) -> None:
+    # Atomic in-DB increment: no row load, no lost updates under concurrency
+    await session.execute(
+        sa_update(Novel)
+        .where(Novel.id == novel_id)
+        .values(viewCount=Novel.viewCount + amount)
+        .execution_options(synchronize_session=False)
+    )
+    if commit:
         await session.commit()
 
 
 async def get_trending_novels(
     session: AsyncSession, limit: int = 10
-) -> list[tuple[Novel, int]]:
-    chapter_count_subq = (
-        select(func.count(Chapter.id))
-        .where(Chapter.novelId == Novel.id)
-        .correlate(Novel)
-        .scalar_subquery()
-    )
+) -> list[Novel]:
     result = await session.execute(
-        select(Novel, chapter_count_subq.label("chapter_count"))
+        select(Novel)
         .options(selectinload(Novel.genres))
         .order_by(Novel.viewCount.desc())
         .limit(limit)
     )
-    return list(result.all())
+    return list(result.scalars().all())
 
 
 async def create_novel(session: AsyncSession, novel: Novel) -> Novel:
@@ -174,6 +174,43 @@ async def delete_novel(session: AsyncSession, novel_id: int) -> None:
     await session.commit()
 
 
+async def sync_novel_chapter_stats(
+    session: AsyncSession, novel_ids: list[int] | None = None, commit: bool = False
+) -> None:
+    """Recompute ``chapterCount``/``latestChapterNum``/``latestChapterAt`` in SQL.
+
+    Call after inserting or deleting chapters (pass the affected novel ids),
+    or with ``novel_ids=None`` to repair every novel in one statement.
+    ``latestChapterAt`` is the newest translation ``createdAt``.
+    """
+    chapter_count = (
+        select(func.count(Chapter.id)).where(Chapter.novelId == Novel.id).scalar_subquery()
+    )
+    latest_num = (
+        select(func.max(Chapter.chapterNum)).where(Chapter.novelId == Novel.id).scalar_subquery()
+    )
+    latest_at = (
+        select(func.max(ChapterTranslation.createdAt))
+        .join(Chapter, ChapterTranslation.chapterId == Chapter.id)
+        .where(Chapter.novelId == Novel.id)
+        .scalar_subquery()
+    )
+    stmt = sa_update(Novel).values(
+        chapterCount=chapter_count,
+        latestChapterNum=latest_num,
+        latestChapterAt=latest_at,
+        # Stats bookkeeping must not count as a metadata edit (skip onupdate)
+        updatedAt=Novel.updatedAt,
+    )
+    if novel_ids is not None:
+        if not novel_ids:
+            return
+        stmt = stmt.where(Novel.id.in_(novel_ids))
+    await session.execute(stmt.execution_options(synchronize_session=False))
+    if commit:
+        await session.commit()
+
+
 # ---------------------------------------------------------------------------
 # Chapter
 # ---------------------------------------------------------------------------
@@ -222,8 +259,108 @@ async def get_prev_chapter(
     )
 
 
+async def get_chapter_index(
+    session: AsyncSession,
+    novel_id: int,
+    language: str = "EN",
+    skip: int = 0,
+    limit: int = 0,
+    start_num: int = 0,
+    end_num: int = 0,
+) -> list[tuple[int, int, str | None, datetime | None]]:
+    """Return ``(id, chapterNum, title, publishedAt)`` rows for a novel's chapters.
+
+    Only the index columns are selected, so ``rawContent`` and translation
+    ``content`` never leave the database. The translation is outer-joined on
+    ``language`` so chapters without one still appear with a ``None`` title.
+    ``start_num``/``end_num`` bound the chapter range (inclusive) and
+    ``limit=0`` means no limit.
+    """
+    query = (
+        select(
+            Chapter.id,
+            Chapter.chapterNum,
+            ChapterTranslation.title,
+            ChapterTranslation.publishedAt,
+        )
+        .outerjoin(
+            ChapterTranslation,
+            and_(
+                ChapterTranslation.chapterId == Chapter.id,
+                ChapterTranslation.language == language,
+            ),
+        )
+        .where(Chapter.novelId == novel_id)
+        .order_by(Chapter.chapterNum.asc())
+    )
+    if start_num:
+        query = query.where(Chapter.chapterNum >= start_num)
+    if end_num:
+        query = query.where(Chapter.chapterNum <= end_num)
+    if skip:
+        query = query.offset(skip)
+    if limit:
+        query = query.limit(limit)
+
+    result = await session.execute(query)
+    return [tuple(row) for row in result.all()]
+
+
+async def get_chapter_for_reader(
+    session: AsyncSession, slug: str, chapter_num: int, language: str = "EN"
+) -> tuple[int, str, int | None, ChapterTranslation | None, int | None, int | None] | None:
+    """Resolve everything the reader page needs in a single statement.
+
+    Returns ``(novel_id, novel_title, chapter_id, translation, prev_num, next_num)``
+    or ``None`` when the novel does not exist. ``chapter_id``/``translation``
+    are ``None`` when the chapter (or its ``language`` translation) is
+    missing. Prev/next numbers come from correlated MIN/MAX subqueries that
+    are served by the ``(novelId, chapterNum)`` unique index.
+    """
+    sibling = aliased(Chapter)
+    next_num = (
+        select(func.min(sibling.chapterNum))
+        .where(sibling.novelId == Novel.id, sibling.chapterNum > chapter_num)
+        .correlate(Novel)
+        .scalar_subquery()
+    )
+    prev_num = (
+        select(func.max(sibling.chapterNum))
+        .where(sibling.novelId == Novel.id, sibling.chapterNum < chapter_num)
+        .correlate(Novel)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        select(
+            Novel.id,
+            Novel.title,
+            Chapter.id,
+            ChapterTranslation,
+            prev_num.label("prev_num"),
+            next_num.label("next_num"),
+        )
+        .select_from(Novel)
+        .outerjoin(
+            Chapter, and_(Chapter.novelId == Novel.id, Chapter.chapterNum == chapter_num)
+        )
+        .outerjoin(
+            ChapterTranslation,
+            and_(
+                ChapterTranslation.chapterId == Chapter.id,
+                ChapterTranslation.language == language,
+            ),
+        )
+        .where(Novel.slug == slug)
+        .limit(1)
+    )
+    row = result.first()
+    return tuple(row) if row else None
+
+
 async def create_chapter(session: AsyncSession, chapter: Chapter) -> Chapter:
     session.add(chapter)
+    await session.flush()
+    await sync_novel_chapter_stats(session, [chapter.novelId])
     await session.commit()
     await session.refresh(chapter)
     return chapter
@@ -237,10 +374,79 @@ async def update_chapter(session: AsyncSession, chapter: Chapter) -> Chapter:
 
 
 async def delete_chapter(session: AsyncSession, chapter_id: int) -> None:
+    novel_id = await session.scalar(select(Chapter.novelId).where(Chapter.id == chapter_id))
     await session.execute(delete(Chapter).where(Chapter.id == chapter_id))
+    if novel_id is not None:
+        await sync_novel_chapter_stats(session, [novel_id])
     await session.commit()
 
 
+async def get_existing_chapter_ids(
+    session: AsyncSession, novel_id: int, chapter_nums: Iterable[int]
+) -> dict[int, int]:
+    """Map each of ``chapter_nums`` that already exists for the novel to its chapter id."""
+    nums = list(set(chapter_nums))
+    found: dict[int, int] = {}
+    for start in range(0, len(nums), BULK_INSERT_BATCH):
+        result = await session.execute(
+            select(Chapter.chapterNum, Chapter.id).where(
+                Chapter.novelId == novel_id,
+                Chapter.chapterNum.in_(nums[start : start + BULK_INSERT_BATCH]),
+            )
+        )
+        found.update(result.tuples().all())
+    return found
+
+
+async def bulk_create_chapters(
+    session: AsyncSession, novel_id: int, chapters: Sequence[dict], commit: bool = False
+) -> list[int]:
+    """Insert chapters plus one translation each; return translation ids in input order.
+
+    Each item needs ``chapterNum``, ``title``, ``content``, ``language`` and
+    ``publishedAt``. Rows go out as multi-row ``INSERT ... RETURNING``
+    statements (SQLAlchemy "insertmanyvalues"), so the cost is a handful of
+    round trips however many chapters there are. Conflicts are not checked
+    here; use :func:`get_existing_chapter_ids` first.
+    """
+    if not chapters:
+        return []
+    now = utc_now()
+    chapter_rows = await session.execute(
+        insert(Chapter).returning(Chapter.id, sort_by_parameter_order=True),
+        [
+            {
+                "novelId": novel_id,
+                "chapterNum": ch["chapterNum"],
+                "rawTitle": ch["title"],
+                "rawContent": ch["content"],
+            }
+            for ch in chapters
+        ],
+    )
+    chapter_ids = chapter_rows.scalars().all()
+    translation_rows = await session.execute(
+        insert(ChapterTranslation).returning(ChapterTranslation.id, sort_by_parameter_order=True),
+        [
+            {
+                "chapterId": chapter_id,
+                "language": ch["language"],
+                "title": ch["title"],
+                "content": ch["content"],
+                "publishedAt": ch["publishedAt"] or now,
+                "createdAt": now,
+                "updatedAt": now,
+            }
+            for chapter_id, ch in zip(chapter_ids, chapters, strict=True)
+        ],
+    )
+    translation_ids = list(translation_rows.scalars().all())
+    await sync_novel_chapter_stats(session, [novel_id])
+    if commit:
+        await session.commit()
+    return translation_ids
+
+
 # ---------------------------------------------------------------------------
 # ChapterTranslation
 # ---------------------------------------------------------------------------
@@ -279,6 +485,81 @@ async def update_translation(
     return translation
 
 
+# ---------------------------------------------------------------------------
+# CrawlState
+# ---------------------------------------------------------------------------
+async def get_crawl_state(session: AsyncSession, novel_id: int) -> CrawlState | None:
+    return await session.get(CrawlState, novel_id)
+
+
+async def _upsert_crawl_state(
+    session: AsyncSession, novel_id: int, values: dict, initial: dict | None = None
+) -> None:
+    """UPDATE the novel's row, or INSERT ``initial or values`` if there is none."""
+    result = await session.execute(
+        sa_update(CrawlState)
+        .where(CrawlState.novelId == novel_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        session.add(CrawlState(novelId=novel_id, **(initial or values)))
+    await session.flush()
+
+
+async def record_crawl_success(
+    session: AsyncSession,
+    novel_id: int,
+    chapter_num: int,
+    url: str | None,
+    next_url: str | None,
+    commit: bool = False,
+) -> None:
+    """Advance the novel's crawl state to ``chapter_num``.
+
+    Call inside the transaction that saves the chapter, so the state never
+    points past what is committed. Resets the consecutive error count.
+    """
+    await _upsert_crawl_state(
+        session,
+        novel_id,
+        {
+            "lastUrl": url,
+            "lastChapterNum": chapter_num,
+            "nextUrl": next_url,
+            "lastSuccessAt": utc_now(),
+            "errorCount": 0,
+            "lastError": None,
+        },
+    )
+    if commit:
+        await session.commit()
+
+
+async def record_crawl_error(
+    session: AsyncSession, novel_id: int, error: str, commit: bool = True
+) -> None:
+    error = error[:2000]
+    await _upsert_crawl_state(
+        session,
+        novel_id,
+        {"errorCount": CrawlState.errorCount + 1, "lastError": error},
+        initial={"errorCount": 1, "lastError": error},
+    )
+    if commit:
+        await session.commit()
+
+
+async def get_crawl_statuses(session: AsyncSession) -> list[tuple[Novel, CrawlState | None]]:
+    """Every novel with its crawl state (``None`` if it was never crawled)."""
+    result = await session.execute(
+        select(Novel, CrawlState)
+        .outerjoin(CrawlState, CrawlState.novelId == Novel.id)
+        .order_by(Novel.id)
+    )
+    return [tuple(row) for row in result.all()]
+
+
 # ---------------------------------------------------------------------------
 # User
 # ---------------------------------------------------------------------------
@@ -297,6 +578,68 @@ async def create_user(session: AsyncSession, user: User) -> User:
     return user
 
 
+async def get_user_by_reset_token(session: AsyncSession, token_hash: str) -> User | None:
+    """User holding this (SHA-256) reset token, if it has not expired yet."""
+    return await session.scalar(
+        select(User).where(
+            User.resetTokenHash == token_hash,
+            User.resetTokenExpires > utc_now(),
+        )
+    )
+
+
+async def clear_expired_reset_tokens(session: AsyncSession, batch_size: int = 500) -> int:
+    """Null out up to ``batch_size`` expired reset tokens; returns how many were cleared."""
+    expired = (
+        select(User.id)
+        .where(
+            User.resetTokenHash.isnot(None),
+            or_(User.resetTokenExpires.is_(None), User.resetTokenExpires <= utc_now()),
+        )
+        .limit(batch_size)
+    )
+    result = await session.execute(
+        sa_update(User)
+        .where(User.id.in_(expired.scalar_subquery()))
+        .values(resetTokenHash=None, resetTokenExpires=None)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return result.rowcount
+
+
+# ---------------------------------------------------------------------------
+# API Key
+# ---------------------------------------------------------------------------
+async def get_api_key_principal(
+    session: AsyncSession, key_hash: str
+) -> tuple[int, dict] | None:
+    """``(key_id, user dict)`` for an active key with this hash, via the keyHash index."""
+    row = (
+        await session.execute(
+            select(ApiKey.id, User.id, User.email, User.role, User.username)
+            .join(User, ApiKey.userId == User.id)
+            .where(ApiKey.keyHash == key_hash, ApiKey.isActive)
+        )
+    ).first()
+    if row is None:
+        return None
+    key_id, user_id, email, role, username = row
+    return key_id, {"id": user_id, "email": email, "role": role, "username": username}
+
+
+async def touch_api_keys(session: AsyncSession, last_used: dict[int, datetime]) -> None:
+    """Set ``lastUsedAt`` for many keys in one executemany UPDATE."""
+    table = ApiKey.__table__
+    await session.execute(
+        sa_update(table)
+        .where(table.c.id == bindparam("key_id"))
+        .values(lastUsedAt=bindparam("used_at")),
+        [{"key_id": k, "used_at": v} for k, v in sorted(last_used.items())],
+    )
+    await session.commit()
+
+
 # ---------------------------------------------------------------------------
 # Genre
 # ---------------------------------------------------------------------------
@@ -335,20 +678,14 @@ async def get_library_entry(
     )
 
 
-async def get_user_library(session: AsyncSession, user_id: int) -> list[tuple[Library, int]]:
-    chapter_count_subq = (
-        select(func.count(Chapter.id))
-        .where(Chapter.novelId == Novel.id)
-        .correlate(Novel)
-        .scalar_subquery()
-    )
+async def get_user_library(session: AsyncSession, user_id: int) -> list[Library]:
     result = await session.execute(
-        select(Library, chapter_count_subq.label("chapter_count"))
+        select(Library)
         .where(Library.userId == user_id)
         .options(selectinload(Library.novel).selectinload(Novel.genres))
         .order_by(Library.createdAt.desc())
     )
-    return list(result.all())
+    return list(result.scalars().all())
 
 
 async def add_to_library(
@@ -432,18 +769,27 @@ async def upsert_rating(
 ) -> Rating:
     """DEPRECATED: Only kept for potential internal/backfill use. Do not expose to users."""
     rating = await get_rating(session, user_id, novel_id)
+    # A rating only counts towards the aggregate while no review overrides it
+    counted = await get_review_by_user_and_novel(session, user_id, novel_id) is None
     if rating:
+        if counted:
+            await apply_rating_delta(session, novel_id, score - rating.score, 0)
         rating.score = score
     else:
         rating = Rating(userId=user_id, novelId=novel_id, score=score)
         session.add(rating)
+        if counted:
+            await apply_rating_delta(session, novel_id, score, 1)
     await session.commit()
     await session.refresh(rating)
     return rating
 
 
 async def get_novel_rating_stats(session: AsyncSession, novel_id: int) -> tuple[float, int]:
-    """DEPRECATED: Use get_novel_combined_rating_stats for unified stats."""
+    """DEPRECATED: Read the maintained aggregates with get_novel_rating_summary.
+
+    ``reconcile_novel_rating_stats`` recomputes them when they drift.
+    """
     result = await session.execute(
         select(func.avg(Rating.score), func.count(Rating.id))
         .where(Rating.novelId == novel_id)
@@ -452,36 +798,76 @@ async def get_novel_rating_stats(session: AsyncSession, novel_id: int) -> tuple[
     return (float(avg) if avg is not None else 0.0, int(count) if count is not None else 0)
 
 
-async def get_novel_combined_rating_stats(
-    session: AsyncSession, novel_id: int
-) -> tuple[float, int]:
-    """Return combined average/count from both Rating and Review tables.
-
-    If a user has both a Rating and a Review for the same novel, the Review
-    score takes precedence (it is the more considered opinion). Each user
-    is counted only once.
+async def apply_rating_delta(
+    session: AsyncSession, novel_id: int, sum_delta: int, count_delta: int
+) -> None:
+    """Adjust the novel's running rating sum/count and derived average in place.
 
-    NOTE: The Rating table is deprecated. New ratings must be created as
-    Reviews. Rating rows are still included here for backward compatibility
-    until existing data is migrated or removed.
+    Runs as one UPDATE inside the caller's transaction, so it commits (or
+    rolls back) together with the review/rating row change it accounts for.
     """
-    rating_rows = await session.execute(
-        select(Rating.userId, Rating.score).where(Rating.novelId == novel_id)
-    )
-    review_rows = await session.execute(
-        select(Review.userId, Review.score).where(Review.novelId == novel_id)
+    if not sum_delta and not count_delta:
+        return
+    new_sum = Novel.ratingSum + sum_delta
+    new_count = Novel.ratingCount + count_delta
+    await session.execute(
+        sa_update(Novel)
+        .where(Novel.id == novel_id)
+        .values(
+            ratingSum=new_sum,
+            ratingCount=new_count,
+            averageRating=case((new_count > 0, cast(new_sum, Float) / new_count), else_=0.0),
+            updatedAt=Novel.updatedAt,
+        )
+        .execution_options(synchronize_session=False)
     )
 
-    scores_by_user: dict[int, int] = {}
-    for user_id, score in rating_rows.all():
-        scores_by_user[user_id] = score
-    for user_id, score in review_rows.all():
-        scores_by_user[user_id] = score  # Review overrides quick rating
 
-    scores = list(scores_by_user.values())
-    if not scores:
-        return (0.0, 0)
-    return (sum(scores) / len(scores), len(scores))
+async def get_novel_rating_summary(session: AsyncSession, novel_id: int) -> tuple[float, int]:
+    """Return the maintained ``(averageRating, ratingCount)`` for a novel."""
+    row = (
+        await session.execute(
+            select(Novel.averageRating, Novel.ratingCount).where(Novel.id == novel_id)
+        )
+    ).first()
+    return (float(row[0]), int(row[1])) if row else (0.0, 0)
+
+
+async def reconcile_novel_rating_stats(
+    session: AsyncSession, novel_ids: list[int] | None = None, commit: bool = False
+) -> None:
+    """Recompute ``ratingSum``/``ratingCount``/``averageRating`` from scratch in SQL.
+
+    Each user counts once: every review counts, and a legacy Rating counts
+    only when the user has no review for that novel (the review is the more
+    considered opinion). ``novel_ids=None`` reconciles every novel.
+    """
+    has_review = (
+        select(Review.id)
+        .where(Review.userId == Rating.userId, Review.novelId == Rating.novelId)
+        .exists()
+    )
+    scores = union_all(
+        select(Review.novelId.label("novel_id"), Review.score.label("score")),
+        select(Rating.novelId.label("novel_id"), Rating.score.label("score")).where(~has_review),
+    ).subquery()
+
+    def _agg(expr):
+        return select(expr).where(scores.c.novel_id == Novel.id).scalar_subquery()
+
+    stmt = sa_update(Novel).values(
+        ratingSum=_agg(func.coalesce(func.sum(scores.c.score), 0)),
+        ratingCount=_agg(func.count(scores.c.score)),
+        averageRating=_agg(func.coalesce(func.avg(cast(scores.c.score, Float)), 0.0)),
+        updatedAt=Novel.updatedAt,
+    )
+    if novel_ids is not None:
+        if not novel_ids:
+            return
+        stmt = stmt.where(Novel.id.in_(novel_ids))
+    await session.execute(stmt.execution_options(synchronize_session=False))
+    if commit:
+        await session.commit()
 
 
 # ---------------------------------------------------------------------------
@@ -504,20 +890,19 @@ async def get_comment_replies(
     return list(result.scalars().all())
 
 
-async def get_novel_comments(
-    session: AsyncSession, novel_id: int, skip: int = 0, limit: int = 10
-) -> list[Comment]:
-    # Fetch top-level comments first, then their replies in a flat structure
+async def _get_comment_page(
+    session: AsyncSession, where, skip: int, limit: int, cursor: str
+) -> tuple[list[Comment], str | None]:
+    # Fetch the page of comments first, then their replies in a flat structure.
     # Frontend will reconstruct the tree using parentId
+    query = select(Comment).where(where).options(selectinload(Comment.user))
+    if cursor:
+        query = query.where(keyset_after(Comment.createdAt, Comment.id, cursor))
     result = await session.execute(
-        select(Comment)
-        .where(Comment.novelId == novel_id)
-        .options(selectinload(Comment.user))
-        .order_by(Comment.createdAt.desc())
-        .offset(skip)
-        .limit(limit)
+        query.order_by(Comment.createdAt.desc(), Comment.id.desc()).offset(skip).limit(limit)
     )
     top_level = list(result.scalars().all())
+    page_cursor = next_cursor(top_level, limit, "createdAt")
 
     # Also fetch all replies for these top-level comments
     top_ids = [c.id for c in top_level]
@@ -528,33 +913,20 @@ async def get_novel_comments(
             .options(selectinload(Comment.user))
             .order_by(Comment.createdAt.asc())
         )
-        return top_level + list(replies_result.scalars().all())
-    return top_level
+        return top_level + list(replies_result.scalars().all()), page_cursor
+    return top_level, page_cursor
 
 
-async def get_chapter_comments(
-    session: AsyncSession, chapter_id: int, skip: int = 0, limit: int = 10
-) -> list[Comment]:
-    result = await session.execute(
-        select(Comment)
-        .where(Comment.chapterId == chapter_id)
-        .options(selectinload(Comment.user))
-        .order_by(Comment.createdAt.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    top_level = list(result.scalars().all())
+async def get_novel_comments(
+    session: AsyncSession, novel_id: int, skip: int = 0, limit: int = 10, cursor: str = ""
+) -> tuple[list[Comment], str | None]:
+    return await _get_comment_page(session, Comment.novelId == novel_id, skip, limit, cursor)
 
-    top_ids = [c.id for c in top_level]
-    if top_ids:
-        replies_result = await session.execute(
-            select(Comment)
-            .where(Comment.parentId.in_(top_ids))
-            .options(selectinload(Comment.user))
-            .order_by(Comment.createdAt.asc())
-        )
-        return top_level + list(replies_result.scalars().all())
-    return top_level
+
+async def get_chapter_comments(
+    session: AsyncSession, chapter_id: int, skip: int = 0, limit: int = 10, cursor: str = ""
+) -> tuple[list[Comment], str | None]:
+    return await _get_comment_page(session, Comment.chapterId == chapter_id, skip, limit, cursor)
 
 
 async def create_comment(session: AsyncSession, comment: Comment) -> Comment:
@@ -594,21 +966,32 @@ async def get_review_by_user_and_novel(
 
 
 async def get_reviews_by_novel(
-    session: AsyncSession, novel_id: int, skip: int = 0, limit: int = 10
-) -> list[tuple[Review, str]]:
-    result = await session.execute(
+    session: AsyncSession, novel_id: int, skip: int = 0, limit: int = 10, cursor: str = ""
+) -> tuple[list[tuple[Review, str]], str | None]:
+    query = (
         select(Review, User.username)
         .join(User, Review.userId == User.id)
         .where(Review.novelId == novel_id)
-        .order_by(Review.createdAt.desc())
-        .offset(skip)
-        .limit(limit)
     )
-    return list(result.all())
+    if cursor:
+        query = query.where(keyset_after(Review.createdAt, Review.id, cursor))
+    result = await session.execute(
+        query.order_by(Review.createdAt.desc(), Review.id.desc()).offset(skip).limit(limit)
+    )
+    rows = list(result.all())
+    return rows, next_cursor([review for review, _ in rows], limit, "createdAt")
 
 
+# Review writes keep Novel.ratingSum/ratingCount current via apply_rating_delta
+# in the same transaction. A Review overrides the user's legacy Rating, so
+# reviewing/un-reviewing swaps that score in or out instead of changing count.
 async def create_review(session: AsyncSession, review: Review) -> Review:
+    legacy = await get_rating(session, review.userId, review.novelId)
     session.add(review)
+    if legacy:
+        await apply_rating_delta(session, review.novelId, review.score - legacy.score, 0)
+    else:
+        await apply_rating_delta(session, review.novelId, review.score, 1)
     await session.commit()
     await session.refresh(review)
     return review
@@ -617,6 +1000,10 @@ async def create_review(session: AsyncSession, review: Review) -> Review:
 async def update_review(
     session: AsyncSession, review: Review, score: int, content: str
 ) -> Review:
+    # Re-read the stored score under a row lock: two concurrent edits must not
+    # both take their delta from the score loaded earlier in the request
+    await session.refresh(review, with_for_update=True)
+    await apply_rating_delta(session, review.novelId, score - review.score, 0)
     review.score = score
     review.content = content
     await session.commit()
@@ -625,8 +1012,13 @@ async def update_review(
 
 
 async def delete_review(session: AsyncSession, review_id: int) -> None:
-    review = await session.get(Review, review_id)
+    review = await session.get(Review, review_id, with_for_update=True, populate_existing=True)
     if review:
+        legacy = await get_rating(session, review.userId, review.novelId)
+        if legacy:
+            await apply_rating_delta(session, review.novelId, legacy.score - review.score, 0)
+        else:
+            await apply_rating_delta(session, review.novelId, -review.score, -1)
         await session.delete(review)
         await session.commit()
 
@@ -650,17 +1042,137 @@ async def create_notification(session: AsyncSession, notification: Notification)
     return notification
 
 
-async def get_user_notifications(
-    session: AsyncSession, user_id: int, skip: int = 0, limit: int = 20
-) -> list[Notification]:
+async def fan_out_chapter_notifications(
+    session: AsyncSession, novel_id: int, chapter_id: int, message: str, commit: bool = False
+) -> int:
+    """Give every follower of the novel a NEW_CHAPTER notification; returns the row count.
+
+    One ``INSERT INTO notification ... SELECT FROM library`` statement: the
+    follower ids never leave the database, however many there are.
+    """
+    followers = select(
+        Library.userId,
+        literal("NEW_CHAPTER"),
+        literal(message),
+        literal(novel_id),
+        literal(chapter_id),
+        literal(False),
+        literal(utc_now()),
+    ).where(Library.novelId == novel_id)
     result = await session.execute(
-        select(Notification)
-        .where(Notification.userId == user_id)
-        .order_by(Notification.createdAt.desc())
-        .offset(skip)
-        .limit(limit)
+        insert(Notification).from_select(
+            ["userId", "type", "message", "novelId", "chapterId", "isRead", "createdAt"],
+            followers,
+        )
     )
-    return list(result.scalars().all())
+    if commit:
+        await session.commit()
+    return result.rowcount
+
+
+async def record_chapter_event(
+    session: AsyncSession,
+    novel_id: int,
+    chapter_id: int,
+    chapter_num: int,
+    message: str,
+    commit: bool = False,
+) -> NovelChapterEvent:
+    """Fan-in counterpart of :func:`fan_out_chapter_notifications`: one row per chapter."""
+    event = NovelChapterEvent(
+        novelId=novel_id, chapterId=chapter_id, chapterNum=chapter_num, message=message
+    )
+    session.add(event)
+    await session.flush()
+    if commit:
+        await session.commit()
+    return event
+
+
+def _fanin_events(user_id: int, since: datetime):
+    """``(event, isRead)`` rows for the user's followed novels since ``since``.
+
+    Only chapters published after the novel was added to the library count,
+    matching what fan-out would have delivered.
+    """
+    seen = func.coalesce(Library.lastSeenAt, Library.createdAt)
+    return (
+        select(NovelChapterEvent, (NovelChapterEvent.createdAt <= seen).label("isRead"))
+        .join(
+            Library,
+            and_(Library.novelId == NovelChapterEvent.novelId, Library.userId == user_id),
+        )
+        .where(
+            NovelChapterEvent.createdAt > Library.createdAt,
+            NovelChapterEvent.createdAt >= since,
+        )
+    )
+
+
+def _fanin_since() -> datetime:
+    return utc_now() - timedelta(days=settings.NOTIFICATION_FANIN_WINDOW_DAYS)
+
+
+async def get_user_notifications(
+    session: AsyncSession, user_id: int, skip: int = 0, limit: int = 20, cursor: str = ""
+) -> tuple[list[dict], str | None]:
+    """Newest-first feed merging per-user rows (fan-out) and chapter events (fan-in).
+
+    Items carry ``source`` (``"notification"`` or ``"event"``); ids are only
+    unique within a source, so the feed and its cursor order by
+    ``(createdAt, source, id)``.
+    """
+    wanted = skip + limit
+    query = select(Notification).where(Notification.userId == user_id)
+    events = _fanin_events(user_id, _fanin_since())
+    if cursor:
+        query = query.where(
+            source_keyset_after(Notification.createdAt, Notification.id, "notification", cursor)
+        )
+        events = events.where(
+            source_keyset_after(NovelChapterEvent.createdAt, NovelChapterEvent.id, "event", cursor)
+        )
+    notifications = await session.scalars(
+        query.order_by(Notification.createdAt.desc(), Notification.id.desc()).limit(wanted)
+    )
+    event_rows = await session.execute(
+        events.order_by(NovelChapterEvent.createdAt.desc(), NovelChapterEvent.id.desc()).limit(
+            wanted
+        )
+    )
+
+    items = [
+        {
+            "id": n.id,
+            "type": n.type,
+            "message": n.message,
+            "novelId": n.novelId,
+            "chapterId": n.chapterId,
+            "isRead": n.isRead,
+            "createdAt": n.createdAt,
+            "source": "notification",
+        }
+        for n in notifications
+    ]
+    items += [
+        {
+            "id": event.id,
+            "type": "NEW_CHAPTER",
+            "message": event.message,
+            "novelId": event.novelId,
+            "chapterId": event.chapterId,
+            "isRead": bool(is_read),
+            "createdAt": event.createdAt,
+            "source": "event",
+        }
+        for event, is_read in event_rows.tuples()
+    ]
+    items.sort(key=lambda item: (item["createdAt"], item["source"], item["id"]), reverse=True)
+    page = items[skip:wanted]
+    if len(page) < limit:
+        return page, None
+    last = page[-1]
+    return page, encode_cursor(last["createdAt"], last["id"], last["source"])
 
 
 async def get_unread_notification_count(session: AsyncSession, user_id: int) -> int:
@@ -668,7 +1180,11 @@ async def get_unread_notification_count(session: AsyncSession, user_id: int) ->
         select(func.count(Notification.id))
         .where(Notification.userId == user_id, Notification.isRead == False)  # noqa: E712
     )
-    return count or 0
+    unread_events = _fanin_events(user_id, _fanin_since()).subquery()
+    event_count = await session.scalar(
+        select(func.count()).select_from(unread_events).where(unread_events.c.isRead.is_(False))
+    )
+    return (count or 0) + (event_count or 0)
 
 
 async def mark_notification_read(
@@ -686,10 +1202,32 @@ async def mark_notification_read(
     return notification
 
 
+async def mark_chapter_event_read(session: AsyncSession, event_id: int, user_id: int) -> bool:
+    """Advance the library cursor past the event (and so every older one for that novel)."""
+    event = await session.get(NovelChapterEvent, event_id)
+    if not event:
+        return False
+    seen = func.coalesce(Library.lastSeenAt, Library.createdAt)
+    result = await session.execute(
+        sa_update(Library)
+        .where(Library.userId == user_id, Library.novelId == event.novelId)
+        .values(lastSeenAt=case((seen < event.createdAt, event.createdAt), else_=seen))
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return result.rowcount > 0
+
+
 async def mark_all_notifications_read(session: AsyncSession, user_id: int) -> None:
     await session.execute(
         sa_update(Notification)
         .where(Notification.userId == user_id, Notification.isRead == False)  # noqa: E712
         .values(isRead=True)
     )
+    await session.execute(
+        sa_update(Library)
+        .where(Library.userId == user_id)
+        .values(lastSeenAt=utc_now())
+        .execution_options(synchronize_session=False)
+    )
     await session.commit()
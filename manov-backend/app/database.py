@@ -20,3 +20,8 @@ AsyncSessionLocal = async_sessionmaker(
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory for work that outlives the request (e.g. background tasks)."""
+    return AsyncSessionLocal
@@ -1,10 +1,11 @@
 import secrets
 from contextlib import asynccontextmanager
 
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -16,13 +17,33 @@ from app.config import settings
 from app.database import engine
 from app.middleware.rate_limit import limiter
 from app.routers import admin, admin_api_keys, auth, genres, novels, sitemap, social, user
+from app.services.api_key_auth import api_key_usage
+from app.services.browser_pool import browser_pool
+from app.services.chapter_fetcher import http_fetcher
+from app.services.notifier import chapter_notifier
+from app.services.password_hasher import HasherBusyError, password_hasher
+from app.services.reset_token_sweeper import reset_token_sweeper
+from app.services.view_counter import view_counter
+from app.utils.cursor import NEXT_CURSOR_HEADER
 
 
 # --- LIFESPAN MANAGER ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    view_counter.start()
+    chapter_notifier.start()
+    reset_token_sweeper.start()
+    api_key_usage.start()
     print("✅ Manov API started")
     yield
+    await view_counter.stop()
+    print("📊 Buffered view counts flushed")
+    await chapter_notifier.stop()
+    await reset_token_sweeper.stop()
+    await api_key_usage.stop()
+    password_hasher.shutdown()
+    await browser_pool.close()
+    await http_fetcher.close()
     await engine.dispose()
     print("❌ Database engine disposed")
 
@@ -40,6 +61,16 @@ app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.add_middleware(SlowAPIMiddleware)
 
+
+@app.exception_handler(HasherBusyError)
+async def hasher_busy_handler(request: Request, exc: HasherBusyError):
+    # Shed auth load instead of queueing bcrypt work without bound
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
 # --- SECURITY FOR DOCS ---
 security = HTTPBasic()
 
@@ -90,6 +121,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # --- REGISTER ROUTER ---
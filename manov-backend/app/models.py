@@ -3,7 +3,7 @@
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, Text, UniqueConstraint
+from sqlalchemy import Column, Index, Text, UniqueConstraint, text
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -28,6 +28,9 @@ class NovelGenreLink(SQLModel, table=True):
 # Novel
 # ---------------------------------------------------------------------------
 class Novel(SQLModel, table=True):
+    # (sort column, id) indexes back keyset pagination (see app.utils.cursor)
+    __table_args__ = (Index("ix_novel_updatedAt_id", "updatedAt", "id"),)
+
     id: int | None = Field(default=None, primary_key=True)
     slug: str = Field(unique=True, index=True)
 
@@ -42,8 +45,15 @@ class Novel(SQLModel, table=True):
 
     averageRating: float = Field(default=0.0)
     ratingCount: int = Field(default=0)
+    # Running sum of counted scores; averageRating = ratingSum / ratingCount
+    ratingSum: int = Field(default=0)
     viewCount: int = Field(default=0)
 
+    # Denormalized chapter stats, kept current by crud.sync_novel_chapter_stats
+    chapterCount: int = Field(default=0)
+    latestChapterNum: int | None = Field(default=None)
+    latestChapterAt: datetime | None = Field(default=None)
+
     createdAt: datetime = Field(default_factory=utc_now)
     updatedAt: datetime = Field(
         default_factory=utc_now,
@@ -98,6 +108,31 @@ class Chapter(SQLModel, table=True):
     notifications: list["Notification"] = Relationship(back_populates="chapter")
 
 
+# ---------------------------------------------------------------------------
+# CrawlState
+# ---------------------------------------------------------------------------
+class CrawlState(SQLModel, table=True):
+    """Where the scraper stopped for a novel; one row per novel, keyed by its id.
+
+    Written in the same transaction as each committed chapter (see
+    ``crud.record_crawl_success``), so resuming is a primary-key lookup.
+    """
+
+    novelId: int = Field(foreign_key="novel.id", ondelete="CASCADE", primary_key=True)
+    lastUrl: str | None = None
+    lastChapterNum: int | None = None
+    # "下一章" link of the last chapter; None when the crawl reached the end
+    nextUrl: str | None = None
+    lastSuccessAt: datetime | None = None
+    # Consecutive failures since the last success
+    errorCount: int = Field(default=0)
+    lastError: str | None = Field(default=None, sa_column=Column(Text))
+    updatedAt: datetime = Field(
+        default_factory=utc_now,
+        sa_column_kwargs={"onupdate": utc_now},
+    )
+
+
 # ---------------------------------------------------------------------------
 # ChapterTranslation
 # ---------------------------------------------------------------------------
@@ -131,6 +166,16 @@ class ChapterTranslation(SQLModel, table=True):
 # User
 # ---------------------------------------------------------------------------
 class User(SQLModel, table=True):
+    # Partial: only users with a pending reset are indexed (expired ones are swept)
+    __table_args__ = (
+        Index(
+            "ix_user_resetTokenHash",
+            "resetTokenHash",
+            postgresql_where=text('"resetTokenHash" IS NOT NULL'),
+            sqlite_where=text('"resetTokenHash" IS NOT NULL'),
+        ),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     email: str = Field(unique=True, index=True)
     username: str
@@ -139,7 +184,7 @@ class User(SQLModel, table=True):
     role: str = Field(default="USER")
     coins: int = Field(default=0)
 
-    resetTokenHash: str | None = Field(default=None, index=True)
+    resetTokenHash: str | None = Field(default=None)
     resetTokenExpires: datetime | None = Field(default=None)
 
     createdAt: datetime = Field(default_factory=utc_now)
@@ -166,6 +211,9 @@ class Library(SQLModel, table=True):
     userId: int = Field(foreign_key="user.id", ondelete="CASCADE", index=True)
     novelId: int = Field(foreign_key="novel.id", ondelete="CASCADE", index=True)
     createdAt: datetime = Field(default_factory=utc_now)
+    # Fan-in notifications: chapter events newer than this are unread
+    # (None = nothing read since the novel was added, i.e. createdAt)
+    lastSeenAt: datetime | None = Field(default=None)
 
     user: User | None = Relationship(back_populates="library")
     novel: Novel | None = Relationship(back_populates="libraries")
@@ -269,7 +317,10 @@ class Rating(SQLModel, table=True):
 # Review
 # ---------------------------------------------------------------------------
 class Review(SQLModel, table=True):
-    __table_args__ = (UniqueConstraint("userId", "novelId"),)
+    __table_args__ = (
+        UniqueConstraint("userId", "novelId"),
+        Index("ix_review_novelId_createdAt_id", "novelId", "createdAt", "id"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     userId: int = Field(foreign_key="user.id", ondelete="CASCADE", index=True)
@@ -290,6 +341,11 @@ class Review(SQLModel, table=True):
 # Comment
 # ---------------------------------------------------------------------------
 class Comment(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_comment_novelId_createdAt_id", "novelId", "createdAt", "id"),
+        Index("ix_comment_chapterId_createdAt_id", "chapterId", "createdAt", "id"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     userId: int = Field(foreign_key="user.id", ondelete="CASCADE", index=True)
     content: str = Field(sa_column=Column(Text))
@@ -315,6 +371,10 @@ class Comment(SQLModel, table=True):
 # Notification
 # ---------------------------------------------------------------------------
 class Notification(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_notification_userId_createdAt_id", "userId", "createdAt", "id"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     userId: int = Field(foreign_key="user.id", ondelete="CASCADE", index=True)
     type: str
@@ -331,3 +391,26 @@ class Notification(SQLModel, table=True):
     user: User | None = Relationship(back_populates="notifications")
     novel: Novel | None = Relationship(back_populates="notifications")
     chapter: Chapter | None = Relationship(back_populates="notifications")
+
+
+# ---------------------------------------------------------------------------
+# NovelChapterEvent
+# ---------------------------------------------------------------------------
+class NovelChapterEvent(SQLModel, table=True):
+    """One row per published chapter, for NOTIFICATION_MODE=fanin.
+
+    Followers' feeds are computed by joining their Library rows against
+    these events, so storage grows with chapters rather than with
+    followers x chapters.
+    """
+
+    __table_args__ = (
+        Index("ix_novelchapterevent_novelId_createdAt_id", "novelId", "createdAt", "id"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    novelId: int = Field(foreign_key="novel.id", ondelete="CASCADE")
+    chapterId: int = Field(foreign_key="chapter.id", ondelete="CASCADE", index=True)
+    chapterNum: int
+    message: str
+    createdAt: datetime = Field(default_factory=utc_now)
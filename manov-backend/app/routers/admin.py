@@ -1,18 +1,35 @@
+import json
+from collections.abc import AsyncIterator
 from datetime import datetime
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
-from pydantic import BaseModel, Field
-from sqlalchemy.ext.asyncio import AsyncSession
+import anyio
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
-
-from app.crud import create_chapter, create_novel, delete_chapter, delete_novel
-from app.database import get_session
+from starlette.requests import ClientDisconnect
+
+from app.config import settings
+from app.crud import (
+    bulk_create_chapters,
+    create_chapter,
+    create_novel,
+    delete_chapter,
+    delete_novel,
+    get_crawl_statuses,
+    get_existing_chapter_ids,
+)
+from app.database import get_session, get_session_factory
 from app.middleware.rate_limit import limiter
-from app.models import Chapter, ChapterTranslation, Genre, Novel, utc_now
+from app.models import Chapter, ChapterTranslation, Genre, Novel
+from app.services.password_hasher import password_hasher
 from app.services.processor import NovelProcessorService
 from app.utils.audit import log_admin_action
+from app.utils.auth_timing import auth_timings
 from app.utils.deps import get_current_admin
+from app.utils.ndjson import NDJSONStreamingResponse, iter_ndjson_lines
 from app.utils.slug import generate_slug
 
 router = APIRouter(dependencies=[Depends(get_current_admin)])
@@ -86,6 +103,25 @@ class UpdateChapterContentRequest(BaseModel):
     content: str = Field(..., max_length=500000)
 
 
+def _chapter_row(ch: AgentChapterInput) -> dict:
+    """Row for ``crud.bulk_create_chapters``; raises ValueError on a bad publishedAt."""
+    return {
+        "chapterNum": ch.chapterNum,
+        "title": ch.title,
+        "content": ch.content,
+        "language": ch.language,
+        "publishedAt": datetime.fromisoformat(ch.publishedAt) if ch.publishedAt else None,
+    }
+
+
+def _chapter_rows(chapters: list[AgentChapterInput]) -> list[dict]:
+    """Duplicate-checked rows for ``crud.bulk_create_chapters``."""
+    nums = [ch.chapterNum for ch in chapters]
+    if len(set(nums)) != len(nums):
+        raise HTTPException(status_code=422, detail="Duplicate chapterNum in request")
+    return [_chapter_row(ch) for ch in chapters]
+
+
 # --- ENDPOINTS ---
 
 
@@ -161,6 +197,39 @@ async def trigger_scrape(
     }
 
 
+@router.get("/crawl-status", summary="Crawl progress and errors for every novel.")
+async def list_crawl_status(session: AsyncSession = Depends(get_session)):
+    rows = await get_crawl_statuses(session)
+    return [
+        {
+            "novelId": novel.id,
+            "slug": novel.slug,
+            "title": novel.title,
+            "status": novel.status,
+            "chapterCount": novel.chapterCount,
+            "lastChapterNum": state.lastChapterNum if state else None,
+            "lastUrl": state.lastUrl if state else None,
+            "nextUrl": state.nextUrl if state else None,
+            "lastSuccessAt": state.lastSuccessAt if state else None,
+            "errorCount": state.errorCount if state else 0,
+            "lastError": state.lastError if state else None,
+        }
+        for novel, state in rows
+    ]
+
+
+@router.get("/auth-metrics", summary="Auth overhead per credential path and hashing pool depth.")
+async def auth_metrics():
+    return {
+        "resolver": auth_timings.snapshot(),
+        "passwordHasher": {
+            "workers": password_hasher.workers,
+            "maxQueue": password_hasher.max_queue,
+            **password_hasher.metrics.snapshot(),
+        },
+    }
+
+
 @router.put("/novels/{id}")
 async def update_novel_metadata(
     id: int, req: UpdateNovelRequest, session: AsyncSession = Depends(get_session)
@@ -225,6 +294,7 @@ async def create_novel_with_chapters(
     user: dict = Depends(get_current_admin),
     session: AsyncSession = Depends(get_session),
 ):
+    chapter_rows = _chapter_rows(req.chapters)
     slug = await generate_slug(req.title, session)
 
     novel = Novel(
@@ -246,29 +316,7 @@ async def create_novel_with_chapters(
     session.add(novel)
     await session.flush()  # assign novel.id
 
-    translation_ids = []
-    for ch in req.chapters:
-        chapter = Chapter(
-            novelId=novel.id,
-            chapterNum=ch.chapterNum,
-            rawTitle=ch.title,
-            rawContent=ch.content,
-        )
-        session.add(chapter)
-        await session.flush()
-
-        translation = ChapterTranslation(
-            chapterId=chapter.id,
-            language=ch.language,
-            title=ch.title,
-            content=ch.content,
-            publishedAt=datetime.fromisoformat(ch.publishedAt) if ch.publishedAt else utc_now(),
-        )
-        session.add(translation)
-        await session.flush()
-        translation_ids.append(translation.id)
-
-    await session.commit()
+    translation_ids = await bulk_create_chapters(session, novel.id, chapter_rows, commit=True)
     await session.refresh(novel)
 
     await log_admin_action(
@@ -302,40 +350,18 @@ async def bulk_add_chapters(
     if not novel:
         raise HTTPException(status_code=404, detail="Novel not found")
 
-    translation_ids = []
-    for ch in req.chapters:
-        existing = await session.scalar(
-            select(Chapter).where(
-                Chapter.novelId == novel_id, Chapter.chapterNum == ch.chapterNum
-            )
-        )
-        if existing:
-            raise HTTPException(
-                status_code=409,
-                detail=f"Chapter {ch.chapterNum} already exists. Use PUT /admin/chapters/{existing.id}/content to update.",
-            )
-
-        chapter = Chapter(
-            novelId=novel_id,
-            chapterNum=ch.chapterNum,
-            rawTitle=ch.title,
-            rawContent=ch.content,
-        )
-        session.add(chapter)
-        await session.flush()
-
-        translation = ChapterTranslation(
-            chapterId=chapter.id,
-            language=ch.language,
-            title=ch.title,
-            content=ch.content,
-            publishedAt=datetime.fromisoformat(ch.publishedAt) if ch.publishedAt else utc_now(),
+    chapter_rows = _chapter_rows(req.chapters)
+    existing = await get_existing_chapter_ids(
+        session, novel_id, (ch.chapterNum for ch in req.chapters)
+    )
+    if existing:
+        chapter_num, chapter_id = min(existing.items())
+        raise HTTPException(
+            status_code=409,
+            detail=f"Chapter {chapter_num} already exists. Use PUT /admin/chapters/{chapter_id}/content to update.",
         )
-        session.add(translation)
-        await session.flush()
-        translation_ids.append(translation.id)
 
-    await session.commit()
+    translation_ids = await bulk_create_chapters(session, novel_id, chapter_rows, commit=True)
 
     await log_admin_action(
         session,
@@ -353,6 +379,152 @@ async def bulk_add_chapters(
     }
 
 
+@router.post(
+    "/novels/{novel_id}/chapters/stream",
+    summary="Stream chapters in as NDJSON, one JSON chapter per line.",
+)
+async def stream_add_chapters(
+    novel_id: int,
+    request: Request,
+    batch_size: int | None = Query(None, alias="batchSize", ge=1, le=1000),
+    user: dict = Depends(get_current_admin),
+    session: AsyncSession = Depends(get_session),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    """Each line is an ``AgentChapterInput`` object.
+
+    Chapters are validated as they arrive and inserted every ``batchSize``
+    lines, each batch in its own commit. The response is NDJSON too: one
+    result line per input line (``created``, ``exists``, ``invalid`` or
+    ``failed``), sent after the batch holding it commits, then a final
+    summary line. Committed batches survive a dropped connection, and
+    re-sending the same file is safe: those chapters come back as ``exists``.
+    """
+    if not await session.get(Novel, novel_id):
+        raise HTTPException(status_code=404, detail="Novel not found")
+
+    return NDJSONStreamingResponse(
+        _ingest_chapter_stream(
+            request,
+            novel_id,
+            batch_size or settings.ADMIN_INGEST_BATCH_SIZE,
+            user["id"],
+            session_factory,
+        )
+    )
+
+
+async def _ingest_chapter_stream(
+    request: Request,
+    novel_id: int,
+    batch_size: int,
+    user_id: int,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[str]:
+    counts = {"created": 0, "exists": 0, "invalid": 0, "failed": 0}
+    batch: dict[int, tuple[int, dict]] = {}  # chapterNum -> (line, row)
+
+    def result(line: int, status: str, **extra) -> str:
+        counts[status] += 1
+        return json.dumps({"line": line, "status": status, **extra}) + "\n"
+
+    async def flush(session: AsyncSession) -> list[str]:
+        pending = sorted(batch.values(), key=lambda item: item[0])
+        batch.clear()
+        try:
+            # Shielded: behind BaseHTTPMiddleware a dropped socket cancels this
+            # task, and a statement cut off midway takes the connection with it
+            with anyio.CancelScope(shield=True):
+                existing = await get_existing_chapter_ids(
+                    session, novel_id, (row["chapterNum"] for _, row in pending)
+                )
+                fresh = [(line, row) for line, row in pending if row["chapterNum"] not in existing]
+                ids = await bulk_create_chapters(
+                    session, novel_id, [row for _, row in fresh], commit=True
+                )
+        except SQLAlchemyError as e:
+            await session.rollback()
+            error = str(getattr(e, "orig", None) or e)
+            return [
+                result(line, "failed", chapterNum=row["chapterNum"], error=error)
+                for line, row in pending
+            ]
+        out = [
+            (line, result(line, "exists", chapterNum=num, chapterId=existing[num]))
+            for line, row in pending
+            if (num := row["chapterNum"]) in existing
+        ]
+        out += [
+            (line, result(line, "created", chapterNum=row["chapterNum"], translationId=tid))
+            for (line, row), tid in zip(fresh, ids, strict=True)
+        ]
+        return [text for _, text in sorted(out)]
+
+    disconnected = False
+    audited = False
+
+    async def audit(session: AsyncSession) -> None:
+        nonlocal audited
+        audited = True
+        with anyio.CancelScope(shield=True):
+            await log_admin_action(
+                session,
+                user_id=user_id,
+                action="STREAM_ADD_CHAPTERS",
+                entity_type="novel",
+                entity_id=novel_id,
+                payload={"chaptersAdded": counts["created"], "disconnected": disconnected},
+            )
+
+    # Not ``async with``: the close has to be shielded like the writes
+    session = session_factory()
+    lines = iter_ndjson_lines(request.stream(), settings.ADMIN_INGEST_MAX_LINE_BYTES)
+    try:
+        try:
+            async for line, raw in lines:
+                if raw is None:
+                    yield result(line, "invalid", error="Line too long")
+                    continue
+                try:
+                    ch = AgentChapterInput.model_validate_json(raw)
+                    row = _chapter_row(ch)
+                except ValidationError as e:
+                    errors = e.errors(include_url=False, include_input=False)
+                    yield result(line, "invalid", error=errors)
+                    continue
+                except ValueError as e:
+                    yield result(line, "invalid", error=str(e))
+                    continue
+                if ch.chapterNum in batch:
+                    yield result(line, "invalid", error=f"Duplicate chapterNum {ch.chapterNum}")
+                    continue
+
+                batch[ch.chapterNum] = (line, row)
+                if len(batch) >= batch_size:
+                    for text in await flush(session):
+                        yield text
+        except ClientDisconnect:
+            # Keep what was fully received; the client just won't see these results
+            disconnected = True
+
+        # Audit before yielding the last results: if the client is gone,
+        # the generator is closed at the next yield
+        tail = await flush(session) if batch else []
+        await audit(session)
+        for text in tail:
+            yield text
+    finally:
+        try:
+            if not audited:
+                # Closed or cancelled mid-stream; counts cover every committed batch
+                disconnected = True
+                await audit(session)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await session.close()
+    yield json.dumps({"done": True, "disconnected": disconnected, **counts}) + "\n"
+
+
 @router.put(
     "/chapters/{translation_id}/content",
     summary="Update the title and content of a chapter translation.",
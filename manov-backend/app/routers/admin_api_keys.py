@@ -8,6 +8,7 @@ from sqlmodel import select
 from app.database import get_session
 from app.middleware.rate_limit import limiter
 from app.models import ApiKey
+from app.services.api_key_auth import api_key_cache
 from app.utils.deps import get_current_admin
 from app.utils.security import generate_api_key
 
@@ -90,4 +91,5 @@ async def revoke_api_key(
         raise HTTPException(status_code=404, detail="API key not found")
     key.isActive = False
     await session.commit()
+    api_key_cache.invalidate(key.id)
     return {"message": "API key revoked"}
@@ -1,21 +1,19 @@
-from datetime import UTC
-
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud import create_user, get_user_by_email
+from app.crud import create_user, get_user_by_email, get_user_by_reset_token
 from app.database import get_session
 from app.middleware.rate_limit import limiter
 from app.models import User
+from app.services.password_hasher import password_hasher
 from app.utils.deps import get_current_user
 from app.utils.security import (
     create_access_token,
     generate_reset_token,
-    get_password_hash,
     get_reset_token_expiry,
-    verify_password,
-    verify_reset_token,
+    hash_reset_token,
+    password_needs_rehash,
 )
 
 router = APIRouter()
@@ -59,8 +57,8 @@ async def register(request: Request, req: UserRegister, session: AsyncSession =
     if exists:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    # 2. Hash Password
-    hashed_pwd = get_password_hash(req.password)
+    # 2. Hash Password (bcrypt jalan di thread pool, bukan di event loop)
+    hashed_pwd = await password_hasher.hash(req.password)
 
     # 3. Create User
     new_user = User(
@@ -95,9 +93,14 @@ async def login(request: Request, req: UserLogin, session: AsyncSession = Depend
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
 
-    if not verify_password(req.password, user.password):
+    if not await password_hasher.verify(req.password, user.password):
         raise HTTPException(status_code=400, detail="Incorrect email or password")
 
+    # Password benar: upgrade hash lama ke cost factor sekarang (BCRYPT_ROUNDS)
+    if password_needs_rehash(user.password):
+        user.password = await password_hasher.hash(req.password)
+        await session.commit()
+
     access_token = create_access_token(data={"sub": str(user.id), "role": user.role})
 
     return {
@@ -140,7 +143,7 @@ async def forgot_password(
     if user:
         token, token_hash = generate_reset_token()
         user.resetTokenHash = token_hash
-        user.resetTokenExpires = get_reset_token_expiry()
+        user.resetTokenExpires = get_reset_token_expiry().replace(tzinfo=None)
         await session.commit()
         # NOTE: In production, send token via email. For dev, return it in response.
         return {
@@ -157,34 +160,13 @@ async def reset_password(
     request: Request, req: ResetPasswordRequest, session: AsyncSession = Depends(get_session)
 ):
     """Reset password using a valid reset token."""
-
-    # Find user by iterating through users with reset tokens (not ideal, but works for now)
-    # Better approach: store token -> user mapping or use a dedicated lookup
-    from sqlalchemy import select
-
-    from app.models import User as UserModel
-
-    result = await session.execute(
-        select(UserModel).where(UserModel.resetTokenHash.isnot(None))
-    )
-    users_with_tokens = result.scalars().all()
-
-    user = None
-    for u in users_with_tokens:
-        if verify_reset_token(req.token, u.resetTokenHash):
-            user = u
-            break
-
+    # Satu lookup di index hash; token kadaluarsa sudah tersaring di SQL
+    user = await get_user_by_reset_token(session, hash_reset_token(req.token))
     if not user:
         raise HTTPException(status_code=400, detail="Invalid or expired token")
 
-    # Check expiry
-    from datetime import datetime
-    if user.resetTokenExpires and user.resetTokenExpires.replace(tzinfo=UTC) < datetime.now(UTC):
-        raise HTTPException(status_code=400, detail="Token expired")
-
     # Update password and clear token
-    user.password = get_password_hash(req.new_password)
+    user.password = await password_hasher.hash(req.new_password)
     user.resetTokenHash = None
     user.resetTokenExpires = None
     await session.commit()
@@ -1,22 +1,20 @@
-from datetime import UTC, datetime
-
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
 
 from app.crud import (
-    get_next_chapter,
+    get_chapter_for_reader,
+    get_chapter_index,
     get_novel_by_slug,
     get_novels,
-    get_prev_chapter,
-    get_translation_by_chapter_and_language,
     search_novels,
     upsert_history,
 )
-from app.database import get_session
-from app.models import Chapter, Novel
-from app.schemas import ChapterContent, Genre, NovelDetail, NovelList
+from app.database import get_session, get_session_factory
+from app.models import Novel, utc_now
+from app.schemas import ChapterContent, ChapterItem, Genre, NovelDetail, NovelList
+from app.utils.cursor import set_next_cursor
 from app.utils.deps import get_current_user_optional
 
 router = APIRouter()
@@ -29,6 +27,22 @@ async def get_optional_user(
     return user["id"] if user else None
 
 
+def _to_chapter_items(rows, language: str = "EN") -> list[ChapterItem]:
+    """Map projected chapter-index rows onto the ChapterItem schema."""
+    return [
+        ChapterItem(
+            id=chapter_id,
+            chapterNum=chapter_num,
+            translations=(
+                [{"title": title, "language": language, "publishedAt": published_at}]
+                if title is not None
+                else []
+            ),
+        )
+        for chapter_id, chapter_num, title, published_at in rows
+    ]
+
+
 @router.get("/genres", response_model=list[Genre])
 async def get_all_genres(session: AsyncSession = Depends(get_session)):
     from app.crud import get_genres
@@ -38,6 +52,7 @@ async def get_all_genres(session: AsyncSession = Depends(get_session)):
 
 @router.get("/novels", response_model=list[NovelList])
 async def get_all_novels(
+    response: Response,
     q: str = "",
     skip: int = 0,
     limit: int = 20,
@@ -45,25 +60,31 @@ async def get_all_novels(
     sort_order: str = "desc",
     status: str = "",
     genre_id: int = 0,
+    cursor: str = "",
     session: AsyncSession = Depends(get_session),
 ):
-    # --- Search mode ---
+    # --- Search mode (relevance-ordered, offset pagination only) ---
     if q.strip() and len(q.strip()) >= 2:
         novels = await search_novels(session, query=q.strip(), skip=skip, limit=limit)
     else:
-        novels = await get_novels(
-            session,
-            skip=skip,
-            limit=limit,
-            sort_by=sort_by,
-            sort_order=sort_order,
-            status=status,
-            genre_id=genre_id,
-        )
-
-    # Map to schema (get_novels now returns tuples of (Novel, chapter_count))
+        try:
+            novels, page_cursor = await get_novels(
+                session,
+                skip=skip,
+                limit=limit,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                status=status,
+                genre_id=genre_id,
+                cursor=cursor,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        set_next_cursor(response, page_cursor)
+
+    # Map to schema (chapterCount is denormalized on Novel)
     results = []
-    for novel, chapter_count in novels:
+    for novel in novels:
         n_dict = {
             "id": novel.id,
             "title": novel.title,
@@ -72,7 +93,9 @@ async def get_all_novels(
             "status": novel.status,
             "author": novel.author,
             "genres": [Genre(id=g.id, name=g.name) for g in novel.genres],
-            "chapterCount": chapter_count or 0,
+            "chapterCount": novel.chapterCount,
+            "latestChapterNum": novel.latestChapterNum,
+            "latestChapterAt": novel.latestChapterAt,
             "synopsis": novel.synopsis,
             "averageRating": novel.averageRating,
             "ratingCount": novel.ratingCount,
@@ -99,7 +122,7 @@ async def get_trending_novels(
 
     novels = await get_trending_novels(session, limit=limit)
     results = []
-    for novel, chapter_count in novels:
+    for novel in novels:
         n_dict = {
             "id": novel.id,
             "title": novel.title,
@@ -108,7 +131,9 @@ async def get_trending_novels(
             "status": novel.status,
             "author": novel.author,
             "genres": [Genre(id=g.id, name=g.name) for g in novel.genres],
-            "chapterCount": chapter_count or 0,
+            "chapterCount": novel.chapterCount,
+            "latestChapterNum": novel.latestChapterNum,
+            "latestChapterAt": novel.latestChapterAt,
             "synopsis": novel.synopsis,
             "averageRating": novel.averageRating,
             "ratingCount": novel.ratingCount,
@@ -121,77 +146,111 @@ async def get_trending_novels(
 async def track_novel_view(
     slug: str, session: AsyncSession = Depends(get_session)
 ):
-    """Increment view count for a novel."""
-    from app.crud import get_novel_by_slug, increment_view_count
+    """Buffer a view for the novel; counts are flushed to the DB periodically."""
+    from app.services.view_counter import view_counter
 
     novel = await get_novel_by_slug(session, slug)
     if not novel:
         raise HTTPException(status_code=404, detail="Novel not found")
 
-    await increment_view_count(session, novel.id)
+    await view_counter.record(novel.id)
     return {"message": "View tracked"}
 
 
 @router.get("/novels/{slug}", response_model=NovelDetail)
 async def get_novel_detail(slug: str, session: AsyncSession = Depends(get_session)):
-    # Kita include publishedAt di sini
     result = await session.execute(
-        select(Novel)
-        .where(Novel.slug == slug)
-        .options(
-            selectinload(Novel.genres),
-            selectinload(Novel.chapters).selectinload(Chapter.translations),
-        )
+        select(Novel).where(Novel.slug == slug).options(selectinload(Novel.genres))
     )
     novel = result.scalar_one_or_none()
 
     if not novel:
         raise HTTPException(status_code=404, detail="Novel not found")
 
-    # Filter translations to EN only for each chapter
-    for ch in novel.chapters:
-        ch.translations = [t for t in ch.translations if t.language == "EN"]
+    # Chapter list is a column projection (no rawContent / content), EN only
+    chapters = _to_chapter_items(await get_chapter_index(session, novel.id, "EN"))
+
+    return NovelDetail.model_validate({
+        "id": novel.id,
+        "title": novel.title,
+        "slug": novel.slug,
+        "coverUrl": novel.coverUrl,
+        "status": novel.status,
+        "author": novel.author,
+        "genres": [Genre(id=g.id, name=g.name) for g in novel.genres],
+        "chapterCount": len(chapters),
+        "latestChapterNum": novel.latestChapterNum,
+        "latestChapterAt": novel.latestChapterAt,
+        "synopsis": novel.synopsis,
+        "averageRating": novel.averageRating,
+        "ratingCount": novel.ratingCount,
+        "originalTitle": novel.originalTitle,
+        "updatedAt": novel.updatedAt,
+        "chapters": chapters,
+    })
+
+
+@router.get("/novels/{slug}/chapters", response_model=list[ChapterItem])
+async def get_novel_chapter_index(
+    slug: str,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    start: int = 0,
+    end: int = 0,
+    session: AsyncSession = Depends(get_session),
+):
+    """Paginated chapter index; ``start``/``end`` restrict the chapter-number range."""
+    novel = await get_novel_by_slug(session, slug)
+    if not novel:
+        raise HTTPException(status_code=404, detail="Novel not found")
+
+    rows = await get_chapter_index(
+        session, novel.id, "EN", skip=skip, limit=limit, start_num=start, end_num=end
+    )
+    return _to_chapter_items(rows)
+
 
-    return novel
+async def _record_history(
+    session_factory: async_sessionmaker[AsyncSession],
+    user_id: int,
+    novel_id: int,
+    chapter_num: int,
+) -> None:
+    """Persist reading history after the response has been sent."""
+    async with session_factory() as session:
+        try:
+            await upsert_history(session, user_id, novel_id, chapter_num)
+        except Exception as e:
+            print(f"⚠️ History write failed (user {user_id}, novel {novel_id}): {e}")
 
 
 @router.get("/novels/{slug}/chapters/{chapter_num}", response_model=ChapterContent)
 async def get_chapter_content(
     slug: str,
     chapter_num: int,
+    background_tasks: BackgroundTasks,
     user_id: int | None = Depends(get_optional_user),
     session: AsyncSession = Depends(get_session),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ):
-    # 1. Cari Novel & Chapter
-    novel = await get_novel_by_slug(session, slug)
-    if not novel:
+    # 1. Novel, Chapter, Translation & Prev/Next dalam satu query
+    row = await get_chapter_for_reader(session, slug, chapter_num, "EN")
+    if not row:
         raise HTTPException(status_code=404, detail="Novel not found")
 
-    chapter = await session.scalar(
-        select(Chapter).where(
-            Chapter.novelId == novel.id, Chapter.chapterNum == chapter_num
-        )
-    )
-    if not chapter:
+    novel_id, novel_title, chapter_id, translation, prev_num, next_num = row
+    if not chapter_id or not translation:
         raise HTTPException(status_code=404, detail="Chapter not found")
 
-    translation = await get_translation_by_chapter_and_language(
-        session, chapter.id, "EN"
-    )
-    if not translation:
-        raise HTTPException(status_code=404, detail="Chapter not found")
-
-    # 2. Cek Lock (Logic Gembok Kemarin)
-    if translation.publishedAt and translation.publishedAt > datetime.now(UTC):
+    # 2. Cek Lock (publishedAt disimpan sebagai naive UTC)
+    if translation.publishedAt and translation.publishedAt.replace(tzinfo=None) > utc_now():
         raise HTTPException(status_code=403, detail="Chapter locked")
 
-    # 3. --- LOGIC HISTORY BARU ---
+    # 3. History ditulis setelah response terkirim (bukan di critical path)
     if user_id:
-        await upsert_history(session, user_id, novel.id, chapter_num)
-
-    # 4. Cek Next & Prev Chapter
-    next_chapter = await get_next_chapter(session, novel.id, chapter_num)
-    prev_chapter = await get_prev_chapter(session, novel.id, chapter_num)
+        background_tasks.add_task(
+            _record_history, session_factory, user_id, novel_id, chapter_num
+        )
 
     return ChapterContent.model_validate({
         "id": translation.id,
@@ -200,7 +259,7 @@ async def get_chapter_content(
         "title": translation.title,
         "content": translation.content,
         "language": translation.language,
-        "nextChapterNum": next_chapter.chapterNum if next_chapter else None,
-        "prevChapterNum": prev_chapter.chapterNum if prev_chapter else None,
-        "novelTitle": novel.title,
+        "nextChapterNum": next_num,
+        "prevChapterNum": prev_num,
+        "novelTitle": novel_title,
     })
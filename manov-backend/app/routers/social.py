@@ -1,7 +1,7 @@
 from datetime import datetime
 
 import nh3
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -14,8 +14,8 @@ from app.crud import (
     delete_review,
     get_chapter_comments,
     get_comment_by_id,
-    get_novel_combined_rating_stats,
     get_novel_comments,
+    get_novel_rating_summary,
     get_review_by_id,
     get_review_by_user_and_novel,
     get_reviews_by_novel,
@@ -23,7 +23,8 @@ from app.crud import (
 )
 from app.database import get_session
 from app.middleware.rate_limit import limiter
-from app.models import Comment, Novel, Review
+from app.models import Comment, Review
+from app.utils.cursor import set_next_cursor
 from app.utils.deps import get_current_user
 
 router = APIRouter()
@@ -93,9 +94,20 @@ async def rate_novel(
 
 @router.get("/novels/{id}/comments", response_model=list[CommentResponse])
 async def get_novel_comments_endpoint(
-    id: int, skip: int = 0, limit: int = 10, session: AsyncSession = Depends(get_session)
+    id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: str = "",
+    session: AsyncSession = Depends(get_session),
 ):
-    comments = await get_novel_comments(session, id, skip=skip, limit=limit)
+    try:
+        comments, page_cursor = await get_novel_comments(
+            session, id, skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    set_next_cursor(response, page_cursor)
 
     return [
         {
@@ -147,9 +159,20 @@ async def post_novel_comment(
 
 @router.get("/chapters/{id}/comments", response_model=list[CommentResponse])
 async def get_chapter_comments_endpoint(
-    id: int, skip: int = 0, limit: int = 10, session: AsyncSession = Depends(get_session)
+    id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: str = "",
+    session: AsyncSession = Depends(get_session),
 ):
-    comments = await get_chapter_comments(session, id, skip=skip, limit=limit)
+    try:
+        comments, page_cursor = await get_chapter_comments(
+            session, id, skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    set_next_cursor(response, page_cursor)
 
     return [
         {
@@ -223,9 +246,20 @@ async def delete_comment_endpoint(
 
 @router.get("/novels/{id}/reviews", response_model=list[ReviewResponse])
 async def get_novel_reviews(
-    id: int, skip: int = 0, limit: int = 10, session: AsyncSession = Depends(get_session)
+    id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: str = "",
+    session: AsyncSession = Depends(get_session),
 ):
-    reviews = await get_reviews_by_novel(session, id, skip=skip, limit=limit)
+    try:
+        reviews, page_cursor = await get_reviews_by_novel(
+            session, id, skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    set_next_cursor(response, page_cursor)
     return [
         {
             "id": review.id,
@@ -262,13 +296,8 @@ async def post_novel_review(
         )
         await create_review(session, review)
 
-    # Update novel combined rating stats (includes both quick ratings and reviews)
-    avg, count = await get_novel_combined_rating_stats(session, id)
-    novel = await session.get(Novel, id)
-    if novel:
-        novel.averageRating = avg
-        novel.ratingCount = count
-        await session.commit()
+    # create_review/update_review keep the novel's rating aggregates current
+    avg, count = await get_novel_rating_summary(session, id)
 
     return {
         "message": "Review submitted",
@@ -295,14 +324,6 @@ async def update_review_endpoint(
 
     await update_review(session, review, req.score, nh3.clean(req.content))
 
-    # Update novel combined rating stats
-    avg, count = await get_novel_combined_rating_stats(session, review.novelId)
-    novel = await session.get(Novel, review.novelId)
-    if novel:
-        novel.averageRating = avg
-        novel.ratingCount = count
-        await session.commit()
-
     return {"message": "Review updated", "id": review.id}
 
 
@@ -316,15 +337,6 @@ async def delete_review_endpoint(
     if review.userId != user["id"]:
         raise HTTPException(status_code=403, detail="Not authorized to delete this review")
 
-    novel_id = review.novelId
     await delete_review(session, id)
 
-    # Update novel combined rating stats
-    avg, count = await get_novel_combined_rating_stats(session, novel_id)
-    novel = await session.get(Novel, novel_id)
-    if novel:
-        novel.averageRating = avg
-        novel.ratingCount = count
-        await session.commit()
-
     return {"message": "Review deleted"}
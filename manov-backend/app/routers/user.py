@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,12 +15,14 @@ from app.crud import (
     get_user_library,
     get_user_notifications,
     mark_all_notifications_read,
+    mark_chapter_event_read,
     mark_notification_read,
     remove_from_library,
     upsert_history,
 )
 from app.database import get_session
 from app.schemas import NovelHistory, NovelList
+from app.utils.cursor import set_next_cursor
 from app.utils.deps import get_current_user
 
 router = APIRouter()
@@ -41,7 +45,7 @@ async def get_user_library_endpoint(user: dict = Depends(get_current_user), sess
 
     # Flatten structure & map to schema
     results = []
-    for item, chapter_count in items:
+    for item in items:
         n = item.novel
         n_dict = {
             "id": n.id,
@@ -51,7 +55,9 @@ async def get_user_library_endpoint(user: dict = Depends(get_current_user), sess
             "status": n.status,
             "author": n.author,
             "genres": [{"id": g.id, "name": g.name} for g in n.genres],
-            "chapterCount": chapter_count or 0,
+            "chapterCount": n.chapterCount,
+            "latestChapterNum": n.latestChapterNum,
+            "latestChapterAt": n.latestChapterAt,
             "synopsis": n.synopsis,
             "averageRating": n.averageRating,
             "ratingCount": n.ratingCount,
@@ -126,7 +132,7 @@ async def get_user_history_endpoint(user: dict = Depends(get_current_user), sess
             "status": h.novel.status,
             "author": h.novel.author,
             "genres": [],
-            "chapterCount": 0,
+            "chapterCount": h.novel.chapterCount,
             "synopsis": h.novel.synopsis,
             "averageRating": h.novel.averageRating,
             "ratingCount": h.novel.ratingCount,
@@ -196,24 +202,21 @@ async def get_history_for_novel(
 # --- NOTIFICATIONS ---
 @router.get("/notifications")
 async def get_notifications(
+    response: Response,
     skip: int = 0,
     limit: int = 20,
+    cursor: str = "",
     user: dict = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    notifications = await get_user_notifications(session, user["id"], skip=skip, limit=limit)
-    return [
-        {
-            "id": n.id,
-            "type": n.type,
-            "message": n.message,
-            "novelId": n.novelId,
-            "chapterId": n.chapterId,
-            "isRead": n.isRead,
-            "createdAt": n.createdAt,
-        }
-        for n in notifications
-    ]
+    try:
+        notifications, page_cursor = await get_user_notifications(
+            session, user["id"], skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    set_next_cursor(response, page_cursor)
+    return notifications
 
 
 @router.get("/notifications/unread-count")
@@ -227,11 +230,16 @@ async def get_unread_count(
 @router.post("/notifications/{notification_id}/read")
 async def mark_notification_as_read(
     notification_id: int,
+    source: Literal["notification", "event"] = "notification",
     user: dict = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    notification = await mark_notification_read(session, notification_id, user["id"])
-    if not notification:
+    # ``source`` comes from the feed item: fan-in events mark their novel read up to them
+    if source == "event":
+        found = await mark_chapter_event_read(session, notification_id, user["id"])
+    else:
+        found = await mark_notification_read(session, notification_id, user["id"])
+    if not found:
         raise HTTPException(status_code=404, detail="Notification not found")
     return {"message": "Marked as read"}
 
@@ -33,6 +33,8 @@ class NovelList(BaseModel):
     author: str | None = None
     genres: list[Genre] = []
     chapterCount: int = 0
+    latestChapterNum: int | None = None
+    latestChapterAt: datetime | None = None
     synopsis: str | None = None
     averageRating: float = 0.0
     ratingCount: int = 0
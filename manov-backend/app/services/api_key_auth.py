@@ -0,0 +1,124 @@
+"""Hot-path support for API-key authentication.
+
+MCP agents call admin endpoints hundreds of times a minute with the same
+key. :class:`ApiKeyCache` keeps recently verified keys (by SHA-256 digest,
+never the plaintext) for a short TTL so most requests skip the DB, and
+:class:`ApiKeyUsageBuffer` coalesces ``lastUsedAt`` writes into one
+periodic batch instead of a transaction per request.
+
+The cache is per process: revoking a key evicts it immediately in the
+worker that served the DELETE, while other uvicorn workers stop accepting
+it within ``API_KEY_CACHE_TTL_SECONDS``.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.crud import touch_api_keys
+from app.database import AsyncSessionLocal
+from app.models import utc_now
+
+
+class ApiKeyCache:
+    """Bounded LRU of ``key_hash -> (key_id, principal)`` with a per-entry TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[float, int, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key_hash: str) -> tuple[int, dict] | None:
+        entry = self._entries.get(key_hash)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                del self._entries[key_hash]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key_hash)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def put(self, key_hash: str, key_id: int, principal: dict) -> None:
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key_hash] = (self.clock() + self.ttl, key_id, principal)
+        self._entries.move_to_end(key_hash)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key_id: int) -> None:
+        """Drop a revoked key. Linear, but revocations are rare and the cache small."""
+        for key_hash in [h for h, entry in self._entries.items() if entry[1] == key_id]:
+            del self._entries[key_hash]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class ApiKeyUsageBuffer:
+    """Collects ``lastUsedAt`` per key in memory and writes them in one batch."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        flush_interval: float = 60.0,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self._pending: dict[int, datetime] = {}
+        self._task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+    def touch(self, key_id: int) -> None:
+        self._pending[key_id] = utc_now()
+
+    async def flush(self) -> int:
+        """Write pending timestamps. Returns the number of keys updated."""
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            try:
+                async with self.session_factory() as session:
+                    await touch_api_keys(session, pending)
+            except Exception as e:
+                # Keep the newest timestamp per key for the next attempt
+                for key_id, used_at in pending.items():
+                    self._pending[key_id] = max(used_at, self._pending.get(key_id, used_at))
+                print(f"⚠️ API key lastUsedAt flush failed, will retry: {e}")
+                return 0
+            return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic loop and flush whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+
+api_key_cache = ApiKeyCache(
+    max_entries=settings.API_KEY_CACHE_MAX_ENTRIES,
+    ttl=settings.API_KEY_CACHE_TTL_SECONDS,
+)
+api_key_usage = ApiKeyUsageBuffer(flush_interval=settings.API_KEY_LAST_USED_FLUSH_SECONDS)
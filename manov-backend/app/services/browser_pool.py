@@ -0,0 +1,98 @@
+"""Long-lived async Playwright browser shared by every scrape job.
+
+The sync crawler launched a fresh Chromium per ``/admin/scrape`` call and
+slept a threadpool thread between pages. Here one browser is started on
+first use and kept alive; each crawl borrows a page (with its own context,
+so Cloudflare cookies survive between jobs) from a fixed-size pool.
+``HostScheduler`` spaces requests to the same host with ``asyncio.sleep``,
+so several novels can be crawled concurrently on the event loop.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from app.config import settings
+
+LAUNCH_ARGS = ["--disable-blink-features=AutomationControlled"]
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+class HostScheduler:
+    """Per-host politeness: at most one request per host every ``min``–``max`` seconds."""
+
+    def __init__(self, min_delay: float | None = None, max_delay: float | None = None):
+        self.min_delay = settings.CRAWL_DELAY_MIN if min_delay is None else min_delay
+        self.max_delay = settings.CRAWL_DELAY_MAX if max_delay is None else max_delay
+        self._next_allowed: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def wait(self, url: str) -> None:
+        """Sleep until ``url``'s host may be hit again, then reserve the next slot."""
+        host = urlsplit(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            delay = self._next_allowed.get(host, 0.0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_allowed[host] = time.monotonic() + random.uniform(
+                self.min_delay, self.max_delay
+            )
+
+
+class BrowserPool:
+    def __init__(self, size: int | None = None, headless: bool | None = None):
+        self.size = size or settings.CRAWL_BROWSER_PAGES
+        self.headless = settings.CRAWL_HEADLESS if headless is None else headless
+        self._playwright = None
+        self._browser = None
+        self._pages: asyncio.Queue | None = None
+        self._start_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._browser is not None:
+                return
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.headless, args=LAUNCH_ARGS
+            )
+            self._pages = asyncio.Queue()
+            for _ in range(self.size):
+                context = await self._browser.new_context(
+                    user_agent=USER_AGENT, viewport={"width": 1280, "height": 800}
+                )
+                self._pages.put_nowait(await context.new_page())
+            print(f"🌐 Browser pool ready ({self.size} pages)")
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator:
+        """Borrow a page for the duration of a crawl; waits if all are in use."""
+        await self.start()
+        page = await self._pages.get()
+        try:
+            yield page
+        finally:
+            self._pages.put_nowait(page)
+
+    async def close(self) -> None:
+        async with self._start_lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+            self._pages = None
+
+
+browser_pool = BrowserPool()
+host_scheduler = HostScheduler()
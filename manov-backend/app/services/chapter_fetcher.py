@@ -0,0 +1,135 @@
+"""Plain-HTTP fast path for chapter pages.
+
+69shuba chapter pages are server-rendered, so most of them can be fetched
+with a pooled keep-alive ``httpx`` client at a fraction of a browser render's
+CPU and memory. The browser is only needed when Cloudflare serves a
+challenge; once it is solved there, the context's cookies (``cf_clearance``)
+are copied into the HTTP client so later chapters go back to the fast path.
+The client sends the same User-Agent as the browser pool, which Cloudflare
+requires for the clearance cookie to be honoured.
+"""
+
+import re
+from urllib.parse import urljoin
+
+import httpx
+
+from app.config import settings
+from app.services.browser_pool import USER_AGENT
+
+HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+}
+
+_CHALLENGE_MARKERS = (
+    "cf-challenge",
+    "challenge-platform",
+    "cf_chl_",
+    "Just a moment...",
+    "Attention Required! | Cloudflare",
+)
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+_NEXT_LINK_RE = re.compile(r"""<a[^>]*href=["']([^"']+)["'][^>]*>\s*下一章""")
+# GBK and GB2312 pages routinely contain GB18030-only characters
+_CHARSET_ALIASES = {"gbk": "gb18030", "gb2312": "gb18030", "x-gbk": "gb18030"}
+
+
+def detect_encoding(content: bytes, content_type: str | None) -> str:
+    """Charset from the Content-Type header, else the ``<meta>`` tag, else UTF-8."""
+    charset = None
+    if content_type and "charset=" in content_type.lower():
+        charset = content_type.lower().split("charset=", 1)[1].split(";")[0].strip(" \"'")
+    if not charset:
+        match = _META_CHARSET_RE.search(content[:4096])
+        if match:
+            charset = match.group(1).decode("ascii", "ignore").lower()
+    charset = (charset or "utf-8").lower()
+    return _CHARSET_ALIASES.get(charset, charset)
+
+
+def decode_html(content: bytes, content_type: str | None = None) -> str:
+    encoding = detect_encoding(content, content_type)
+    try:
+        return content.decode(encoding)
+    except (LookupError, UnicodeDecodeError):
+        # Mislabelled page: the site is GBK unless it really is UTF-8
+        try:
+            return content.decode("utf-8")
+        except UnicodeDecodeError:
+            return content.decode("gb18030", errors="replace")
+
+
+def is_challenge_page(status_code: int, html: str) -> bool:
+    """True for Cloudflare interstitials and anything that is not a chapter page."""
+    if status_code in (403, 429, 503):
+        return True
+    if any(marker in html for marker in _CHALLENGE_MARKERS):
+        return True
+    return 'class="txtnav"' not in html
+
+
+def find_next_url(html: str, base_url: str) -> str | None:
+    """Cheap regex lookup of the "下一章" link, without a full parse."""
+    match = _NEXT_LINK_RE.search(html)
+    return urljoin(base_url, match.group(1)) if match else None
+
+
+class HttpChapterFetcher:
+    def __init__(self, timeout: float | None = None, max_connections: int | None = None):
+        self.client = httpx.AsyncClient(
+            headers=HEADERS,
+            follow_redirects=True,
+            timeout=timeout or settings.CRAWL_HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=max_connections or settings.CRAWL_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=max_connections or settings.CRAWL_HTTP_MAX_CONNECTIONS,
+            ),
+        )
+        self.hits = 0
+        self.fallbacks = 0
+
+    def load_cookies(self, cookies: list[dict]) -> None:
+        """Adopt cookies from a Playwright context (``await context.cookies()``)."""
+        for cookie in cookies:
+            self.client.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+            )
+
+    async def fetch(self, url: str) -> str | None:
+        """Return the chapter HTML, or ``None`` if the browser is needed."""
+        try:
+            response = await self.client.get(url)
+        except httpx.HTTPError as e:
+            print(f"   ⚠️ HTTP fetch failed ({e.__class__.__name__}), falling back to browser")
+            self.fallbacks += 1
+            return None
+
+        html = decode_html(response.content, response.headers.get("content-type"))
+        if is_challenge_page(response.status_code, html):
+            self.fallbacks += 1
+            return None
+        self.hits += 1
+        return html
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def fetch_static_html(url: str) -> str | None:
+    """Blocking one-off variant for the sync scraper scripts."""
+    try:
+        response = httpx.get(
+            url, headers=HEADERS, follow_redirects=True, timeout=settings.CRAWL_HTTP_TIMEOUT
+        )
+    except httpx.HTTPError:
+        return None
+    html = decode_html(response.content, response.headers.get("content-type"))
+    return None if is_challenge_page(response.status_code, html) else html
+
+
+http_fetcher = HttpChapterFetcher()
@@ -0,0 +1,214 @@
+"""Chapter-page parsers behind one ``extract_chapter(html)`` interface.
+
+Every backend returns ``(title, content, next_url)`` for a 69shuba chapter
+page, or ``None`` when the page has no ``.txtnav`` container. ``content`` is
+the cleaned paragraphs joined with blank lines, the format the translator
+chunks on.
+
+Backends, fastest first:
+
+* ``selectolax`` — Lexbor (C) parser; needs the ``parsers`` extra.
+* ``lxml`` — libxml2 parser; needs the ``parsers`` extra.
+* ``bs4`` — BeautifulSoup with ``html.parser``; always available.
+
+``CHAPTER_PARSER=auto`` (the default) picks the fastest one installed. All
+three must produce identical output; ``tests/test_chapter_parser.py`` checks
+them against the same golden files.
+"""
+
+from collections.abc import Callable
+from functools import cache
+
+from bs4 import BeautifulSoup
+
+from app.config import settings
+
+ChapterParts = tuple[str, str, str | None]
+
+# Removed from the .txtnav container before its text is read. The union of
+# the crawler's and NovelScraper's original lists, so neither got looser.
+JUNK_SELECTORS = [
+    ".txtinfo",
+    "#txtright",
+    ".contentadv",
+    ".bottom-ad",
+    ".bottom-ad2",
+    ".page1",
+    "script",
+    "style",
+    "h1",
+    ".mybox h3",
+    ".tools",
+]
+JUNK_CSS = ", ".join(JUNK_SELECTORS)
+JUNK_MARKERS = ("loadAdv", "69书吧")
+END_MARKER = "(本章完)"  # anything after it is site chrome, not chapter text
+SITE_ROOT = "https://www.69shuba.com"
+
+
+def clean_text(raw_text: str) -> str:
+    """Strip blank and junk lines up to the end marker, then join with blank lines."""
+    clean_lines = []
+    for line in raw_text.split("\n"):
+        line = line.strip()
+        if END_MARKER in line:
+            break
+        if line and not any(marker in line for marker in JUNK_MARKERS):
+            clean_lines.append(line)
+    return "\n\n".join(clean_lines)
+
+
+def clean_title(page_title: str | None) -> str:
+    return page_title.split("-")[0].strip() if page_title else "Unknown"
+
+
+def absolute_next_url(href: str | None) -> str | None:
+    if not href:
+        return None
+    # 69shuba kadang kasih link relatif (/txt/...) atau absolute
+    return href if href.startswith("http") else f"{SITE_ROOT}{href}"
+
+
+def extract_chapter_bs4(html: str) -> ChapterParts | None:
+    soup = BeautifulSoup(html, "html.parser")
+    container = soup.select_one(".txtnav")
+    if container is None:
+        return None
+
+    for tag in container.select(JUNK_CSS):
+        tag.decompose()
+    content = clean_text(container.get_text(separator="\n"))
+    title = clean_title(soup.title.string if soup.title else None)
+
+    next_url = None
+    page1_div = soup.select_one(".page1")
+    if page1_div:
+        for link in page1_div.find_all("a"):
+            if "下一章" in link.get_text():
+                next_url = absolute_next_url(link.get("href"))
+                break
+
+    return title, content, next_url
+
+
+def extract_chapter_selectolax(html: str) -> ChapterParts | None:
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    container = tree.css_first(".txtnav")
+    if container is None:
+        return None
+
+    for node in container.css(JUNK_CSS):
+        node.decompose()
+    content = clean_text(container.text(separator="\n"))
+    title_node = tree.css_first("title")
+    title = clean_title(title_node.text() if title_node else None)
+
+    next_url = None
+    page1_div = tree.css_first(".page1")
+    if page1_div:
+        for link in page1_div.css("a"):
+            if "下一章" in link.text():
+                next_url = absolute_next_url(link.attributes.get("href"))
+                break
+
+    return title, content, next_url
+
+
+def _selector_xpath(selector: str) -> str:
+    """XPath predicate for the selectors used here.
+
+    Each step is a simple ``.class`` / ``#id`` / ``tag`` selector; steps
+    separated by spaces are descendant combinators (``.mybox h3``).
+    """
+    *outer, selector = selector.split()
+    predicate = _simple_selector_xpath(selector)
+    if outer:
+        predicate += f" and ancestor::*[{_selector_xpath(' '.join(outer))}]"
+    return predicate
+
+
+def _simple_selector_xpath(selector: str) -> str:
+    if selector.startswith("."):
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {selector[1:]} ')"
+    if selector.startswith("#"):
+        return f"@id='{selector[1:]}'"
+    return f"self::{selector}"
+
+
+@cache
+def _lxml_xpaths():
+    # Compiled once; lxml's CSS support would need the extra cssselect package
+    from lxml import etree
+
+    junk = " or ".join(_selector_xpath(s) for s in JUNK_SELECTORS)
+    return (
+        etree.XPath(f"//*[{_selector_xpath('.txtnav')}]"),
+        etree.XPath(f".//*[{junk}]"),
+        etree.XPath(f"//*[{_selector_xpath('.page1')}]//a"),
+    )
+
+
+def extract_chapter_lxml(html: str) -> ChapterParts | None:
+    import lxml.html
+
+    find_container, find_junk, find_page_links = _lxml_xpaths()
+    doc = lxml.html.document_fromstring(html)
+    found = find_container(doc)
+    if not found:
+        return None
+    container = found[0]
+
+    for element in find_junk(container):
+        # drop_tree keeps the element's tail text, like BeautifulSoup's decompose
+        element.drop_tree()
+    content = clean_text("\n".join(container.xpath(".//text()")))
+    title = clean_title(doc.findtext(".//title"))
+
+    next_url = None
+    for link in find_page_links(doc):
+        if "下一章" in link.text_content():
+            next_url = absolute_next_url(link.get("href"))
+            break
+
+    return title, content, next_url
+
+
+BACKENDS: dict[str, Callable[[str], ChapterParts | None]] = {
+    "selectolax": extract_chapter_selectolax,
+    "lxml": extract_chapter_lxml,
+    "bs4": extract_chapter_bs4,
+}
+_BACKEND_MODULES = {"selectolax": "selectolax.lexbor", "lxml": "lxml.html", "bs4": "bs4"}
+
+
+def backend_available(name: str) -> bool:
+    try:
+        __import__(_BACKEND_MODULES[name])
+    except ImportError:
+        return False
+    return True
+
+
+def available_backends() -> list[str]:
+    return [name for name in BACKENDS if backend_available(name)]
+
+
+@cache
+def get_parser(name: str | None = None) -> Callable[[str], ChapterParts | None]:
+    """Resolve a backend by name; ``auto`` means the fastest installed one."""
+    name = (name or settings.CHAPTER_PARSER).lower()
+    if name == "auto":
+        name = available_backends()[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown CHAPTER_PARSER {name!r} (expected one of {list(BACKENDS)})")
+    if not backend_available(name):
+        print(f"⚠️ CHAPTER_PARSER={name} is not installed, falling back to bs4")
+        name = "bs4"
+    return BACKENDS[name]
+
+
+def extract_chapter(html: str) -> ChapterParts | None:
+    """Extract ``(title, content, next_url)`` with the configured backend."""
+    return get_parser()(html)
@@ -0,0 +1,94 @@
+"""Background fan-out of new-chapter notifications.
+
+The crawl pipeline only enqueues "chapter N of novel X was published";
+a single worker task turns each event into notification rows with one
+set-based ``INSERT ... SELECT`` (``crud.fan_out_chapter_notifications``),
+so a novel with tens of thousands of followers never slows down the
+translate-and-save loop. With ``NOTIFICATION_MODE=fanin`` the event is
+stored once (``crud.record_chapter_event``) and feeds are computed from
+each follower's library cursor instead.
+"""
+
+import asyncio
+import contextlib
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.crud import fan_out_chapter_notifications, record_chapter_event
+from app.database import AsyncSessionLocal
+
+
+@dataclass
+class ChapterEvent:
+    novel_id: int
+    novel_title: str
+    chapter_id: int
+    chapter_num: int
+
+    @property
+    def message(self) -> str:
+        return f"{self.novel_title} — Chapter {self.chapter_num} is now available!"
+
+
+class ChapterNotifier:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal):
+        self.session_factory = session_factory
+        self._queue: asyncio.Queue[ChapterEvent] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def publish(self, event: ChapterEvent) -> None:
+        """Queue ``event`` for fan-out; never blocks the caller."""
+        self._queue.put_nowait(event)
+        # Processor runs outside the app lifespan too (scripts, one-off tasks)
+        self.start()
+
+    async def deliver(self, event: ChapterEvent) -> int:
+        """Persist ``event``; returns the number of notification rows written."""
+        async with self.session_factory() as session:
+            if settings.NOTIFICATION_MODE == "fanin":
+                await record_chapter_event(
+                    session,
+                    event.novel_id,
+                    event.chapter_id,
+                    event.chapter_num,
+                    event.message,
+                    commit=True,
+                )
+                return 1
+            return await fan_out_chapter_notifications(
+                session, event.novel_id, event.chapter_id, event.message, commit=True
+            )
+
+    async def _run(self) -> None:
+        while True:
+            event = await self._queue.get()
+            try:
+                sent = await self.deliver(event)
+                if sent:
+                    print(f"   📬 Ch {event.chapter_num} notification: {sent} row(s) written.")
+            except Exception as e:
+                print(f"   ⚠️ Notification error (Ch {event.chapter_num}): {e}")
+            finally:
+                self._queue.task_done()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def join(self) -> None:
+        """Wait until every queued event has been delivered."""
+        await self._queue.join()
+
+    async def stop(self) -> None:
+        """Deliver what is still queued, then stop the worker."""
+        if self._task is not None:
+            await self.join()
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+chapter_notifier = ChapterNotifier()
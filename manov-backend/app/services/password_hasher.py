@@ -0,0 +1,118 @@
+"""Bounded worker pool for bcrypt, off the event loop.
+
+``bcrypt.hashpw``/``checkpw`` take 100-300 ms of pure CPU at the default
+cost factor. Called straight from an async handler they stall the whole
+uvicorn worker, so one login burst delays every chapter read queued behind
+it. ``PasswordHasher`` runs them in a small thread pool (bcrypt releases
+the GIL while it works) and caps how many calls may wait for a thread:
+past ``max_queue`` new calls fail fast with :class:`HasherBusyError`
+instead of piling up latency for everyone.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from app.config import settings
+from app.utils.security import get_password_hash, verify_password
+
+
+class HasherBusyError(RuntimeError):
+    """Raised when ``max_queue`` hashing calls are already waiting for a worker."""
+
+
+@dataclass
+class HashMetrics:
+    completed: int = 0
+    rejected: int = 0
+    queued: int = 0  # waiting for a worker thread right now
+    running: int = 0
+    peak_queued: int = 0
+    wait_seconds: float = 0.0  # summed over completed calls
+    run_seconds: float = 0.0
+
+    @property
+    def avg_wait_ms(self) -> float:
+        return self.wait_seconds / self.completed * 1000 if self.completed else 0.0
+
+    @property
+    def avg_run_ms(self) -> float:
+        return self.run_seconds / self.completed * 1000 if self.completed else 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "queued": self.queued,
+            "running": self.running,
+            "peakQueued": self.peak_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avgWaitMs": round(self.avg_wait_ms, 2),
+            "avgRunMs": round(self.avg_run_ms, 2),
+        }
+
+    def summary(self) -> str:
+        return (
+            f"{self.completed} hashes ({self.rejected} rejected), queue {self.queued} "
+            f"(peak {self.peak_queued}), avg wait {self.avg_wait_ms:.1f} ms, "
+            f"avg run {self.avg_run_ms:.1f} ms"
+        )
+
+
+class PasswordHasher:
+    def __init__(self, workers: int | None = None, max_queue: int | None = None):
+        self.workers = max(1, workers or settings.PASSWORD_HASH_WORKERS)
+        self.max_queue = max_queue if max_queue is not None else settings.PASSWORD_HASH_MAX_QUEUE
+        self.metrics = HashMetrics()
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password, password, hashed_password)
+
+    async def _submit(self, fn, *args):
+        m = self.metrics
+        if m.queued >= self.max_queue:
+            m.rejected += 1
+            raise HasherBusyError(f"{m.queued} password hashes already queued")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Semaphores bind to the loop they are first used on
+            self._slots, self._loop = asyncio.Semaphore(self.workers), loop
+
+        # Callers wait for a slot on the loop, so the executor never has a
+        # backlog of its own and ``queued`` is exactly the calls waiting
+        enqueued = time.perf_counter()
+        m.queued += 1
+        m.peak_queued = max(m.peak_queued, m.queued)
+        try:
+            await self._slots.acquire()
+        finally:
+            m.queued -= 1
+        started = time.perf_counter()
+        m.running += 1
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            m.running -= 1
+            self._slots.release()
+            m.completed += 1
+            m.wait_seconds += started - enqueued
+            m.run_seconds += time.perf_counter() - started
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._slots = self._loop = None
+
+
+password_hasher = PasswordHasher()
@@ -1,34 +1,47 @@
 # app/services/processor.py
+import contextlib
 import json
 import os
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 
-from fastapi.concurrency import run_in_threadpool
 from sqlmodel import select
 
+from app.crud import (
+    get_crawl_state,
+    record_crawl_error,
+    record_crawl_success,
+    sync_novel_chapter_stats,
+)
 from app.database import AsyncSessionLocal
 from app.models import Chapter, ChapterTranslation, Novel
-from app.services.scraper_crawler import NovelCrawler
+from app.services.notifier import ChapterEvent, chapter_notifier
+from app.services.scraper_crawler import AsyncNovelCrawler
+from app.services.translation_cache import TranslationCache
+from app.services.translation_pool import TranslationJob, TranslationPool
 from app.services.translator import LLMTranslator
 
 
 class NovelProcessorService:
     def __init__(self):
-        self.translator = LLMTranslator()
-        self.crawler = NovelCrawler()
+        self.translator = LLMTranslator(cache=TranslationCache())
+        self.pool = TranslationPool(self.translator)
         self.raw_dir = "raw_data"
 
     async def process_novel(self, slug: str, input_url: str = None, title_override: str = None):
         """
         Logic pintar:
         - Jika input_url ADA -> Pakai itu (Mode Manual/Start Awal).
-        - Jika input_url KOSONG -> Cari last chapter di DB -> Resume dari situ.
+        - Jika input_url KOSONG -> Ambil CrawlState novel -> Resume dari nextUrl.
         """
         async with AsyncSessionLocal() as session:
+            novel_id = None
             try:
                 target_url = input_url
                 novel = await session.scalar(select(Novel).where(Novel.slug == slug))
 
+                state = await get_crawl_state(session, novel.id) if novel else None
+
                 # --- LOGIC AUTO-RESUME ---
                 if not target_url:
                     if not novel:
@@ -36,47 +49,23 @@ class NovelProcessorService:
                             "❌ Error: Novel belum ada, harus input URL awal untuk scraping pertama kali."
                         )
                         return
-
-                    # Cari chapter terakhir
-                    last_chapter = await session.scalar(
-                        select(Chapter)
-                        .where(Chapter.novelId == novel.id)
-                        .order_by(Chapter.chapterNum.desc())
-                        .limit(1)
-                    )
-
-                    if last_chapter and last_chapter.sourceUrl:
-                        print(
-                            f"🔄 Auto-Resume dari Chapter {last_chapter.chapterNum}: {last_chapter.sourceUrl}"
-                        )
-                        target_url = last_chapter.sourceUrl
-                    else:
-                        print("❌ Error: Tidak ada history chapter untuk di-resume.")
+                    if not state or not (state.nextUrl or state.lastUrl):
+                        print("❌ Error: Tidak ada crawl state untuk di-resume.")
                         return
+                    # Lanjut dari link "下一章" terakhir; kalau dulu sudah tamat, cek ulang
+                    # chapter terakhir untuk melihat apakah link next sudah muncul.
+                    target_url = state.nextUrl or state.lastUrl
+                    print(f"🔄 Auto-Resume setelah Chapter {state.lastChapterNum}: {target_url}")
 
                 start_num_hint = 1
-                if novel:
-                    last_ch = await session.scalar(
-                        select(Chapter)
-                        .where(Chapter.novelId == novel.id)
-                        .order_by(Chapter.chapterNum.desc())
-                        .limit(1)
-                    )
-                    if last_ch:
-                        start_num_hint = last_ch.chapterNum
+                if state and state.lastChapterNum is not None:
+                    start_num_hint = state.lastChapterNum + (1 if state.nextUrl else 0)
 
-                print(f"🕷️  Crawler Start: {target_url} (Hint: {start_num_hint})")
-
-                # 2. BUNGKUS DENGAN THREADPOOL (Solusi Error Playwright Sync)
-                await run_in_threadpool(
-                    self.crawler.start_crawling,
-                    target_url,
-                    5,  # max_chapters
-                    start_num_hint,  # start_counter
-                )
-                # --- PROCESS DATA (Simpan ke DB) ---
-                # Create Novel jika belum ada
-                if not novel and title_override:
+                # Create Novel jika belum ada (harus sebelum pipeline, chapter disimpan langsung)
+                if not novel:
+                    if not title_override:
+                        print("❌ Error: Novel belum ada dan title tidak diberikan.")
+                        return
                     novel = Novel(
                         title=title_override,
                         slug=slug,
@@ -87,108 +76,113 @@ class NovelProcessorService:
                     await session.commit()
                     await session.refresh(novel)
 
-                # Loop JSON files
-                files = sorted(os.listdir(self.raw_dir))
-                for filename in files:
-                    if not filename.endswith(".json"):
-                        continue
-
-                    # Parse Chapter Num
-                    try:
-                        chapter_num = int(filename.split("_")[1].split(".")[0])
-                    except Exception:
-                        continue
-
-                    # Load JSON
-                    filepath = os.path.join(self.raw_dir, filename)
-                    with open(filepath, encoding="utf-8") as f:
-                        data = json.load(f)
-
-                    # Cek DB (Skip jika sudah ada)
-                    existing = await session.scalar(
-                        select(Chapter).where(
-                            Chapter.novelId == novel.id,
-                            Chapter.chapterNum == chapter_num,
+                novel_id = novel.id
+                print(f"🕷️  Crawler Start: {target_url} (Hint: {start_num_hint})")
+
+                # 2. Pipeline: crawl -> translate -> DB lewat queue ber-batas.
+                # raw_data/<slug> sekarang hanya spool: file dihapus setelah chapter
+                # ter-commit, jadi resume cuma memproses sisa yang belum masuk DB.
+                novel_dir = os.path.join(self.raw_dir, slug)
+                crawler = AsyncNovelCrawler(output_dir=novel_dir)
+                existing = set(
+                    (
+                        await session.execute(
+                            select(Chapter.chapterNum).where(Chapter.novelId == novel.id)
+                        )
+                    ).scalars()
+                )
+                # aclosing: on error both generators close right away, so the crawler
+                # stops and returns its browser page instead of waiting for GC
+                jobs = self._chapter_jobs(crawler, target_url, start_num_hint, existing)
+                async with (
+                    contextlib.aclosing(jobs),
+                    contextlib.aclosing(self.pool.translate_in_order(jobs)) as results,
+                ):
+                    async for result in results:
+                        chapter_num = result.job.chapter_num
+                        data = result.job.payload
+                        if not result.ok:
+                            # Spool file tetap ada, dicoba lagi di run berikutnya
+                            print(f"   ❌ Ch {chapter_num} translation failed: {result.error}")
+                            await record_crawl_error(
+                                session, novel.id, f"Ch {chapter_num} translation: {result.error}"
+                            )
+                            continue
+
+                        new_ch = await self._save_chapter(session, novel.id, data, result)
+                        existing.add(chapter_num)
+                        # Checkpoint: chapter sudah durable di DB, spool tidak diperlukan lagi
+                        with contextlib.suppress(FileNotFoundError):
+                            os.remove(crawler.chapter_path(chapter_num))
+                        print(f"   ✅ Saved Ch {chapter_num} ({result.elapsed:.1f}s).")
+
+                        # Fan-out ke pembaca (library) jalan di background, tidak menahan loop ini
+                        chapter_notifier.publish(
+                            ChapterEvent(novel.id, novel.title, new_ch.id, chapter_num)
                         )
-                    )
 
-                    if existing:
-                        # UPDATE URL JIKA KOSONG (Self-healing)
-                        if not existing.sourceUrl and "source_url" in data:
-                            existing.sourceUrl = data.get("source_url")
-                            await session.commit()
-                        print(f"⏭️  Skip Ch {chapter_num} (Sudah ada).")
-                        continue
-
-                    # --- PROSES DATA BARU ---
-                    print(f"✨ Processing New Chapter {chapter_num}...")
-
-                    # Translate
-                    tl_content = await self.translator.translate(data["content"])
-                    tl_title = await self.translator.translate(data["title"])
-
-                    # Save Raw Chapter
-                    new_ch = Chapter(
-                        novelId=novel.id,
-                        chapterNum=chapter_num,
-                        rawTitle=data["title"],
-                        rawContent=data["content"],
-                        sourceUrl=data.get("source_url"),
-                    )
-                    session.add(new_ch)
-                    await session.commit()
-                    await session.refresh(new_ch)
-
-                    # Save Translation
-                    translation = ChapterTranslation(
-                        chapterId=new_ch.id,
-                        language="EN",
-                        title=tl_title,
-                        content=tl_content,
-                        publishedAt=datetime.now(UTC),
-                    )
-                    session.add(translation)
-                    await session.commit()
-                    await session.refresh(translation)
-                    print(f"   ✅ Saved Ch {chapter_num}.")
+                if crawler.last_error:
+                    await record_crawl_error(session, novel.id, crawler.last_error)
 
-                    # Create notifications for users who have this novel in library
-                    await self._notify_users_of_new_chapter(
-                        session, novel.id, novel.title, chapter_num, new_ch.id
-                    )
+                if self.pool.metrics.chapters:
+                    print(f"📈 Translation: {self.pool.metrics.summary()}")
+                    print(f"🧠 Translation memory: {self.translator.cache.summary()}")
 
             except Exception as e:
                 print(f"❌ Error Processor: {e}")
-
-    async def _notify_users_of_new_chapter(
-        self, session, novel_id: int, novel_title: str, chapter_num: int, chapter_id: int
-    ):
-        """Create notifications for all users who have this novel in their library."""
-        from app.models import Library, Notification
-
-        try:
-            # Get all users who have this novel in library
-            result = await session.execute(
-                select(Library.userId).where(Library.novelId == novel_id)
+                if novel_id is not None:
+                    await session.rollback()
+                    await record_crawl_error(session, novel_id, str(e) or type(e).__name__)
+
+    async def _chapter_jobs(
+        self, crawler: AsyncNovelCrawler, target_url: str, start_num: int, existing: set[int]
+    ) -> AsyncIterator[TranslationJob]:
+        """Spooled chapters left by an interrupted run first, then the live crawl."""
+        for filename in sorted(os.listdir(crawler.output_dir)):
+            if not filename.endswith(".json"):
+                continue
+            with open(os.path.join(crawler.output_dir, filename), encoding="utf-8") as f:
+                data = json.load(f)
+            if data["chapter_num"] in existing:
+                os.remove(os.path.join(crawler.output_dir, filename))
+                continue
+            print(f"♻️  Resuming spooled Ch {data['chapter_num']}")
+            existing.add(data["chapter_num"])
+            yield TranslationJob(data["chapter_num"], data["title"], data["content"], data)
+
+        chapters = crawler.iter_chapters(target_url, 5, start_num)  # max 5 chapters
+        async with contextlib.aclosing(chapters):
+            async for data in chapters:
+                if data["chapter_num"] in existing:
+                    print(f"⏭️  Skip Ch {data['chapter_num']} (Sudah ada).")
+                    continue
+                existing.add(data["chapter_num"])
+                yield TranslationJob(data["chapter_num"], data["title"], data["content"], data)
+
+    async def _save_chapter(self, session, novel_id: int, data: dict, result) -> Chapter:
+        """Persist the raw chapter and its translation in one transaction."""
+        new_ch = Chapter(
+            novelId=novel_id,
+            chapterNum=data["chapter_num"],
+            rawTitle=data["title"],
+            rawContent=data["content"],
+            sourceUrl=data.get("source_url"),
+        )
+        session.add(new_ch)
+        await session.flush()
+        session.add(
+            ChapterTranslation(
+                chapterId=new_ch.id,
+                language="EN",
+                title=result.title,
+                content=result.content,
+                publishedAt=datetime.now(UTC),
             )
-            user_ids = [row[0] for row in result.all()]
-
-            if not user_ids:
-                return
-
-            # Batch create notifications
-            for user_id in user_ids:
-                notification = Notification(
-                    userId=user_id,
-                    type="NEW_CHAPTER",
-                    message=f"{novel_title} — Chapter {chapter_num} is now available!",
-                    novelId=novel_id,
-                    chapterId=chapter_id,
-                )
-                session.add(notification)
-
-            await session.commit()
-            print(f"   📬 Notifications sent to {len(user_ids)} users.")
-        except Exception as e:
-            print(f"   ⚠️ Notification error: {e}")
-            await session.rollback()
+        )
+        await session.flush()
+        await sync_novel_chapter_stats(session, [novel_id])
+        await record_crawl_success(
+            session, novel_id, new_ch.chapterNum, new_ch.sourceUrl, data.get("next_url")
+        )
+        await session.commit()
+        return new_ch
@@ -0,0 +1,65 @@
+"""Periodic cleanup of expired password-reset tokens.
+
+``POST /auth/reset-password`` already ignores expired tokens in SQL; this
+loop nulls them out in small batches so the partial
+``ix_user_resetTokenHash`` index only ever holds pending resets, and no
+single UPDATE locks a large slice of the user table.
+"""
+
+import asyncio
+import contextlib
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.crud import clear_expired_reset_tokens
+from app.database import AsyncSessionLocal
+
+
+class ResetTokenSweeper:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        interval: float = 600.0,
+        batch_size: int = 500,
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: asyncio.Task | None = None
+
+    async def sweep(self) -> int:
+        """Clear every expired token, one committed batch at a time. Returns the total."""
+        total = 0
+        try:
+            async with self.session_factory() as session:
+                while True:
+                    cleared = await clear_expired_reset_tokens(session, self.batch_size)
+                    total += cleared
+                    if cleared < self.batch_size:
+                        break
+        except Exception as e:
+            print(f"⚠️ Reset token sweep failed, will retry: {e}")
+        return total
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.sweep()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+reset_token_sweeper = ResetTokenSweeper(
+    interval=settings.RESET_TOKEN_SWEEP_SECONDS,
+    batch_size=settings.RESET_TOKEN_SWEEP_BATCH,
+)
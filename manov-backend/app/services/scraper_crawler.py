@@ -1,12 +1,20 @@
+import asyncio
+import contextlib
 import json
 import os
 import random
 import re
 import time
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor, ThreadPoolExecutor
 
-from bs4 import BeautifulSoup
 from playwright.sync_api import sync_playwright
 
+from app.config import settings
+from app.services.browser_pool import BrowserPool, HostScheduler, browser_pool, host_scheduler
+from app.services.chapter_fetcher import HttpChapterFetcher, find_next_url, http_fetcher
+from app.services.chapter_parser import extract_chapter
+
 
 class NovelCrawler:
     def __init__(self, output_dir="raw_data"):
@@ -64,27 +72,13 @@ class NovelCrawler:
                     print("❌ Gagal scrape halaman ini. Berhenti.")
                     break
 
-                # 2. INTELLIGENT NUMBERING
-                # Ekstrak nomor dari judul asli (misal: "第5章")
-                real_chapter_num = self.extract_chapter_number(data["title"], sequential_counter)
+                # 2-3. Numbering + Save to File
+                data["next_url"] = next_url
+                real_chapter_num = self.save_chapter(data, sequential_counter)
 
                 # Update counter manual agar sinkron
                 sequential_counter = real_chapter_num + 1
 
-                print(f"   📍 Detected Chapter: {real_chapter_num} (Title: {data['title']})")
-
-                # 3. Save to File
-                # Nama file menggunakan nomor ASLI dari judul
-                filename = f"{self.output_dir}/chapter_{real_chapter_num:04d}.json"
-
-                # Inject detected number ke dalam data JSON juga biar processor gampang
-                data["chapter_num"] = real_chapter_num
-
-                with open(filename, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=4)
-
-                print(f"   ✅ Tersimpan: {filename}")
-
                 # 4. Limit Check (Optional, hitung berapa file yg sudah didownload sesi ini)
                 if max_chapters > 0:
                     max_chapters -= 1
@@ -105,6 +99,28 @@ class NovelCrawler:
 
             browser.close()
 
+    def chapter_path(self, chapter_num: int) -> str:
+        return f"{self.output_dir}/chapter_{chapter_num:04d}.json"
+
+    def save_chapter(self, data: dict, fallback_num: int) -> int:
+        """Write ``data`` to ``chapter_XXXX.json``; returns the detected chapter number."""
+        # INTELLIGENT NUMBERING
+        # Ekstrak nomor dari judul asli (misal: "第5章")
+        real_chapter_num = self.extract_chapter_number(data["title"], fallback_num)
+        print(f"   📍 Detected Chapter: {real_chapter_num} (Title: {data['title']})")
+
+        # Nama file menggunakan nomor ASLI dari judul
+        filename = self.chapter_path(real_chapter_num)
+
+        # Inject detected number ke dalam data JSON juga biar processor gampang
+        data["chapter_num"] = real_chapter_num
+
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+
+        print(f"   ✅ Tersimpan: {filename}")
+        return real_chapter_num
+
     def scrape_single_page(self, page, url):
         try:
             page.goto(url, timeout=60000)
@@ -121,61 +137,186 @@ class NovelCrawler:
                 except Exception:
                     return None, None
 
-            html_content = page.content()
-            soup = BeautifulSoup(html_content, "html.parser")
-            container = soup.select_one(".txtnav")
-
-            # --- CLEANING ---
-            junk_selectors = [
-                ".txtinfo",
-                "#txtright",
-                ".contentadv",
-                ".bottom-ad",
-                ".bottom-ad2",
-                ".page1",
-                "script",
-                "style",
-                "h1",
-            ]
-            for s in junk_selectors:
-                for tag in container.select(s):
-                    tag.decompose()
-
-            # Ambil Text
-            raw_text = container.get_text(separator="\n")
-            lines = [line.strip() for line in raw_text.split("\n") if line.strip()]
-
-            # Filter baris sampah
-            clean_lines = []
-            for line in lines:
-                if "loadAdv" in line or "69书吧" in line or "(本章完)" in line:
-                    continue
-                clean_lines.append(line)
-
-            content = "\n\n".join(clean_lines)
-
-            # Ambil Judul
-            title = soup.title.string.split("-")[0].strip() if soup.title else "Unknown"
-
-            # --- CARI NEXT URL ---
-            # Cari tombol dengan teks "下一章" (Next Chapter)
-            # Struktur: <div class="page1"> ... <a href="...">下一章</a> ... </div>
-            next_url = None
-            page1_div = soup.select_one(".page1")
-            if page1_div:
-                links = page1_div.find_all("a")
-                for link in links:
-                    if "下一章" in link.get_text():
-                        href = link.get("href")
-                        if href:
-                            # 69shuba kadang kasih link relatif (/txt/...) atau absolute
-                            if href.startswith("http"):
-                                next_url = href
-                            else:
-                                next_url = f"https://www.69shuba.com{href}"
+            parsed = extract_chapter(page.content())
+            if not parsed:
+                return None, None
+            title, content, next_url = parsed
+            return {"source_url": url, "title": title, "content": content}, next_url
+
+        except Exception as e:
+            print(f"Error scraping page: {e}")
+            return None, None
+
+
+# Parsing runs here while the browser is already loading the next chapter
+_parse_executor = ThreadPoolExecutor(
+    max_workers=settings.CRAWL_PARSE_WORKERS, thread_name_prefix="chapter-parse"
+)
+
+# Resolved (absolute) href of the "下一章" link, read straight from the live DOM
+_NEXT_LINK_JS = """els => {
+    const a = els.find(el => el.textContent.includes("下一章"));
+    return a ? a.href : null;
+}"""
+
+
+class AsyncNovelCrawler(NovelCrawler):
+    """Async crawler on the shared :data:`browser_pool`.
+
+    No browser launch per call and no thread sleeps: politeness delays go
+    through :data:`host_scheduler`, so several novels can crawl concurrently.
+
+    Fetching and parsing are pipelined: the next-chapter link is read from
+    the DOM as soon as a page loads, so navigation to chapter N+1 starts
+    while chapter N's HTML is still being cleaned in ``_parse_executor``.
+
+    Pages are first requested over plain HTTP (:data:`http_fetcher`); the
+    browser is only borrowed from the pool when that hits a challenge page,
+    and its cookies are handed back to the HTTP client once solved.
+    """
+
+    # Stop trying the HTTP fast path for this crawl after this many misses in a row
+    MAX_HTTP_MISSES = 3
+
+    def __init__(
+        self,
+        output_dir="raw_data",
+        pool: BrowserPool | None = None,
+        scheduler: HostScheduler | None = None,
+        prefetch: int | None = None,
+        executor: Executor | None = None,
+        http: HttpChapterFetcher | None = None,
+        fast_path: bool | None = None,
+    ):
+        super().__init__(output_dir)
+        self.pool = pool or browser_pool
+        self.scheduler = scheduler or host_scheduler
+        self.prefetch = prefetch or settings.CRAWL_PREFETCH
+        self.executor = executor or _parse_executor
+        use_http = settings.CRAWL_HTTP_FAST_PATH if fast_path is None else fast_path
+        self.http = (http or http_fetcher) if use_http else None
+        self._http_misses = 0
+        # Why the last iter_chapters() run stopped early, if it did
+        self.last_error: str | None = None
+
+    async def crawl(self, start_url: str, max_chapters=10, start_counter=1) -> int:
+        """Crawl from ``start_url``; returns the number of chapters saved."""
+        saved = 0
+        async for _ in self.iter_chapters(start_url, max_chapters, start_counter):
+            saved += 1
+        return saved
+
+    async def iter_chapters(
+        self, start_url: str, max_chapters=10, start_counter=1
+    ) -> AsyncIterator[dict]:
+        """Yield chapters (already saved to ``output_dir``) in reading order.
+
+        Up to ``prefetch`` fetched-but-unconsumed pages are buffered; the
+        browser pauses when the consumer falls that far behind.
+        """
+        print(f"🕷️  Mulai Crawler (async) dari: {start_url}")
+        loop = asyncio.get_running_loop()
+        parsed: asyncio.Queue = asyncio.Queue(maxsize=self.prefetch)
+
+        async def produce(get_page) -> None:
+            url, fetched = start_url, 0
+            cancelled = False
+            try:
+                while url:
+                    await self.scheduler.wait(url)
+                    print(f"\n📖 Visiting URL: {url}")
+                    html, next_url = await self.fetch(url, get_page)
+                    if html is None:
+                        print("❌ Gagal scrape halaman ini. Berhenti.")
+                        self.last_error = f"Failed to fetch {url}"
                         break
+                    future = loop.run_in_executor(self.executor, extract_chapter, html)
+                    await parsed.put((url, next_url, future))
+                    fetched += 1
+                    if max_chapters > 0 and fetched >= max_chapters:
+                        print("🛑 Batas limit download tercapai.")
+                        break
+                    if not next_url:
+                        print("🏁 Tamat / Tidak ada link Next.")
+                    url = next_url
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                # Cancelled = the consumer stopped early; nobody reads the sentinel, and
+                # waiting for room in a full queue would hang the cancellation forever
+                if not cancelled:
+                    await parsed.put(None)
 
-            return {"source_url": url, "title": title, "content": content}, next_url
+        sequential_counter = start_counter
+        async with contextlib.AsyncExitStack() as stack:
+            page = None
+
+            async def get_page():
+                # Only borrow a browser page once the HTTP fast path needs help
+                nonlocal page
+                if page is None:
+                    page = await stack.enter_async_context(self.pool.page())
+                return page
+
+            self._http_misses = 0
+            self.last_error = None
+            producer = asyncio.create_task(produce(get_page))
+            try:
+                while (item := await parsed.get()) is not None:
+                    url, next_url, future = item
+                    result = await future
+                    if not result:
+                        print(f"❌ Gagal parse halaman: {url}. Berhenti.")
+                        self.last_error = f"Failed to parse {url}"
+                        break
+                    title, content, _ = result
+                    data = {
+                        "source_url": url,
+                        "next_url": next_url,
+                        "title": title,
+                        "content": content,
+                    }
+                    real_chapter_num = self.save_chapter(data, sequential_counter)
+                    sequential_counter = real_chapter_num + 1
+                    yield data
+            finally:
+                producer.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await producer
+
+    async def fetch(self, url: str, get_page) -> tuple[str | None, str | None]:
+        """HTTP fast path first; render in the browser only when it is challenged."""
+        if self.http is not None and self._http_misses < self.MAX_HTTP_MISSES:
+            html = await self.http.fetch(url)
+            if html is not None:
+                self._http_misses = 0
+                return html, find_next_url(html, url)
+            self._http_misses += 1
+            print("   🛡️  Challenge page over HTTP, using the browser...")
+
+        page = await get_page()
+        html, next_url = await self.fetch_html(page, url)
+        if html is not None and self.http is not None:
+            # Reuse the solved session (cf_clearance etc.) for the next chapters
+            self.http.load_cookies(await page.context.cookies())
+        return html, next_url
+
+    async def fetch_html(self, page, url: str) -> tuple[str | None, str | None]:
+        """Load ``url``; return ``(html, next_url)`` or ``(None, None)`` on failure."""
+        try:
+            await page.goto(url, timeout=60000)
+            try:
+                await page.wait_for_selector(".txtnav", state="visible", timeout=10000)
+            except Exception:
+                print("⚠️  Terhalang Cloudflare/Loading. Silakan verify manual di browser...")
+                try:
+                    await page.wait_for_selector(".txtnav", state="visible", timeout=60000)
+                except Exception:
+                    return None, None
+
+            next_url = await page.eval_on_selector_all(".page1 a", _NEXT_LINK_JS)
+            return await page.content(), next_url
 
         except Exception as e:
             print(f"Error scraping page: {e}")
@@ -0,0 +1,161 @@
+"""Persistent translation memory in front of ``LLMTranslator``.
+
+Entries are content-addressed: the key is a SHA-256 of the source text plus
+the prompt version and model name, so editing a prompt or switching models
+never serves stale output. The store is a local SQLite file (stdlib
+``sqlite3``) capped at ``max_entries`` with least-recently-used eviction.
+Lookups only read; puts and ``last_used`` bumps are buffered in memory and
+committed together by :meth:`TranslationCache.flush`, so the event loop
+never waits on a commit per paragraph.
+
+The translator stores whole chapters and single paragraphs, so a rerun after
+a crash skips finished chapters entirely and recurring lines (headers,
+author notes, system messages) are only ever translated once.
+"""
+
+import hashlib
+import sqlite3
+import time
+
+from app.config import settings
+
+EVICT_EVERY = 100
+SQL_BATCH = 500  # keys per IN (...) lookup, under SQLite's variable limit
+
+
+def cache_key(text: str, prompt_version: str, model: str) -> str:
+    digest = hashlib.sha256()
+    for part in (prompt_version, model, text):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class TranslationCache:
+    def __init__(self, path: str | None = None, max_entries: int | None = None):
+        self.path = path or settings.TRANSLATION_CACHE_PATH
+        self.max_entries = max_entries or settings.TRANSLATION_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self._puts_since_evict = 0
+        self._puts: dict[str, tuple[str, float]] = {}
+        self._touched: dict[str, float] = {}
+        self._db: sqlite3.Connection | None = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Opened on first use so constructing a translator never touches disk
+        if self._db is None:
+            self._db = sqlite3.connect(self.path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            # WAL stays consistent without an fsync per commit; a crash only
+            # loses the last few entries, which are simply translated again
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                """CREATE TABLE IF NOT EXISTS translation_memory (
+                    key TEXT PRIMARY KEY,
+                    translation TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS ix_translation_memory_last_used "
+                "ON translation_memory (last_used)"
+            )
+            self._db.commit()
+        return self._db
+
+    def get(self, key: str) -> str | None:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Look ``keys`` up in one query per batch; returns only the hits.
+
+        Reads never write: the ``last_used`` bump is queued for :meth:`flush`.
+        """
+        found = {key: self._puts[key][0] for key in keys if key in self._puts}
+        lookup = list({key for key in keys if key not in found})
+        for start in range(0, len(lookup), SQL_BATCH):
+            batch = lookup[start : start + SQL_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            found.update(
+                self._conn.execute(
+                    "SELECT key, translation FROM translation_memory "
+                    f"WHERE key IN ({placeholders})",
+                    batch,
+                )
+            )
+        now = time.time()
+        for key in keys:
+            if key in found:
+                self.hits += 1
+                self._touched[key] = now
+            else:
+                self.misses += 1
+        return found
+
+    def put(self, key: str, translation: str) -> None:
+        """Queue ``translation`` for the next :meth:`flush`."""
+        self._puts[key] = (translation, time.time())
+
+    def flush(self) -> None:
+        """Commit queued puts and ``last_used`` bumps, trimming the store when due.
+
+        The translator calls this once per ``translate``, so a chapter costs
+        one commit however many paragraphs it hits or stores.
+        """
+        self._puts_since_evict += self._write_pending()
+        # count(*) is not free on a big store, so trim in batches
+        if self._puts_since_evict >= EVICT_EVERY:
+            self.evict()
+
+    def _write_pending(self) -> int:
+        if not self._puts and not self._touched:
+            return 0
+        puts, self._puts = self._puts, {}
+        touched, self._touched = self._touched, {}
+        with self._conn:  # one transaction: commits, or rolls back on error
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translation_memory (key, translation, last_used) "
+                "VALUES (?, ?, ?)",
+                [
+                    (key, translation, max(put_at, touched.get(key, put_at)))
+                    for key, (translation, put_at) in puts.items()
+                ],
+            )
+            self._conn.executemany(
+                "UPDATE translation_memory SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in touched.items() if key not in puts],
+            )
+        return len(puts)
+
+    def evict(self) -> None:
+        """Drop least recently used entries beyond ``max_entries``."""
+        self._write_pending()
+        self._puts_since_evict = 0
+        self._conn.execute(
+            """DELETE FROM translation_memory WHERE key IN (
+                SELECT key FROM translation_memory ORDER BY last_used ASC
+                LIMIT max(0, (SELECT count(*) FROM translation_memory) - ?)
+            )""",
+            (self.max_entries,),
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        self._write_pending()
+        return self._conn.execute("SELECT count(*) FROM translation_memory").fetchone()[0]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return f"{self.hits} hits / {self.misses} misses ({self.hit_rate:.0%} hit rate)"
+
+    def close(self) -> None:
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
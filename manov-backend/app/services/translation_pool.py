@@ -0,0 +1,181 @@
+"""Bounded worker pool that translates several chapters at once.
+
+The local LLM server can serve multiple requests in parallel, but the
+crawl pipelines used to translate one chapter at a time. ``TranslationPool``
+keeps up to ``concurrency`` chapters in flight and hands results back in
+chapter order, so callers can keep committing chapters sequentially.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.config import settings
+from app.services.translator import LLMTranslator
+
+
+@dataclass
+class TranslationJob:
+    chapter_num: int
+    title: str
+    content: str
+    # Caller data carried through to the result (raw JSON, source URL, ...)
+    payload: Any = None
+
+
+@dataclass
+class TranslationResult:
+    job: TranslationJob
+    title: str | None = None
+    content: str | None = None
+    error: str | None = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class TranslationMetrics:
+    chapters: int = 0
+    failed: int = 0
+    tokens: int = 0
+    elapsed: float = 0.0
+    chapter_seconds: list[float] = field(default_factory=list)
+
+    @property
+    def chapters_per_min(self) -> float:
+        return self.chapters / self.elapsed * 60 if self.elapsed else 0.0
+
+    @property
+    def tokens_per_s(self) -> float:
+        return self.tokens / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.chapters} chapters ({self.failed} failed) in {self.elapsed:.1f}s — "
+            f"{self.chapters_per_min:.2f} chapters/min, {self.tokens_per_s:.1f} tokens/s"
+        )
+
+
+class TranslationPool:
+    def __init__(
+        self,
+        translator: LLMTranslator,
+        concurrency: int | None = None,
+        timeout: float | None = None,
+    ):
+        self.translator = translator
+        self.concurrency = max(1, concurrency or settings.TRANSLATION_CONCURRENCY)
+        self.timeout = timeout or settings.TRANSLATION_CHAPTER_TIMEOUT
+        self.metrics = TranslationMetrics()
+
+    async def _translate_one(self, job: TranslationJob) -> TranslationResult:
+        start = time.perf_counter()
+        result = TranslationResult(job=job)
+        try:
+            async with asyncio.timeout(self.timeout):
+                result.content = await self.translator.translate(job.content)
+                result.title = await self.translator.translate(job.title)
+        except TimeoutError:
+            result.error = f"timed out after {self.timeout:.0f}s"
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    async def translate_in_order(
+        self, jobs: Iterable[TranslationJob] | AsyncIterable[TranslationJob]
+    ) -> AsyncIterator[TranslationResult]:
+        """Translate ``jobs`` concurrently, yielding results in the order given.
+
+        ``jobs`` may be an async stream (e.g. chapters as the crawler emits
+        them); it is consumed through a queue of ``concurrency`` slots, so a
+        slow translator applies backpressure to the producer. A result is
+        yielded as soon as it and every job before it are done; failed jobs
+        are yielded too (``result.ok`` is False) so the caller decides whether
+        to skip or stop. An exception raised by the job stream is re-raised
+        after the results produced before it.
+        """
+        queue: asyncio.Queue[tuple[int, TranslationJob] | None] = asyncio.Queue(
+            maxsize=self.concurrency
+        )
+        done: dict[int, TranslationResult] = {}
+        ready = asyncio.Condition()
+        total: int | None = None  # known once the job stream is exhausted
+        feed_error: BaseException | None = None
+        index = 0
+
+        async def feed() -> None:
+            nonlocal total, feed_error
+            count = 0
+            try:
+                async for job in _as_async_iter(jobs):
+                    await queue.put((count, job))
+                    count += 1
+            except Exception as e:
+                feed_error = e
+            total = count
+            async with ready:
+                ready.notify_all()
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def worker() -> None:
+            while (item := await queue.get()) is not None:
+                job_index, job = item
+                # Bound the reorder buffer: don't run ahead of a slow consumer
+                async with ready:
+                    await ready.wait_for(lambda i=job_index: i < index + 2 * self.concurrency)
+                result = await self._translate_one(job)
+                async with ready:
+                    done[job_index] = result
+                    ready.notify_all()
+
+        def next_ready() -> bool:
+            return index in done or (total is not None and index >= total)
+
+        start = time.perf_counter()
+        tokens_before = self.translator.completion_tokens
+        feeder = asyncio.create_task(feed())
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            while True:
+                async with ready:
+                    await ready.wait_for(next_ready)
+                    if index not in done:
+                        break
+                    result = done.pop(index)
+
+                self.metrics.chapters += 1
+                self.metrics.failed += 0 if result.ok else 1
+                self.metrics.chapter_seconds.append(result.elapsed)
+                self.metrics.tokens += self.translator.completion_tokens - tokens_before
+                tokens_before = self.translator.completion_tokens
+                self.metrics.elapsed += time.perf_counter() - start
+                start = time.perf_counter()
+                async with ready:
+                    index += 1
+                    ready.notify_all()
+                yield result
+        finally:
+            for task in (feeder, *workers):
+                task.cancel()
+            for task in (feeder, *workers):
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        if feed_error is not None:
+            raise feed_error
+
+
+async def _as_async_iter(items: Iterable | AsyncIterable) -> AsyncIterator:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
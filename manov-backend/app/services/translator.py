@@ -1,13 +1,68 @@
 # app/services/translator.py
+import asyncio
+import hashlib
 import re
 
 from openai import AsyncOpenAI
 
+from app.config import settings
+from app.services.translation_cache import TranslationCache, cache_key
+
+_CJK_RE = re.compile(r"[\u3000-\u303f\u3400-\u9fff\uf900-\ufaff\uff00-\uffef]")
+
+
+def split_paragraphs(text: str) -> list[str]:
+    """Paragraphs as emitted by the crawlers (``"\\n\\n".join(clean_lines)``)."""
+    return [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: ~1 per CJK character, ~4 characters per token otherwise."""
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def chunk_paragraphs(paragraphs: list[str], max_tokens: int) -> list[list[str]]:
+    """Greedily pack whole paragraphs into chunks of at most ``max_tokens``.
+
+    A single paragraph larger than the budget becomes its own chunk; it is
+    never split mid-paragraph.
+    """
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    current_tokens = 0
+    for paragraph in paragraphs:
+        tokens = estimate_tokens(paragraph)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(paragraph)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
 
 class LLMTranslator:
-    def __init__(self):
+    def __init__(
+        self,
+        timeout: float | None = None,
+        chunk_tokens: int | None = None,
+        cache: TranslationCache | None = None,
+    ):
         # Pastikan LM Studio berjalan di port 1234
-        self.client = AsyncOpenAI(base_url="http://localhost:1234/v1", api_key="lm-studio")
+        self.client = AsyncOpenAI(
+            base_url="http://localhost:1234/v1",
+            api_key="lm-studio",
+            timeout=timeout or settings.TRANSLATION_REQUEST_TIMEOUT,
+        )
+        # Running total of generated tokens, read by TranslationPool for tokens/s
+        self.completion_tokens = 0
+        self.chunk_tokens = chunk_tokens or settings.TRANSLATION_CHUNK_TOKENS
+        # Caps in-flight LLM requests across all chunks/chapters using this translator
+        self._llm_slots = asyncio.Semaphore(settings.TRANSLATION_MAX_PARALLEL_REQUESTS)
+        self.model = "model-identifier"
+        self.cache = cache
 
         self.prompt_translate = """
         You are an expert translator of Chinese Web Novels into English.
@@ -45,6 +100,15 @@ class LLMTranslator:
         /no_think
         """
 
+    @property
+    def prompt_version(self) -> str:
+        """Fingerprint of both prompts; part of every translation cache key."""
+        prompts = f"{self.prompt_translate}\0{self.prompt_polish}"
+        return hashlib.sha256(prompts.encode()).hexdigest()[:16]
+
+    def _cache_key(self, text: str) -> str:
+        return cache_key(text, self.prompt_version, self.model)
+
     def clean_text(self, text: str) -> str:
         """Membersihkan tag <think>...</think> jika model bandel"""
         # Hapus konten di dalam <think>...</think> (multiline)
@@ -54,14 +118,17 @@ class LLMTranslator:
 
     async def _request_llm(self, text: str, system_prompt: str, user_prefix: str) -> str:
         try:
-            response = await self.client.chat.completions.create(
-                model="model-identifier",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"{user_prefix}\n\n{text}"},
-                ],
-                temperature=0.3,
-            )
+            async with self._llm_slots:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": f"{user_prefix}\n\n{text}"},
+                    ],
+                    temperature=0.3,
+                )
+            if response.usage:
+                self.completion_tokens += response.usage.completion_tokens or 0
             raw_result = response.choices[0].message.content
             return self.clean_text(raw_result)
         except Exception as e:
@@ -69,8 +136,84 @@ class LLMTranslator:
             return None
 
     async def translate(self, text: str) -> str:
+        """Translate ``text`` paragraph-chunk by paragraph-chunk.
+
+        Content is split on blank lines and packed into chunks of at most
+        ``chunk_tokens``; chunks are translated concurrently and reassembled
+        in order, so long chapters never overflow the model's context and a
+        failed chunk only costs that chunk.
+        """
+        try:
+            return await self._translate(text)
+        finally:
+            if self.cache is not None:
+                # One commit per call for every lookup and store it queued
+                self.cache.flush()
+
+    async def _translate(self, text: str) -> str:
+        paragraphs = split_paragraphs(text)
+        if not paragraphs:
+            return text
+
+        if self.cache is not None:
+            chapter_key = self._cache_key(text)
+            cached = self.cache.get(chapter_key)
+            if cached is not None:
+                return cached
+            keys = [self._cache_key(p) for p in paragraphs]
+            found = self.cache.get_many(keys)
+            translated = [found.get(key) for key in keys]
+        else:
+            translated = [None] * len(paragraphs)
+
+        # Only paragraphs missing from the translation memory go to the LLM
+        missing = [i for i, t in enumerate(translated) if t is None]
+        chunks = chunk_paragraphs([paragraphs[i] for i in missing], self.chunk_tokens)
+        if len(chunks) > 1:
+            print(f"      🔹 Translating {len(missing)} paragraphs in {len(chunks)} chunks...")
+        parts = await asyncio.gather(*(self._translate_chunk(chunk) for chunk in chunks))
+        fresh = [p for part in parts for p in part]
+
+        if len(fresh) != len(missing):
+            # _translate_chunk keeps counts aligned, so this only guards regressions.
+            # Without alignment the fresh paragraphs can't be slotted between the
+            # cached ones, so fail the chapter (it is retried) instead of saving
+            # a partial one.
+            raise RuntimeError(
+                f"paragraph count mismatch: {len(missing)} sent, {len(fresh)} returned"
+            )
+
+        for i, result in zip(missing, fresh, strict=True):
+            translated[i] = result
+            # An unchanged paragraph means the LLM call failed; don't remember it
+            if self.cache is not None and result != paragraphs[i]:
+                self.cache.put(self._cache_key(paragraphs[i]), result)
+
+        result = "\n\n".join(translated)
+        complete = all(t != p for t, p in zip(translated, paragraphs, strict=True))
+        if self.cache is not None and complete:
+            self.cache.put(chapter_key, result)
+        return result
+
+    async def _translate_chunk(self, paragraphs: list[str]) -> list[str]:
+        result = await self._translate_passes("\n\n".join(paragraphs))
+        if len(paragraphs) == 1:
+            return ["\n".join(split_paragraphs(result)) or result]
+
+        translated = split_paragraphs(result)
+        if len(translated) == len(paragraphs):
+            return translated
+
+        # Model merged or split paragraphs: redo this chunk one paragraph at a time
+        print(
+            f"      ⚠️ Chunk came back with {len(translated)}/{len(paragraphs)} paragraphs, "
+            "retrying per paragraph..."
+        )
+        parts = await asyncio.gather(*(self._translate_chunk([p]) for p in paragraphs))
+        return [p for part in parts for p in part]
+
+    async def _translate_passes(self, text: str) -> str:
         # PASS 1: Raw Translation
-        print("      🔹 Pass 1: Literal Translation...")
         raw_en = await self._request_llm(
             text, self.prompt_translate, "Translate the following text line-by-line:"
         )
@@ -78,7 +221,6 @@ class LLMTranslator:
             return text
 
         # PASS 2: Grammar & Flow Polish
-        print("      🔹 Pass 2: Polishing & Grammar...")
         polished_en = await self._request_llm(
             raw_en,
             self.prompt_polish,
@@ -87,4 +229,7 @@ class LLMTranslator:
         if not polished_en:
             return raw_en
 
+        # Polish must not merge/split paragraphs; fall back to the literal pass if it did
+        if len(split_paragraphs(polished_en)) != len(split_paragraphs(raw_en)):
+            return raw_en
         return polished_en
@@ -0,0 +1,154 @@
+"""Write-behind buffer for novel view counts.
+
+``POST /novels/{slug}/track-view`` only bumps an in-process (or Redis)
+counter. A background loop periodically drains the counters and applies
+them with one ``UPDATE novel SET viewCount = viewCount + n`` per novel, so
+page views no longer cost a transaction each and cannot lose increments to
+read-modify-write races.
+"""
+
+import asyncio
+import contextlib
+from collections import defaultdict
+from typing import Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.crud import increment_view_count
+from app.database import AsyncSessionLocal
+
+
+class ViewCounterBackend(Protocol):
+    async def incr(self, novel_id: int, amount: int = 1) -> None: ...
+
+    async def drain(self) -> dict[int, int]:
+        """Atomically return and reset all pending counts."""
+        ...
+
+
+class InMemoryViewCounterBackend:
+    """Per-process counters. Each uvicorn worker flushes its own share."""
+
+    def __init__(self):
+        self._counts: defaultdict[int, int] = defaultdict(int)
+
+    async def incr(self, novel_id: int, amount: int = 1) -> None:
+        self._counts[novel_id] += amount
+
+    async def drain(self) -> dict[int, int]:
+        counts, self._counts = self._counts, defaultdict(int)
+        return dict(counts)
+
+
+# HGETALL + DEL as one atomic step; returns a flat [field, value, ...] list
+_DRAIN_LUA = """
+local counts = redis.call('HGETALL', KEYS[1])
+redis.call('DEL', KEYS[1])
+return counts
+"""
+
+
+class RedisViewCounterBackend:
+    """Counters in a Redis hash, shared by every worker pointing at the same server.
+
+    Requires the ``redis`` extra.
+    """
+
+    def __init__(self, url: str, key: str = "manov:views"):
+        try:
+            from redis.asyncio import Redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "VIEW_COUNTER_BACKEND=redis requires the 'redis' extra (uv sync --extra redis)"
+            ) from exc
+
+        self.client = Redis.from_url(url, decode_responses=True)
+        self.key = key
+        self._drain_script = self.client.register_script(_DRAIN_LUA)
+
+    async def incr(self, novel_id: int, amount: int = 1) -> None:
+        await self.client.hincrby(self.key, str(novel_id), amount)
+
+    async def drain(self) -> dict[int, int]:
+        # One server-side script, so concurrent drains from several workers can't
+        # interleave: each increment is returned by exactly one of them
+        raw = await self._drain_script(keys=[self.key])
+        return {int(k): int(v) for k, v in zip(raw[::2], raw[1::2], strict=True)}
+
+
+def build_view_counter_backend() -> ViewCounterBackend:
+    if settings.VIEW_COUNTER_BACKEND == "redis":
+        return RedisViewCounterBackend(settings.REDIS_URL)
+    return InMemoryViewCounterBackend()
+
+
+class ViewCountBuffer:
+    def __init__(
+        self,
+        backend: ViewCounterBackend,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        flush_interval: float = 10.0,
+    ):
+        self.backend = backend
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self._task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+    async def record(self, novel_id: int, amount: int = 1) -> None:
+        await self.backend.incr(novel_id, amount)
+
+    async def flush(self) -> int:
+        """Apply pending counts to the DB. Returns the number of views written."""
+        async with self._flush_lock:
+            counts: dict[int, int] = {}
+            try:
+                counts = await self.backend.drain()
+                if not counts:
+                    return 0
+                async with self.session_factory() as session:
+                    for novel_id, amount in sorted(counts.items()):
+                        await increment_view_count(session, novel_id, amount, commit=False)
+                    await session.commit()
+            except Exception as e:
+                print(f"⚠️ View count flush failed, will retry: {e}")
+                await self._requeue(counts)
+                return 0
+            return sum(counts.values())
+
+    async def _requeue(self, counts: dict[int, int]) -> None:
+        """Put drained counts back so the next flush retries them."""
+        try:
+            for novel_id, amount in counts.items():
+                await self.backend.incr(novel_id, amount)
+        except Exception as e:
+            print(f"⚠️ Could not re-queue {sum(counts.values())} views, dropping them: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # One bad flush must not end the loop for the rest of the process
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"⚠️ View count flush loop error: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic loop and flush whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+
+view_counter = ViewCountBuffer(
+    build_view_counter_backend(),
+    flush_interval=settings.VIEW_COUNT_FLUSH_SECONDS,
+)
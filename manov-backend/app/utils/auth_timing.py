@@ -0,0 +1,57 @@
+"""Per-request authentication overhead, by credential path.
+
+``get_current_admin`` reports how long it took to resolve the caller and
+which path won (``jwt``, ``api_key_cached``, ``api_key_db`` or ``denied``).
+The aggregate is served by ``GET /api/admin/auth-metrics``; extra observers
+(a Prometheus histogram, a log line, a benchmark) can subscribe with
+:meth:`AuthTimings.add_hook`.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+AuthTimingHook = Callable[[str, float], None]
+
+
+@dataclass
+class _PathStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+class AuthTimings:
+    def __init__(self):
+        self._paths: dict[str, _PathStats] = {}
+        self._hooks: list[AuthTimingHook] = []
+
+    def add_hook(self, hook: AuthTimingHook) -> None:
+        """Call ``hook(path, seconds)`` after every resolved (or denied) request."""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: AuthTimingHook) -> None:
+        self._hooks.remove(hook)
+
+    def record(self, path: str, seconds: float) -> None:
+        stats = self._paths.setdefault(path, _PathStats())
+        stats.count += 1
+        stats.total_seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        for hook in self._hooks:
+            hook(path, seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            path: {
+                "count": s.count,
+                "avgMs": round(s.total_seconds / s.count * 1000, 3),
+                "maxMs": round(s.max_seconds * 1000, 3),
+            }
+            for path, s in sorted(self._paths.items())
+        }
+
+    def reset(self) -> None:
+        self._paths.clear()
+
+
+auth_timings = AuthTimings()
@@ -0,0 +1,91 @@
+"""Opaque keyset-pagination cursors.
+
+A cursor encodes the ``(sort value, id)`` of the last row on a page. The next
+page is everything strictly after that pair in the listing's order, so deep
+pages cost an index seek instead of scanning and discarding ``OFFSET`` rows.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import Response
+from sqlalchemy import tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+# Listings keep returning plain JSON arrays; the next-page cursor rides in a header
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(value: Any, row_id: int, source: str | None = None) -> str:
+    if isinstance(value, datetime):
+        payload = {"t": "dt", "v": value.isoformat(), "id": row_id}
+    else:
+        payload = {"v": value, "id": row_id}
+    if source is not None:
+        payload["s"] = source
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, int]:
+    """Return ``(value, id)``. Raises ``ValueError`` for malformed cursors."""
+    value, _, row_id = decode_source_cursor(cursor)
+    return value, row_id
+
+
+def decode_source_cursor(cursor: str) -> tuple[Any, str | None, int]:
+    """Return ``(value, source, id)``; ``source`` is ``None`` for single-table cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        value = payload["v"]
+        if payload.get("t") == "dt":
+            value = datetime.fromisoformat(value)
+        source = payload.get("s")
+        if source is not None and not isinstance(source, str):
+            raise TypeError("source must be a string")
+        return value, source, int(payload["id"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def keyset_after(
+    sort_column, id_column, cursor: str, descending: bool = True
+) -> ColumnElement[bool]:
+    """WHERE clause selecting rows after ``cursor`` in ``(sort_column, id_column)`` order."""
+    value, row_id = decode_cursor(cursor)
+    # Row-value comparison lets PostgreSQL/SQLite seek the composite index directly
+    key = tuple_(sort_column, id_column)
+    if descending:
+        return key < tuple_(value, row_id)
+    return key > tuple_(value, row_id)
+
+
+def source_keyset_after(sort_column, id_column, source: str, cursor: str) -> ColumnElement[bool]:
+    """WHERE clause for one table of a feed merged newest-first on ``(sort, source, id)``.
+
+    Ids from different tables aren't comparable, so on a ``sort`` tie the
+    cursor's source decides which table's rows are already behind it.
+    """
+    value, cursor_source, row_id = decode_source_cursor(cursor)
+    if cursor_source is None or cursor_source == source:
+        return tuple_(sort_column, id_column) < tuple_(value, row_id)
+    if source < cursor_source:
+        # Ties with the cursor sort after it, so none of them were served yet
+        return sort_column <= value
+    return sort_column < value
+
+
+def next_cursor(rows: list, limit: int, sort_attr: str) -> str | None:
+    """Cursor for the page after ``rows``, or ``None`` if this page was the last."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(getattr(last, sort_attr), last.id)
+
+
+def set_next_cursor(response: Response, cursor: str | None) -> None:
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -1,20 +1,34 @@
-from datetime import UTC, datetime
+import time
 
-from fastapi import Depends, Header, HTTPException, Query, Request, status
+from fastapi import Depends, Header, HTTPException, Query, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import AsyncSessionLocal, get_session
-from app.models import ApiKey, User
-from app.utils.security import ALGORITHM, SECRET_KEY, verify_api_key
+from app.crud import get_api_key_principal
+from app.database import get_session_factory
+from app.services.api_key_auth import api_key_cache, api_key_usage
+from app.utils.auth_timing import auth_timings
+from app.utils.security import ALGORITHM, SECRET_KEY, hash_api_key
+from app.utils.tokens import TokenError, decode_token
 
 # Ini memberitahu FastAPI: "Kalau butuh token, ambil dari Header Authorization: Bearer ..."
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
+def decode_access_token(token: str) -> dict | None:
+    """``{"id", "role"}`` from a valid access token, else None. No DB access."""
+    try:
+        # Cached per token until its exp, see app.utils.tokens
+        payload = decode_token(token, SECRET_KEY, ALGORITHM)
+    except TokenError:
+        return None
+    user_id = payload.get("sub")
+    if user_id is None:
+        return None
+    return {"id": int(user_id), "role": payload.get("role")}
+
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     """
     Tugas: Memastikan user mengirim token yang valid.
@@ -26,19 +40,10 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        # 1. Decode Token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        role: str = payload.get("role")
-
-        if user_id is None:
-            raise credentials_exception
-
-        return {"id": int(user_id), "role": role}
-
-    except JWTError:
-        raise credentials_exception from None
+    user = decode_access_token(token)
+    if user is None:
+        raise credentials_exception
+    return user
 
 
 async def get_current_user_optional(
@@ -47,60 +52,82 @@ async def get_current_user_optional(
     """Return user dict if a valid token is present, otherwise None."""
     if not credentials:
         return None
-    try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        role = payload.get("role")
-        if user_id is None:
-            return None
-        return {"id": int(user_id), "role": role}
-    except JWTError:
-        return None
+    return decode_access_token(credentials.credentials)
+
+
+async def resolve_api_key(
+    key: str, session_factory: async_sessionmaker[AsyncSession]
+) -> tuple[dict | None, bool]:
+    """``(user dict or None, from_cache)``. A DB session is only opened on a cache miss."""
+    # Lookup langsung lewat index keyHash; key yang baru diverifikasi di-cache sebentar
+    key_hash = hash_api_key(key)
+    found = api_key_cache.get(key_hash)
+    from_cache = found is not None
+    if found is None:
+        async with session_factory() as session:
+            found = await get_api_key_principal(session, key_hash)
+        if found is None:
+            return None, False
+        api_key_cache.put(key_hash, *found)
+
+    key_id, principal = found
+    # lastUsedAt ditulis batch oleh api_key_usage, bukan per request
+    api_key_usage.touch(key_id)
+    return dict(principal), from_cache
 
 
 async def get_current_user_from_api_key(
-    request: Request,
     x_api_key: str | None = Header(None, alias="X-API-Key"),
     api_key: str | None = Query(None),
-    session: AsyncSession = Depends(get_session),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ) -> dict | None:
-    key = x_api_key or api_key or request.query_params.get("api_key")
+    key = x_api_key or api_key
     if not key:
         return None
-
-    prefix = key[:8]
-    result = await session.execute(
-        select(ApiKey, User)
-        .join(User, ApiKey.userId == User.id)
-        .where(ApiKey.isActive, ApiKey.keyPrefix == prefix)
-    )
-    rows = result.all()
-
-    for api_key_row, user in rows:
-        if verify_api_key(key, api_key_row.keyHash):
-            async with AsyncSessionLocal() as side_session:
-                api_key_row.lastUsedAt = datetime.now(UTC).replace(tzinfo=None)
-                await side_session.merge(api_key_row)
-                await side_session.commit()
-            return {
-                "id": user.id,
-                "email": user.email,
-                "role": user.role,
-                "username": user.username,
-            }
-    return None
+    user, _ = await resolve_api_key(key, session_factory)
+    return user
 
 
 async def get_current_admin(
-    user: dict = Depends(get_current_user),
-    api_user: dict | None = Depends(get_current_user_from_api_key),
+    response: Response,
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    x_api_key: str | None = Header(None, alias="X-API-Key"),
+    api_key: str | None = Query(None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ):
     """
     Tugas: Memastikan user yang login adalah ADMIN.
     Supports both JWT (Bearer token) and API key (header or query param).
+
+    Credentials are tried cheapest first and the first valid one wins: the
+    Bearer token (pure CPU), then an API key already in the cache, and only
+    then the DB. Nothing here opens a session unless it is needed. The
+    time spent is reported to :data:`auth_timings` and as a
+    ``Server-Timing`` header.
     """
-    resolved = user if user else api_user
+    start = time.perf_counter()
+    resolved, path = None, "denied"
+    try:
+        if credentials:
+            resolved = decode_access_token(credentials.credentials)
+            path = "jwt" if resolved else path
+        key = x_api_key or api_key
+        if resolved is None and key:
+            resolved, from_cache = await resolve_api_key(key, session_factory)
+            if resolved:
+                path = "api_key_cached" if from_cache else "api_key_db"
+    finally:
+        elapsed = time.perf_counter() - start
+        auth_timings.record(path, elapsed)
+        response.headers["Server-Timing"] = f'auth;dur={elapsed * 1000:.3f};desc="{path}"'
+
     if not resolved:
+        if credentials and not key:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication required",
@@ -0,0 +1,77 @@
+"""Incremental newline-delimited JSON reading for streamed request bodies.
+
+Lines are cut from the byte stream as chunks arrive, so at most one line
+(capped at ``max_line_bytes``) plus one network chunk is held in memory no
+matter how large the upload is.
+"""
+
+from collections.abc import AsyncIterable, AsyncIterator
+
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """Streams results while the request body is still being read.
+
+    On ASGI servers older than spec 2.4 Starlette's ``StreamingResponse``
+    runs a task that ``receive()``s until disconnect, which would swallow the
+    body chunks the endpoint is reading through ``request.stream()``. Here a
+    disconnect surfaces from the body read (``ClientDisconnect``) or from the
+    failed send instead. Either way the body generator is closed before
+    returning, so its cleanup runs now rather than whenever it is collected.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect() from None
+        finally:
+            # A failed send leaves the generator suspended at its last yield
+            if hasattr(self.body_iterator, "aclose"):
+                await self.body_iterator.aclose()
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int
+) -> AsyncIterator[tuple[int, bytes | None]]:
+    """Yield ``(line_number, line)`` for every non-blank line (1-based numbers).
+
+    ``line`` is ``None`` when it exceeded ``max_line_bytes``; the rest of it
+    is skipped without being buffered.
+    """
+    buffer = bytearray()
+    line_no = 0
+    oversized = False
+
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            line_no += 1
+            if not oversized:
+                buffer += chunk[start:end]
+                oversized = len(buffer) > max_line_bytes
+            if oversized:
+                yield line_no, None
+            elif buffer.strip():
+                yield line_no, bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+        if not oversized:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                oversized = True
+                buffer.clear()
+
+    # Last line without a trailing newline
+    if oversized:
+        yield line_no + 1, None
+    elif buffer.strip():
+        yield line_no + 1, bytes(buffer)
@@ -0,0 +1,66 @@
+"""Novel search clauses: PostgreSQL full-text + trigram, ILIKE elsewhere.
+
+On PostgreSQL the ``novel`` table carries a generated ``searchVector``
+tsvector column (title > author > synopsis weights) with a GIN index, plus a
+``pg_trgm`` GIN index on ``title`` for fuzzy and substring title matches.
+Both are created by migration ``a4d9c2e7f1b3``; the column is not part of the
+SQLModel definition so SQLite (tests) never sees it and falls back to ILIKE.
+"""
+
+from sqlalchemy import Float, cast, func, literal_column, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models import Novel
+
+SEARCH_TS_CONFIG = "english"
+
+# Kept in sync with migration a4d9c2e7f1b3 (used by benchmarks on scratch DBs)
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""ALTER TABLE novel ADD COLUMN IF NOT EXISTS "searchVector" tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(author, '')), 'B') ||
+            setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(synopsis, '')), 'C')
+        ) STORED""",
+    'CREATE INDEX IF NOT EXISTS ix_novel_search_vector ON novel USING gin ("searchVector")',
+    "CREATE INDEX IF NOT EXISTS ix_novel_title_trgm ON novel USING gin (title gin_trgm_ops)",
+]
+
+_search_vector = literal_column('novel."searchVector"')
+_ts_config = literal_column(f"'{SEARCH_TS_CONFIG}'::regconfig")
+
+
+def uses_full_text(session: AsyncSession) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+
+def novel_search_filter(session: AsyncSession, query: str) -> ColumnElement[bool]:
+    """WHERE clause matching ``query`` against title, author and synopsis."""
+    if uses_full_text(session):
+        ts_query = func.websearch_to_tsquery(_ts_config, query)
+        return or_(
+            _search_vector.op("@@")(ts_query),
+            # Trigram index serves both the fuzzy `%` match and substring ILIKE
+            Novel.title.op("%")(query),
+            Novel.title.ilike(f"%{query}%"),
+        )
+
+    search_pattern = f"%{query}%"
+    return or_(
+        Novel.title.ilike(search_pattern),
+        Novel.author.ilike(search_pattern),
+        Novel.synopsis.ilike(search_pattern),
+    )
+
+
+def novel_search_order(session: AsyncSession, query: str) -> list:
+    """ORDER BY for search results: relevance first on PostgreSQL, else recency."""
+    if uses_full_text(session):
+        ts_query = func.websearch_to_tsquery(_ts_config, query)
+        relevance = cast(func.ts_rank(_search_vector, ts_query), Float) + func.similarity(
+            Novel.title, query
+        )
+        return [relevance.desc(), Novel.updatedAt.desc()]
+    return [Novel.updatedAt.desc()]
@@ -1,20 +1,20 @@
 import hashlib
-import hmac
 import secrets
 from datetime import UTC, datetime, timedelta
 
 import bcrypt
-from jose import jwt
 
 from app.config import settings
+from app.utils.tokens import encode_token
 
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 RESET_TOKEN_EXPIRE_MINUTES = settings.RESET_TOKEN_EXPIRE_MINUTES
+BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
 
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, rounds: int | None = None) -> str:
     """
     Mengubah password jadi hash.
     Flow: Input -> SHA256 (64 chars) -> Bcrypt -> Hash String
@@ -24,7 +24,7 @@ def get_password_hash(password: str) -> str:
 
     # 2. Bcrypt Hashing
     # bcrypt butuh input dalam bentuk BYTES, bukan string
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds or BCRYPT_ROUNDS)
     hashed_bytes = bcrypt.hashpw(sha_password.encode("utf-8"), salt)
 
     # Kembalikan sebagai string agar bisa disimpan di Postgres
@@ -46,11 +46,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a different bcrypt cost than ``BCRYPT_ROUNDS``."""
+    # Format: $2b$<cost>$<salt+hash>
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(UTC) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = encode_token(to_encode, SECRET_KEY, ALGORITHM)
     return encoded_jwt
 
 
@@ -69,13 +78,6 @@ def hash_reset_token(token: str) -> str:
     return hashlib.sha256(token.encode()).hexdigest()
 
 
-def verify_reset_token(token: str, stored_hash: str) -> bool:
-    """Timing-safe verification of reset token against stored hash."""
-    if not token or not stored_hash:
-        return False
-    return hmac.compare_digest(hash_reset_token(token), stored_hash)
-
-
 def get_reset_token_expiry() -> datetime:
     """Return the expiry datetime for a reset token."""
     return datetime.now(UTC) + timedelta(minutes=RESET_TOKEN_EXPIRE_MINUTES)
@@ -93,10 +95,3 @@ def generate_api_key() -> tuple[str, str]:
 def hash_api_key(key: str) -> str:
     """Hash an API key with SHA-256."""
     return hashlib.sha256(key.encode()).hexdigest()
-
-
-def verify_api_key(key: str, stored_hash: str) -> bool:
-    """Timing-safe verification of an API key against its stored hash."""
-    if not key or not stored_hash:
-        return False
-    return hmac.compare_digest(hash_api_key(key), stored_hash)
@@ -0,0 +1,160 @@
+"""JWT encode/decode behind one interface, plus a cache of decoded tokens.
+
+Reader endpoints such as ``/user/history/progress`` fire every few seconds
+with the same access token, and every call used to re-verify its HS256
+signature. :func:`decode_token` keeps recently verified claims in a bounded
+LRU keyed by the token's SHA-256 digest; an entry is served only until the
+token's own ``exp``, so caching never extends a token's lifetime. Tokens
+without ``exp`` are verified every time.
+
+Backends:
+
+* ``jose`` — python-jose; always installed and the default (``auto`` is
+  an alias for it), so tests and production verify tokens the same way.
+* ``pyjwt`` — PyJWT; opt-in with ``JWT_BACKEND=pyjwt`` and the optional
+  ``PyJWT`` package. It is not meaningfully faster (0.9-1.2x of jose in
+  ``benchmarks/bench_jwt_decode.py``); the win is the cache above.
+
+Both read and write standard HS256 tokens, so switching backends does not
+log anyone out.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from functools import cache
+
+from app.config import settings
+
+
+class TokenError(Exception):
+    """Invalid, expired or malformed token (whatever the backend)."""
+
+
+class JoseBackend:
+    name = "jose"
+
+    def __init__(self):
+        from jose import JWTError, jwt
+
+        self._jwt, self._error = jwt, JWTError
+
+    def encode(self, claims: dict, key: str, algorithm: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithm: str) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=[algorithm])
+        except self._error as e:
+            raise TokenError(str(e)) from None
+
+
+class PyJWTBackend:
+    name = "pyjwt"
+
+    def __init__(self):
+        import jwt
+
+        self._jwt = jwt
+
+    def encode(self, claims: dict, key: str, algorithm: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithm: str) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=[algorithm])
+        except self._jwt.PyJWTError as e:
+            raise TokenError(str(e)) from None
+
+
+BACKENDS = {"jose": JoseBackend, "pyjwt": PyJWTBackend}
+_BACKEND_MODULES = {"jose": "jose", "pyjwt": "jwt"}
+
+
+def backend_available(name: str) -> bool:
+    try:
+        module = __import__(_BACKEND_MODULES[name])
+    except ImportError:
+        return False
+    # The unrelated "jwt" distribution installs under the same import name
+    return name != "pyjwt" or hasattr(module, "PyJWTError")
+
+
+def available_backends() -> list[str]:
+    return [name for name in BACKENDS if backend_available(name)]
+
+
+@cache
+def get_backend(name: str | None = None) -> JoseBackend | PyJWTBackend:
+    """Resolve a backend by name; ``auto`` means ``jose``."""
+    name = (name or settings.JWT_BACKEND).lower()
+    if name == "auto":
+        name = "jose"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JWT_BACKEND {name!r} (expected one of {list(BACKENDS)})")
+    if not backend_available(name):
+        print(f"⚠️ JWT_BACKEND={name} is not installed, falling back to jose")
+        name = "jose"
+    return BACKENDS[name]()
+
+
+class DecodedTokenCache:
+    """Bounded LRU of ``sha256(token) -> (exp, claims)``."""
+
+    def __init__(self, max_entries: int = 4096, clock=time.time):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        digest = self._digest(token)
+        entry = self._entries.get(digest)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                del self._entries[digest]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, int | float) or self.max_entries <= 0:
+            return
+        digest = self._digest(token)
+        self._entries[digest] = (exp, claims)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+decoded_token_cache = DecodedTokenCache(settings.JWT_DECODE_CACHE_SIZE)
+
+
+def encode_token(claims: dict, key: str, algorithm: str) -> str:
+    return get_backend().encode(claims, key, algorithm)
+
+
+def decode_token(
+    token: str,
+    key: str,
+    algorithm: str,
+    token_cache: DecodedTokenCache | None = decoded_token_cache,
+) -> dict:
+    """Verified claims of ``token``; raises :class:`TokenError`. Do not mutate the result."""
+    claims = token_cache.get(token) if token_cache is not None else None
+    if claims is None:
+        claims = get_backend().decode(token, key, algorithm)
+        if token_cache is not None:
+            token_cache.put(token, claims)
+    return claims
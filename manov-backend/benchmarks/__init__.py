@@ -0,0 +1 @@
+"""Standalone performance benchmarks (``uv run python -m benchmarks.<name>``)."""
@@ -0,0 +1,75 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite file by default so they need no
+services. Set ``BENCH_DATABASE_URL`` to point them at a scratch Postgres
+database instead (the tables are dropped and recreated on every run).
+"""
+
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401  (populate SQLModel.metadata)
+
+
+@asynccontextmanager
+async def bench_engine():
+    """Yield ``(engine, sessionmaker)`` bound to a fresh, empty schema."""
+    url = os.environ.get("BENCH_DATABASE_URL")
+    tmpdir = None
+    if not url:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite+aiosqlite:///{tmpdir.name}/bench.db"
+    elif url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    engine = create_async_engine(url, echo=False, future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+    try:
+        yield engine, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    finally:
+        await engine.dispose()
+        if tmpdir:
+            tmpdir.cleanup()
+
+
+async def measure(fn: Callable[[], Awaitable[object]], repeat: int = 5) -> dict:
+    """Run ``fn`` ``repeat`` times; return mean/best latency (ms) and peak allocations (MB)."""
+    timings = []
+    tracemalloc.start()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "mean_ms": sum(timings) / len(timings),
+        "best_ms": min(timings),
+        "peak_mb": peak / 1024 / 1024,
+    }
+
+
+def max_rss_mb() -> float:
+    """Process peak RSS so far in MB (Linux reports ru_maxrss in KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def print_table(headers: list[str], rows: list[list]) -> None:
+    widths = [max(len(str(h)), *(len(_fmt(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths, strict=True)))
+    for row in rows:
+        print("  ".join(_fmt(v).rjust(w) for v, w in zip(row, widths, strict=True)))
+
+
+def _fmt(value) -> str:
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
@@ -0,0 +1,106 @@
+"""Admin chapter ingestion: per-chapter round trips vs. the bulk insert path.
+
+The old ``bulk_add_chapters`` loop ran an existence SELECT, then an
+add+flush for the Chapter and another for its ChapterTranslation — four
+round trips per chapter. The bulk path does one ``chapterNum IN (...)``
+conflict query, multi-row ``INSERT ... RETURNING`` for both tables and a
+single commit.
+
+    uv run python -m benchmarks.bench_bulk_chapters [10 100 1000 ...]
+"""
+
+import asyncio
+import sys
+
+from sqlmodel import select
+
+from app.crud import bulk_create_chapters, get_existing_chapter_ids, sync_novel_chapter_stats
+from app.models import Chapter, ChapterTranslation, Novel, utc_now
+from benchmarks._common import bench_engine, max_rss_mb, print_table
+
+CONTENT_SIZE = 20_000  # ~20 KB per body, a typical translated chapter
+
+
+def _payload(count: int) -> list[dict]:
+    body = "x" * CONTENT_SIZE
+    return [
+        {
+            "chapterNum": n,
+            "title": f"Chapter {n}",
+            "content": body,
+            "language": "EN",
+            "publishedAt": None,
+        }
+        for n in range(1, count + 1)
+    ]
+
+
+async def per_chapter(session, novel_id: int, chapters: list[dict]) -> list[int]:
+    """The pre-bulk endpoint body."""
+    translation_ids = []
+    for ch in chapters:
+        existing = await session.scalar(
+            select(Chapter).where(
+                Chapter.novelId == novel_id, Chapter.chapterNum == ch["chapterNum"]
+            )
+        )
+        assert existing is None
+        chapter = Chapter(
+            novelId=novel_id,
+            chapterNum=ch["chapterNum"],
+            rawTitle=ch["title"],
+            rawContent=ch["content"],
+        )
+        session.add(chapter)
+        await session.flush()
+        translation = ChapterTranslation(
+            chapterId=chapter.id,
+            language=ch["language"],
+            title=ch["title"],
+            content=ch["content"],
+            publishedAt=utc_now(),
+        )
+        session.add(translation)
+        await session.flush()
+        translation_ids.append(translation.id)
+    await sync_novel_chapter_stats(session, [novel_id])
+    await session.commit()
+    return translation_ids
+
+
+async def bulk(session, novel_id: int, chapters: list[dict]) -> list[int]:
+    existing = await get_existing_chapter_ids(
+        session, novel_id, (ch["chapterNum"] for ch in chapters)
+    )
+    assert not existing
+    return await bulk_create_chapters(session, novel_id, chapters, commit=True)
+
+
+async def _run(session_factory, ingest, count: int, slug: str) -> float:
+    chapters = _payload(count)
+    async with session_factory() as session:
+        novel = Novel(slug=slug, title=slug, originalTitle=slug)
+        session.add(novel)
+        await session.commit()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        ids = await ingest(session, novel.id, chapters)
+        elapsed = (loop.time() - start) * 1000
+    assert len(ids) == count
+    return elapsed
+
+
+async def main(counts: list[int]) -> None:
+    rows = []
+    for count in counts:
+        async with bench_engine() as (_, session_factory):
+            old = await _run(session_factory, per_chapter, count, f"old-{count}")
+            new = await _run(session_factory, bulk, count, f"new-{count}")
+        rows.append([count, old, new, f"{old / new:.1f}x"])
+
+    print_table(["chapters", "per_chapter_ms", "bulk_ms", "speedup"], rows)
+    print(f"process max RSS: {max_rss_mb():.1f} MB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(a) for a in sys.argv[1:]] or [10, 100, 1000]))
@@ -0,0 +1,75 @@
+"""Novel detail chapter list: eager ORM load vs. projected chapter index.
+
+Compares the old ``selectinload(Novel.chapters).selectinload(Chapter.translations)``
+query against ``crud.get_chapter_index`` for growing chapter counts. Peak
+memory is measured with tracemalloc per query; process RSS is printed last.
+
+    uv run python -m benchmarks.bench_chapter_index [2000 ...]
+"""
+
+import asyncio
+import sys
+
+from sqlalchemy import insert
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+
+from app.crud import get_chapter_index
+from app.models import Chapter, ChapterTranslation, Novel
+from benchmarks._common import bench_engine, max_rss_mb, measure, print_table
+
+CONTENT_SIZE = 20_000  # ~20 KB per body, a typical translated chapter
+
+
+async def _seed(session_factory, chapters: int) -> int:
+    async with session_factory() as session:
+        novel = Novel(slug=f"bench-{chapters}", title="Bench", originalTitle="Bench")
+        session.add(novel)
+        await session.flush()
+        body = "x" * CONTENT_SIZE
+        await session.execute(
+            insert(Chapter),
+            [{"novelId": novel.id, "chapterNum": n, "rawContent": body} for n in range(1, chapters + 1)],
+        )
+        ids = (await session.execute(select(Chapter.id).where(Chapter.novelId == novel.id))).scalars()
+        await session.execute(
+            insert(ChapterTranslation),
+            [
+                {"chapterId": cid, "language": lang, "title": f"T{cid}", "content": body}
+                for cid in ids.all()
+                for lang in ("EN", "ID")
+            ],
+        )
+        await session.commit()
+        return novel.id
+
+
+async def main(counts: list[int]) -> None:
+    rows = []
+    for count in counts:
+        async with bench_engine() as (_, session_factory):
+            novel_id = await _seed(session_factory, count)
+
+            async def eager(novel_id=novel_id):
+                async with session_factory() as session:
+                    novel = await session.scalar(
+                        select(Novel)
+                        .where(Novel.id == novel_id)
+                        .options(selectinload(Novel.chapters).selectinload(Chapter.translations))
+                    )
+                    return [t for ch in novel.chapters for t in ch.translations if t.language == "EN"]
+
+            async def projected(novel_id=novel_id):
+                async with session_factory() as session:
+                    return await get_chapter_index(session, novel_id, "EN")
+
+            old = await measure(eager)
+            new = await measure(projected)
+            rows.append([count, old["mean_ms"], new["mean_ms"], old["peak_mb"], new["peak_mb"]])
+
+    print_table(["chapters", "eager_ms", "index_ms", "eager_peak_mb", "index_peak_mb"], rows)
+    print(f"process max RSS: {max_rss_mb():.1f} MB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(a) for a in sys.argv[1:]] or [100, 500, 2000]))
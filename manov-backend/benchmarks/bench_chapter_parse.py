@@ -0,0 +1,40 @@
+"""Chapter extraction speed per parser backend over the recorded pages.
+
+Runs every installed backend from ``app.services.chapter_parser`` over the
+``tests/fixtures`` chapter pages and reports per-page latency and pages/sec.
+
+    uv run python -m benchmarks.bench_chapter_parse [rounds]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from app.services.chapter_parser import BACKENDS, available_backends
+from benchmarks._common import print_table
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+
+def main(rounds: int) -> None:
+    pages = [p.read_text(encoding="utf-8") for p in sorted(FIXTURES.glob("69shuba_chapter_*.html"))]
+    rows = []
+    baseline = None
+    for name in reversed(available_backends()):  # bs4 first, as the baseline
+        extract = BACKENDS[name]
+        for html in pages:  # warm-up (imports, compiled XPaths)
+            extract(html)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for html in pages:
+                extract(html)
+        per_page_ms = (time.perf_counter() - start) * 1000 / (rounds * len(pages))
+        baseline = baseline or per_page_ms
+        rows.append([name, per_page_ms, 1000 / per_page_ms, f"{baseline / per_page_ms:.1f}x"])
+
+    print(f"\n{len(pages)} pages x {rounds} rounds\n")
+    print_table(["backend", "ms/page", "pages/sec", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,104 @@
+"""Crawl throughput: fetch→parse in sequence vs. the pipelined crawler.
+
+Replays the recorded chapter pages in ``tests/fixtures`` through a fake
+Playwright page that adds a fixed navigation latency, so the numbers isolate
+how much parsing overlaps with page loads. Politeness delays are disabled.
+
+    uv run python -m benchmarks.bench_crawl_pipeline [pages] [latency_ms]
+"""
+
+import asyncio
+import re
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from app.services.browser_pool import HostScheduler
+from app.services.chapter_parser import extract_chapter
+from app.services.scraper_crawler import AsyncNovelCrawler
+from benchmarks._common import max_rss_mb, print_table
+
+FIXTURES = sorted(
+    (Path(__file__).parent.parent / "tests" / "fixtures").glob("69shuba_chapter_*.html")
+)
+BASE_URL = "https://bench.local/txt/1/"
+
+
+class ReplayPage:
+    """Just enough of ``playwright.async_api.Page`` for ``AsyncNovelCrawler``."""
+
+    def __init__(self, pages: int, latency: float):
+        self.pages = pages
+        self.latency = latency
+        self.html = [path.read_text(encoding="utf-8") for path in FIXTURES]
+        self.index = 0
+
+    async def goto(self, url: str, timeout: int = 0) -> None:
+        self.index = int(url.rsplit("/", 1)[1])
+        await asyncio.sleep(self.latency)
+
+    async def wait_for_selector(self, selector: str, **kwargs) -> None:
+        return None
+
+    async def eval_on_selector_all(self, selector: str, script: str) -> str | None:
+        return f"{BASE_URL}{self.index + 1}" if self.index + 1 < self.pages else None
+
+    async def content(self) -> str:
+        # Vary the title so every page gets its own chapter file
+        html = self.html[self.index % len(self.html)]
+        return re.sub(r"第\d+章", f"第{self.index + 1}章", html, count=1)
+
+
+class ReplayPool:
+    def __init__(self, page: ReplayPage):
+        self._page = page
+
+    @asynccontextmanager
+    async def page(self):
+        yield self._page
+
+
+async def sequential(crawler: AsyncNovelCrawler, page: ReplayPage) -> int:
+    """The pre-pipeline loop: navigate, parse inline, save, then navigate again."""
+    url, counter, saved = f"{BASE_URL}0", 1, 0
+    while url:
+        html, next_url = await crawler.fetch_html(page, url)
+        title, content, _ = extract_chapter(html)
+        data = {"source_url": url, "title": title, "content": content}
+        counter = crawler.save_chapter(data, counter) + 1
+        saved += 1
+        url = next_url
+    return saved
+
+
+async def pipelined(crawler: AsyncNovelCrawler, page: ReplayPage) -> int:
+    return await crawler.crawl(f"{BASE_URL}0", max_chapters=0)
+
+
+async def main(pages: int, latency_ms: float) -> None:
+    rows = []
+    for name, run in (("sequential", sequential), ("pipelined", pipelined)):
+        page = ReplayPage(pages, latency_ms / 1000)
+        with tempfile.TemporaryDirectory() as out:
+            crawler = AsyncNovelCrawler(
+                output_dir=out,
+                pool=ReplayPool(page),
+                scheduler=HostScheduler(0, 0),
+                fast_path=False,
+            )
+            start = time.perf_counter()
+            saved = await run(crawler, page)
+            elapsed = time.perf_counter() - start
+        rows.append([name, saved, f"{elapsed:.2f}", f"{saved / elapsed:.1f}"])
+
+    print(f"\n{pages} pages, {latency_ms:.0f} ms simulated navigation latency\n")
+    print_table(["mode", "pages", "seconds", "pages/sec"], rows)
+    print(f"\nmax RSS: {max_rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    n_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(main(n_pages, latency))
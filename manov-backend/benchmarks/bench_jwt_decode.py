@@ -0,0 +1,61 @@
+"""Access-token decodes/sec: each JWT backend, with and without the decoded-token cache.
+
+``get_current_user`` used to run a full HS256 verify through python-jose on
+every request. ``app.utils.tokens.decode_token`` now serves repeat tokens
+from an LRU (until their ``exp``) and verifies misses with the configured
+backend (python-jose unless ``JWT_BACKEND=pyjwt``).
+
+    uv run python -m benchmarks.bench_jwt_decode [decodes_per_run]
+"""
+
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+
+from app.utils.security import ALGORITHM, SECRET_KEY
+from app.utils.tokens import DecodedTokenCache, available_backends, decode_token, get_backend
+from benchmarks._common import print_table
+
+ACTIVE_READERS = 1000  # distinct tokens cycling through the cache
+
+
+def _tokens(count: int) -> list[str]:
+    expires = datetime.now(UTC) + timedelta(hours=1)
+    encode = get_backend("jose").encode
+    return [
+        encode({"sub": str(n), "role": "USER", "exp": expires}, SECRET_KEY, ALGORITHM)
+        for n in range(count)
+    ]
+
+
+def _rate(decode, tokens: list[str], decodes: int) -> float:
+    start = time.perf_counter()
+    for n in range(decodes):
+        decode(tokens[n % len(tokens)])
+    return decodes / (time.perf_counter() - start)
+
+
+def main(decodes: int) -> None:
+    tokens = _tokens(ACTIVE_READERS)
+    rows = []
+    baseline = None
+    # python-jose first: it is the pre-change path the others are compared to
+    for name in sorted(available_backends(), key=lambda n: n != "jose"):
+        backend = get_backend(name)
+        rate = _rate(lambda t, b=backend: b.decode(t, SECRET_KEY, ALGORITHM), tokens, decodes)
+        baseline = baseline or rate
+        rows.append([name, "-", rate, f"{rate / baseline:.2f}x"])
+
+    # Cache hits never reach a backend, so one row covers them all
+    cache = DecodedTokenCache(max_entries=4096)
+    for token in tokens:  # warm: every active reader has been seen once
+        decode_token(token, SECRET_KEY, ALGORITHM, cache)
+    rate = _rate(lambda t: decode_token(t, SECRET_KEY, ALGORITHM, cache), tokens, decodes)
+    rows.append([get_backend().name, "lru", rate, f"{rate / baseline:.2f}x"])
+
+    print_table(["backend", "cache", "decodes_per_s", "vs_jose"], rows)
+    print(f"cache: {cache.hits} hits / {cache.misses} misses, {ACTIVE_READERS} active tokens")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,135 @@
+"""Chapter-read latency during a login storm: inline bcrypt vs. the hashing pool.
+
+A reader loop hits ``GET /api/novels/{slug}/chapters/1`` back to back while
+waves of concurrent ``POST /api/auth/login`` requests run. With bcrypt
+called inline each login blocks the event loop for the full hash, so read
+p99 grows with the storm; with :data:`password_hasher` reads only wait on
+the DB.
+
+    uv run python -m benchmarks.bench_login_storm [concurrent_logins ...]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+
+from app.database import get_session, get_session_factory
+from app.main import app
+from app.middleware.rate_limit import limiter
+from app.models import Chapter, ChapterTranslation, Novel, User
+from app.services.password_hasher import password_hasher
+from app.utils.security import get_password_hash, verify_password
+from benchmarks._common import bench_engine, print_table
+
+PASSWORD = "bench-password"
+STORM_SECONDS = 3.0
+
+
+async def _seed(session_factory, users: int) -> None:
+    hashed = get_password_hash(PASSWORD)
+    async with session_factory() as session:
+        novel = Novel(slug="bench", title="Bench Novel", originalTitle="Bench")
+        session.add(novel)
+        await session.flush()
+        chapter = Chapter(novelId=novel.id, chapterNum=1, rawContent="raw")
+        session.add(chapter)
+        await session.flush()
+        session.add(
+            ChapterTranslation(chapterId=chapter.id, language="EN", title="T", content="x" * 5000)
+        )
+        await session.execute(
+            insert(User),
+            [
+                {"username": f"u{n}", "email": f"u{n}@bench.dev", "password": hashed}
+                for n in range(users)
+            ],
+        )
+        await session.commit()
+
+
+@contextmanager
+def _inline_bcrypt():
+    """Swap the pool for the pre-change behaviour: bcrypt on the event loop."""
+
+    async def verify(password, hashed):
+        return verify_password(password, hashed)
+
+    async def hash_(password):
+        return get_password_hash(password)
+
+    password_hasher.verify, password_hasher.hash = verify, hash_
+    try:
+        yield
+    finally:
+        del password_hasher.verify, password_hasher.hash
+
+
+async def _reads(client: AsyncClient, stop: asyncio.Event) -> list[float]:
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/api/novels/bench/chapters/1")
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+async def _storm(client: AsyncClient, concurrency: int, stop: asyncio.Event) -> int:
+    async def one(n: int) -> int:
+        response = await client.post(
+            "/api/auth/login", json={"email": f"u{n}@bench.dev", "password": PASSWORD}
+        )
+        return response.status_code
+
+    done = 0
+    while not stop.is_set():
+        codes = await asyncio.gather(*(one(n) for n in range(concurrency)))
+        done += sum(code == 200 for code in codes)
+    return done
+
+
+async def _run(client: AsyncClient, concurrency: int) -> list:
+    stop = asyncio.Event()
+    reader = asyncio.create_task(_reads(client, stop))
+    storm = asyncio.create_task(_storm(client, concurrency, stop)) if concurrency else None
+    await asyncio.sleep(STORM_SECONDS)
+    stop.set()
+    latencies = sorted(await reader)
+    logins = await storm if storm else 0
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return [len(latencies), statistics.median(latencies), p99, latencies[-1], logins]
+
+
+async def main(storms: list[int]) -> None:
+    limiter.enabled = False
+    async with bench_engine() as (_, session_factory):
+        await _seed(session_factory, max(storms))
+
+        async def override_get_session():
+            async with session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[get_session_factory] = lambda: session_factory
+        rows = []
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://b") as client:
+            rows.append(["idle", "-", *await _run(client, 0)])
+            for concurrency in storms:
+                with _inline_bcrypt():
+                    rows.append(["inline", concurrency, *await _run(client, concurrency)])
+                rows.append(["pool", concurrency, *await _run(client, concurrency)])
+        app.dependency_overrides.clear()
+        password_hasher.shutdown()
+
+    print_table(["bcrypt", "logins", "reads", "p50_ms", "p99_ms", "max_ms", "logins_ok"], rows)
+    print(f"hasher: {password_hasher.metrics.summary()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(a) for a in sys.argv[1:]] or [4, 16]))
@@ -0,0 +1,97 @@
+"""New-chapter notification fan-out: ORM objects per follower vs. INSERT ... SELECT.
+
+The old ``_notify_users_of_new_chapter`` loaded every follower id and added
+one ``Notification`` object per user before a single huge flush; the new
+path is ``crud.fan_out_chapter_notifications``, one set-based statement.
+
+    uv run python -m benchmarks.bench_notification_fanout [1000 10000 100000 ...]
+"""
+
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+from sqlmodel import select
+
+from app.crud import fan_out_chapter_notifications
+from app.models import Chapter, Library, Notification, Novel, User
+from benchmarks._common import bench_engine, max_rss_mb, print_table
+
+MESSAGE = "Bench Novel — Chapter 1 is now available!"
+
+
+async def _seed(session_factory, followers: int) -> tuple[int, int]:
+    async with session_factory() as session:
+        novel = Novel(slug="bench", title="Bench Novel", originalTitle="Bench")
+        session.add(novel)
+        await session.flush()
+        chapter = Chapter(novelId=novel.id, chapterNum=1, rawContent="raw")
+        session.add(chapter)
+        await session.flush()
+        await session.execute(
+            insert(User),
+            [
+                {"username": f"u{n}", "email": f"u{n}@bench.local", "password": "x", "role": "USER"}
+                for n in range(followers)
+            ],
+        )
+        user_ids = (await session.execute(select(User.id))).scalars().all()
+        await session.execute(
+            insert(Library), [{"userId": uid, "novelId": novel.id} for uid in user_ids]
+        )
+        await session.commit()
+        return novel.id, chapter.id
+
+
+async def orm_per_follower(session, novel_id: int, chapter_id: int) -> int:
+    """The pre-change body of ``_notify_users_of_new_chapter``."""
+    result = await session.execute(select(Library.userId).where(Library.novelId == novel_id))
+    user_ids = [row[0] for row in result.all()]
+    for user_id in user_ids:
+        session.add(
+            Notification(
+                userId=user_id,
+                type="NEW_CHAPTER",
+                message=MESSAGE,
+                novelId=novel_id,
+                chapterId=chapter_id,
+            )
+        )
+    await session.commit()
+    return len(user_ids)
+
+
+async def set_based(session, novel_id: int, chapter_id: int) -> int:
+    return await fan_out_chapter_notifications(session, novel_id, chapter_id, MESSAGE, commit=True)
+
+
+async def _timed(session_factory, fan_out, novel_id: int, chapter_id: int) -> tuple[float, float]:
+    async with session_factory() as session:
+        tracemalloc.start()
+        start = time.perf_counter()
+        await fan_out(session, novel_id, chapter_id)
+        elapsed = (time.perf_counter() - start) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+async def main(counts: list[int]) -> None:
+    rows = []
+    for count in counts:
+        async with bench_engine() as (_, session_factory):
+            novel_id, chapter_id = await _seed(session_factory, count)
+            old_ms, old_mb = await _timed(session_factory, orm_per_follower, novel_id, chapter_id)
+            new_ms, new_mb = await _timed(session_factory, set_based, novel_id, chapter_id)
+        rows.append([count, old_ms, new_ms, f"{old_ms / new_ms:.1f}x", old_mb, new_mb])
+
+    print_table(
+        ["followers", "orm_ms", "insert_select_ms", "speedup", "orm_peak_mb", "sql_peak_mb"], rows
+    )
+    print(f"process max RSS: {max_rss_mb():.1f} MB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(a) for a in sys.argv[1:]] or [1000, 10000, 100000]))
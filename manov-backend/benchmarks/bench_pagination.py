@@ -0,0 +1,85 @@
+"""Deep-page latency: OFFSET vs keyset cursor on a user's notifications.
+
+Seeds one user with ``pages * 20`` notifications and fetches the last page
+both with ``skip`` and with the cursor pointing at the same position.
+
+    uv run python -m benchmarks.bench_pagination [pages]
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlmodel import select
+
+from app.crud import get_user_notifications
+from app.models import Notification, User
+from app.utils.cursor import encode_cursor
+from benchmarks._common import bench_engine, measure, print_table
+
+PAGE_SIZE = 20
+BATCH = 10_000
+
+
+async def main(pages: int) -> None:
+    total = pages * PAGE_SIZE
+    async with bench_engine() as (_, session_factory):
+        async with session_factory() as session:
+            user = User(email="bench@example.com", username="bench", password="x")
+            session.add(user)
+            await session.flush()
+            base = datetime(2026, 1, 1)
+            for start in range(0, total, BATCH):
+                await session.execute(
+                    insert(Notification),
+                    [
+                        {
+                            "userId": user.id,
+                            "type": "NEW_CHAPTER",
+                            "message": f"Chapter {i} is now available!",
+                            "createdAt": base + timedelta(seconds=i),
+                        }
+                        for i in range(start, min(start + BATCH, total))
+                    ],
+                )
+            await session.commit()
+            user_id = user.id
+
+            # Cursor equivalent to the start of the last page
+            skip = (pages - 1) * PAGE_SIZE
+            anchor = await session.scalar(
+                select(Notification)
+                .where(Notification.userId == user_id)
+                .order_by(Notification.createdAt.desc(), Notification.id.desc())
+                .offset(skip - 1)
+                .limit(1)
+            )
+            cursor = encode_cursor(anchor.createdAt, anchor.id)
+
+        async def by_offset():
+            async with session_factory() as session:
+                rows, _ = await get_user_notifications(session, user_id, skip=skip, limit=PAGE_SIZE)
+                return rows
+
+        async def by_cursor():
+            async with session_factory() as session:
+                rows, _ = await get_user_notifications(session, user_id, limit=PAGE_SIZE, cursor=cursor)
+                return rows
+
+        assert [n.id for n in await by_offset()] == [n.id for n in await by_cursor()]
+        offset = await measure(by_offset, repeat=10)
+        keyset = await measure(by_cursor, repeat=10)
+
+    print(f"{total} notifications, page {pages} of {PAGE_SIZE}")
+    print_table(
+        ["mode", "mean_ms", "best_ms"],
+        [
+            ["offset", offset["mean_ms"], offset["best_ms"]],
+            ["keyset", keyset["mean_ms"], keyset["best_ms"]],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,108 @@
+"""Novel search over a synthetic catalogue (default 100k novels).
+
+On PostgreSQL (``BENCH_DATABASE_URL=postgresql://...``) the search column and
+indexes from ``app.utils.search.POSTGRES_SEARCH_DDL`` are installed and the
+old ``ILIKE '%q%'`` scan is timed against the full-text/trigram path. On the
+default SQLite scratch DB only the ILIKE fallback exists, so only it is timed.
+
+    uv run python -m benchmarks.bench_search [novels]
+"""
+
+import asyncio
+import random
+import sys
+
+from sqlalchemy import func, insert, or_, text
+from sqlmodel import select
+
+from app.crud import count_search_results
+from app.models import Novel
+from app.utils.search import (
+    POSTGRES_SEARCH_DDL,
+    novel_search_filter,
+    novel_search_order,
+    uses_full_text,
+)
+from benchmarks._common import bench_engine, measure, print_table
+
+WORDS = [
+    "sword", "god", "dragon", "emperor", "immortal", "demon", "heaven", "martial",
+    "saint", "blood", "moon", "shadow", "phoenix", "eternal", "divine",
+    "cultivation", "villain", "reborn", "system", "academy",
+]
+QUERIES = ["dragon", "immortal emperor", "reborn villain", "phoenx", "zzzz-no-match"]
+BATCH = 5_000
+
+
+def _synthetic_novel(i: int, rng: random.Random) -> dict:
+    title = " ".join(rng.choices(WORDS, k=3)).title()
+    return {
+        "slug": f"novel-{i}",
+        "title": f"{title} {i}",
+        "originalTitle": title,
+        "author": f"Author {rng.randint(1, 5000)}",
+        "synopsis": " ".join(rng.choices(WORDS, k=120)),
+    }
+
+
+async def _seed(session_factory, total: int) -> None:
+    rng = random.Random(42)
+    async with session_factory() as session:
+        for start in range(0, total, BATCH):
+            rows = [_synthetic_novel(i, rng) for i in range(start, min(start + BATCH, total))]
+            await session.execute(insert(Novel), rows)
+        await session.commit()
+
+
+async def main(total: int) -> None:
+    async with bench_engine() as (engine, session_factory):
+        await _seed(session_factory, total)
+        async with session_factory() as session:
+            full_text = uses_full_text(session)
+        if full_text:
+            async with engine.begin() as conn:
+                for ddl in POSTGRES_SEARCH_DDL:
+                    await conn.execute(text(ddl))
+                await conn.execute(text("ANALYZE novel"))
+
+        rows = []
+        for q in QUERIES:
+
+            async def ilike(q=q):
+                pattern = f"%{q}%"
+                where = or_(
+                    Novel.title.ilike(pattern),
+                    Novel.author.ilike(pattern),
+                    Novel.synopsis.ilike(pattern),
+                )
+                async with session_factory() as session:
+                    await session.execute(
+                        select(Novel.id).where(where).order_by(Novel.updatedAt.desc()).limit(20)
+                    )
+                    return await session.scalar(select(func.count(Novel.id)).where(where))
+
+            async def current(q=q):
+                # Same page + count shape as search_novels/count_search_results,
+                # minus the genre and chapter-count loading both paths share.
+                async with session_factory() as session:
+                    await session.execute(
+                        select(Novel.id)
+                        .where(novel_search_filter(session, q))
+                        .order_by(*novel_search_order(session, q))
+                        .limit(20)
+                    )
+                    return await count_search_results(session, q)
+
+            old = await measure(ilike, repeat=3)
+            new = await measure(current, repeat=3)
+            async with session_factory() as session:
+                hits = await count_search_results(session, q)
+            rows.append([q, hits, old["mean_ms"], new["mean_ms"]])
+
+    backend = "full-text + trigram" if full_text else "ILIKE fallback"
+    print(f"{total} novels, search_novels backend: {backend}")
+    print_table(["query", "hits", "ilike_ms", "search_ms"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,24 @@
+import asyncio
+
+from app.crud import reconcile_novel_rating_stats, sync_novel_chapter_stats
+from app.database import AsyncSessionLocal, engine
+
+
+async def repair_novel_stats():
+    """Recompute the denormalized chapter and rating stats on every novel in bulk.
+
+    Rating aggregates are maintained incrementally on every review write; run
+    this periodically (e.g. nightly cron) to correct any drift.
+    """
+    async with AsyncSessionLocal() as session:
+        print("--- 🔧 REPAIRING NOVEL STATS ---")
+        await sync_novel_chapter_stats(session, commit=True)
+        print("✅ chapterCount / latestChapterNum / latestChapterAt recomputed.")
+        await reconcile_novel_rating_stats(session, commit=True)
+        print("✅ ratingSum / ratingCount / averageRating reconciled.")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(repair_novel_stats())
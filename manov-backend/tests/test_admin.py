@@ -210,6 +210,31 @@ class TestCompositeAgentEndpoints:
         assert response.status_code == 409
         assert "already exists" in response.json()["detail"]
 
+    async def test_bulk_add_chapters_returns_ids_in_request_order(self, admin_client, db_session):
+        """Bulk insert maps translation ids back to the request order, not chapterNum order."""
+        novel = Novel(slug="ordered-novel", title="Ordered", originalTitle="Original")
+        db_session.add(novel)
+        await db_session.commit()
+        await db_session.refresh(novel)
+
+        nums = [5, 1, 3, 2, 4]
+        payload = {
+            "chapters": [
+                {"chapterNum": n, "title": f"Ch {n}", "content": f"Content {n}."} for n in nums
+            ]
+        }
+        response = await admin_client.post(f"/api/admin/novels/{novel.id}/chapters/bulk", json=payload)
+        assert response.status_code == 200
+
+        for num, translation_id in zip(nums, response.json()["translationIds"], strict=True):
+            translation = await db_session.get(ChapterTranslation, translation_id)
+            assert translation.title == f"Ch {num}"
+            assert translation.publishedAt is not None
+
+        duplicate = {"chapters": [payload["chapters"][0]] * 2}
+        response = await admin_client.post(f"/api/admin/novels/{novel.id}/chapters/bulk", json=duplicate)
+        assert response.status_code == 422
+
     async def test_update_chapter_translation_content(self, admin_client, db_session):
         """PUT /admin/chapters/{translation_id}/content should update a translation."""
         novel = Novel(
@@ -254,3 +279,421 @@ class TestCompositeAgentEndpoints:
         await db_session.refresh(translation)
         assert translation.title == "Updated Title"
         assert translation.content == "Updated content."
+
+
+class TestNovelChapterStats:
+    """Denormalized chapterCount/latestChapterNum stay in sync with chapter writes."""
+
+    async def test_bulk_add_and_delete_update_stats(self, admin_client, client, db_session):
+        novel = Novel(slug="stats-novel", title="Stats Novel", originalTitle="Original")
+        db_session.add(novel)
+        await db_session.commit()
+        await db_session.refresh(novel)
+
+        payload = {
+            "chapters": [
+                {"chapterNum": n, "title": f"Ch {n}", "content": f"Content {n}."}
+                for n in (1, 2, 3)
+            ]
+        }
+        response = await admin_client.post(f"/api/admin/novels/{novel.id}/chapters/bulk", json=payload)
+        assert response.status_code == 200
+
+        await db_session.refresh(novel)
+        assert novel.chapterCount == 3
+        assert novel.latestChapterNum == 3
+        assert novel.latestChapterAt is not None
+
+        listing = await client.get("/api/novels")
+        assert listing.json()[0]["chapterCount"] == 3
+        assert listing.json()[0]["latestChapterNum"] == 3
+
+        last = await db_session.scalar(
+            select(Chapter).where(Chapter.novelId == novel.id, Chapter.chapterNum == 3)
+        )
+        response = await admin_client.delete(f"/api/admin/chapters/{last.id}")
+        assert response.status_code == 200
+
+        await db_session.refresh(novel)
+        assert novel.chapterCount == 2
+        assert novel.latestChapterNum == 2
+
+    async def test_repair_recomputes_all_novels(self, db_session):
+        from app.crud import sync_novel_chapter_stats
+
+        novel = Novel(slug="drifted", title="Drifted", originalTitle="Original", chapterCount=99)
+        db_session.add(novel)
+        await db_session.commit()
+        await db_session.refresh(novel)
+        db_session.add(Chapter(novelId=novel.id, chapterNum=7, rawContent="raw"))
+        await db_session.commit()
+
+        await sync_novel_chapter_stats(db_session, commit=True)
+
+        await db_session.refresh(novel)
+        assert novel.chapterCount == 1
+        assert novel.latestChapterNum == 7
+
+
+class TestCrawlState:
+    """Crawl state is upserted per novel and listed by /admin/crawl-status."""
+
+    async def test_success_and_error_updates_feed_status_listing(self, admin_client, db_session):
+        from app.crud import get_crawl_state, record_crawl_error, record_crawl_success
+
+        crawled = Novel(slug="crawled", title="Crawled", originalTitle="Original")
+        idle = Novel(slug="idle", title="Idle", originalTitle="Original")
+        db_session.add_all([crawled, idle])
+        await db_session.commit()
+
+        await record_crawl_error(db_session, crawled.id, "Failed to fetch u1")
+        await record_crawl_success(db_session, crawled.id, 1, "u1", "u2", commit=True)
+        await record_crawl_success(db_session, crawled.id, 2, "u2", "u3", commit=True)
+        await record_crawl_error(db_session, crawled.id, "Ch 3 translation: timed out")
+        await record_crawl_error(db_session, crawled.id, "Ch 3 translation: timed out")
+
+        state = await get_crawl_state(db_session, crawled.id)
+        await db_session.refresh(state)
+        assert (state.lastChapterNum, state.lastUrl, state.nextUrl) == (2, "u2", "u3")
+        assert state.errorCount == 2
+        assert state.lastSuccessAt is not None
+
+        response = await admin_client.get("/api/admin/crawl-status")
+        assert response.status_code == 200
+        by_slug = {row["slug"]: row for row in response.json()}
+        assert by_slug["crawled"]["nextUrl"] == "u3"
+        assert by_slug["crawled"]["errorCount"] == 2
+        assert by_slug["crawled"]["lastError"] == "Ch 3 translation: timed out"
+        assert by_slug["idle"]["lastChapterNum"] is None
+        assert by_slug["idle"]["errorCount"] == 0
+
+
+class TestApiKeyAuth:
+    """API keys are looked up by hash, cached until revoked, and touched in batches."""
+
+    async def _authenticate(self, key: str):
+        from app.database import get_session_factory
+        from app.utils.deps import resolve_api_key
+
+        user, _ = await resolve_api_key(key, app.dependency_overrides[get_session_factory]())
+        return user
+
+    async def test_lookup_cache_and_revocation(self, admin_client, db_session, monkeypatch):
+        from app.database import get_session_factory
+        from app.models import ApiKey, User
+        from app.services.api_key_auth import api_key_cache, api_key_usage
+
+        api_key_cache.clear()
+        monkeypatch.setattr(
+            api_key_usage, "session_factory", app.dependency_overrides[get_session_factory]()
+        )
+        db_session.add(
+            User(id=1, username="admin", email="admin@x.com", password="x", role="ADMIN")
+        )
+        await db_session.commit()
+
+        created = (await admin_client.post("/api/admin/api-keys", json={"name": "mcp"})).json()
+        key = created["key"]
+
+        assert await self._authenticate("manov_not-a-real-key") is None
+        hits = api_key_cache.hits
+        for _ in range(3):
+            principal = await self._authenticate(key)
+            assert principal == {
+                "id": 1,
+                "email": "admin@x.com",
+                "role": "ADMIN",
+                "username": "admin",
+            }
+        assert api_key_cache.hits == hits + 2
+
+        # lastUsedAt only lands in the DB when the buffer flushes
+        row = await db_session.get(ApiKey, created["id"])
+        assert row.lastUsedAt is None
+        assert await api_key_usage.flush() == 1
+        await db_session.refresh(row)
+        assert row.lastUsedAt is not None
+
+        response = await admin_client.delete(f"/api/admin/api-keys/{created['id']}")
+        assert response.status_code == 200
+        assert await self._authenticate(key) is None
+
+    async def test_admin_resolver_short_circuits_and_reports_timing(
+        self, admin_client, client, db_session
+    ):
+        from app.models import User
+        from app.services.api_key_auth import api_key_cache
+        from app.utils.auth_timing import auth_timings
+
+        api_key_cache.clear()
+        seen = []
+
+        def hook(path, seconds):
+            seen.append(path)
+
+        auth_timings.add_hook(hook)
+        db_session.add_all(
+            [
+                User(id=1, username="admin", email="admin@x.com", password="x", role="ADMIN"),
+                User(id=2, username="reader", email="reader@x.com", password="x", role="USER"),
+            ]
+        )
+        await db_session.commit()
+        key = (await admin_client.post("/api/admin/api-keys", json={"name": "mcp"})).json()["key"]
+        try:
+            # API key alone is enough (no Bearer token required any more)
+            for expected in ("api_key_db", "api_key_cached"):
+                response = await client.get("/api/admin/crawl-status", headers={"X-API-Key": key})
+                assert response.status_code == 200
+                assert f'desc="{expected}"' in response.headers["Server-Timing"]
+
+            # A valid Bearer wins before the key is even looked at
+            response = await admin_client.get(
+                "/api/admin/crawl-status", headers={"X-API-Key": "manov_bogus"}
+            )
+            assert response.status_code == 200
+            assert 'desc="jwt"' in response.headers["Server-Timing"]
+
+            # ...and a bad Bearer still falls back to a good key
+            response = await client.get(
+                f"/api/admin/crawl-status?api_key={key}",
+                headers={"Authorization": "Bearer not-a-jwt"},
+            )
+            assert response.status_code == 200
+
+            reader = create_access_token({"sub": "2", "role": "USER"})
+            response = await client.get(
+                "/api/admin/crawl-status", headers={"Authorization": f"Bearer {reader}"}
+            )
+            assert response.status_code == 403
+            assert (await client.get("/api/admin/crawl-status")).status_code == 401
+        finally:
+            auth_timings.remove_hook(hook)
+
+        assert seen[-6:] == [
+            "api_key_db",
+            "api_key_cached",
+            "jwt",
+            "api_key_cached",
+            "jwt",
+            "denied",
+        ]
+        metrics = (await admin_client.get("/api/admin/auth-metrics")).json()
+        assert metrics["resolver"]["api_key_cached"]["count"] >= 2
+
+    async def test_cache_expires_and_evicts_lru(self):
+        from app.services.api_key_auth import ApiKeyCache
+
+        now = 1000.0
+        cache = ApiKeyCache(max_entries=2, ttl=30, clock=lambda: now)
+        cache.put("a", 1, {"id": 1})
+        cache.put("b", 2, {"id": 2})
+        assert cache.get("a") == (1, {"id": 1})
+        cache.put("c", 3, {"id": 3})  # evicts "b", the least recently used
+        assert cache.get("b") is None
+        assert cache.get("c") == (3, {"id": 3})
+
+        now += 31
+        assert cache.get("a") is None
+
+
+class TestStreamAddChapters:
+    """NDJSON ingestion reports per-line results and commits batch by batch."""
+
+    async def test_stream_reports_each_line(self, admin_client, db_session):
+        import json
+
+        novel = Novel(slug="stream-novel", title="Stream", originalTitle="Original")
+        db_session.add(novel)
+        await db_session.commit()
+        await db_session.refresh(novel)
+        db_session.add(Chapter(novelId=novel.id, chapterNum=2, rawContent="already here"))
+        await db_session.commit()
+
+        def chapter(num, **extra):
+            return json.dumps({"chapterNum": num, "title": f"Ch {num}", "content": "x", **extra})
+
+        body = "\n".join(
+            [
+                chapter(1),
+                chapter(2),
+                "{not json",
+                "",
+                chapter(3),
+                chapter(3),
+                chapter(4, publishedAt="yesterday"),
+                chapter(5),
+            ]
+        )
+        response = await admin_client.post(
+            f"/api/admin/novels/{novel.id}/chapters/stream?batchSize=2",
+            content=body.encode(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        summary = lines.pop()
+        statuses = {line["line"]: line["status"] for line in lines}
+        assert statuses == {
+            1: "created",
+            2: "exists",
+            3: "invalid",
+            5: "created",
+            6: "invalid",
+            7: "invalid",
+            8: "created",
+        }
+        assert summary == {
+            "done": True,
+            "disconnected": False,
+            "created": 3,
+            "exists": 1,
+            "invalid": 3,
+            "failed": 0,
+        }
+
+        await db_session.refresh(novel)
+        assert novel.chapterCount == 4
+        assert novel.latestChapterNum == 5
+
+    async def test_stream_keeps_received_chapters_when_client_drops(self, db_session):
+        import json
+
+        novel = Novel(slug="dropped-novel", title="Dropped", originalTitle="Original")
+        db_session.add(novel)
+        await db_session.commit()
+        await db_session.refresh(novel)
+
+        first = json.dumps({"chapterNum": 1, "title": "Ch 1", "content": "x"}).encode()
+        # Chapter 1 arrives whole, chapter 2 is cut off mid-line by the disconnect
+        messages = [
+            {"type": "http.request", "body": first + b"\n" + b'{"chapterNum": 2, "ti', "more_body": True},
+            {"type": "http.disconnect"},
+        ]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        token = create_access_token({"sub": "1", "role": "ADMIN"})
+        path = f"/api/admin/novels/{novel.id}/chapters/stream"
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"test"), (b"authorization", f"Bearer {token}".encode())],
+            "client": ("127.0.0.1", 1234),
+            "server": ("test", 80),
+        }
+        await app(scope, receive, send)
+
+        body = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+        summary = json.loads(body.decode().splitlines()[-1])
+        assert summary["disconnected"] is True
+        assert summary["created"] == 1
+
+        chapters = (
+            await db_session.scalars(select(Chapter.chapterNum).where(Chapter.novelId == novel.id))
+        ).all()
+        assert chapters == [1]
+
+    @pytest.mark.parametrize("batch_size, drop", [(100, "request"), (1, "response")])
+    async def test_stream_audits_committed_chapters_when_socket_dies(
+        self, db_session, batch_size, drop
+    ):
+        import contextlib
+        import json
+
+        from starlette.requests import ClientDisconnect
+
+        from app.models import AdminAuditLog
+
+        novel = Novel(slug="dead-socket", title="Dead", originalTitle="Original")
+        db_session.add(novel)
+        await db_session.commit()
+        await db_session.refresh(novel)
+
+        lines = [
+            json.dumps({"chapterNum": n, "title": f"Ch {n}", "content": "x"}).encode() + b"\n"
+            for n in (1, 2)
+        ]
+        if drop == "request":
+            # Chapter 1 arrives whole, then the client goes away mid-upload
+            messages = [
+                {"type": "http.request", "body": lines[0] + b'{"chapterNum": 2', "more_body": True},
+                {"type": "http.disconnect"},
+            ]
+        else:
+            # Whole body arrives; the socket dies once chapter 1's result is sent
+            messages = [{"type": "http.request", "body": b"".join(lines), "more_body": False}]
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            if message["type"] == "http.response.body":
+                raise OSError("connection reset")
+
+        token = create_access_token({"sub": "1", "role": "ADMIN"})
+        path = f"/api/admin/novels/{novel.id}/chapters/stream"
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": f"batchSize={batch_size}".encode(),
+            "root_path": "",
+            "headers": [(b"host", b"test"), (b"authorization", f"Bearer {token}".encode())],
+            "client": ("127.0.0.1", 1234),
+            "server": ("test", 80),
+        }
+        # Depending on where the send fails the server sees either error
+        with contextlib.suppress(ClientDisconnect, OSError):
+            await app(scope, receive, send)
+
+        # Whatever committed before the cancellation landed is in the audit row
+        chapters = (
+            await db_session.scalars(select(Chapter.chapterNum).where(Chapter.novelId == novel.id))
+        ).all()
+        assert chapters[:1] == [1]
+        [log] = (
+            await db_session.scalars(
+                select(AdminAuditLog).where(AdminAuditLog.action == "STREAM_ADD_CHAPTERS")
+            )
+        ).all()
+        assert log.entityId == novel.id
+        assert json.loads(log.payloadSnapshot) == {
+            "chaptersAdded": len(chapters),
+            "disconnected": True,
+        }
+
+    async def test_stream_unknown_novel_is_404(self, admin_client):
+        response = await admin_client.post("/api/admin/novels/999/chapters/stream", content=b"")
+        assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_iter_ndjson_lines_splits_across_chunks_and_caps_length():
+    from app.utils.ndjson import iter_ndjson_lines
+
+    async def chunks():
+        for piece in (b'{"a"', b':1}\n\n{"b":2}\nxxxxxxxx', b"xxxx\n", b'{"c":3}'):
+            yield piece
+
+    lines = [item async for item in iter_ndjson_lines(chunks(), max_line_bytes=10)]
+
+    assert lines == [(1, b'{"a":1}'), (3, b'{"b":2}'), (4, None), (5, b'{"c":3}')]
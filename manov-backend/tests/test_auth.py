@@ -1,6 +1,9 @@
 """Smoke tests for the authentication router."""
 
+from datetime import timedelta
+
 import pytest
+from sqlmodel import select
 
 from app.models import User
 from app.utils.security import get_password_hash
@@ -129,3 +132,194 @@ async def test_get_me_without_token(client):
     """GET /api/auth/me without token should return 401."""
     response = await client.get("/api/auth/me")
     assert response.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_login_rehashes_outdated_cost(client, db_session):
+    """A hash made with an old bcrypt cost is upgraded transparently on login."""
+    from app.utils.security import BCRYPT_ROUNDS, password_needs_rehash, verify_password
+
+    user = User(
+        username="olduser",
+        email="old@example.com",
+        password=get_password_hash("secret123", rounds=4),
+        role="USER",
+        coins=0,
+    )
+    db_session.add(user)
+    await db_session.commit()
+    assert password_needs_rehash(user.password)
+
+    response = await client.post(
+        "/api/auth/login",
+        json={"email": "old@example.com", "password": "secret123"},
+    )
+
+    assert response.status_code == 200
+    await db_session.refresh(user)
+    assert user.password.split("$")[2] == f"{BCRYPT_ROUNDS:02d}"
+    assert not password_needs_rehash(user.password)
+    assert verify_password("secret123", user.password)
+
+
+@pytest.mark.anyio
+async def test_password_hasher_bounds_queue():
+    """Calls past max_queue fail fast instead of waiting; metrics track the queue."""
+    import asyncio
+
+    from app.services.password_hasher import HasherBusyError, PasswordHasher
+
+    hasher = PasswordHasher(workers=1, max_queue=1)
+    hashed = get_password_hash("secret123", rounds=4)
+    try:
+        running = asyncio.create_task(hasher.verify("secret123", hashed))
+        waiting = asyncio.create_task(hasher.verify("wrong", hashed))
+        await asyncio.sleep(0)
+        assert hasher.metrics.running == 1
+        assert hasher.metrics.queued == 1
+
+        with pytest.raises(HasherBusyError):
+            await hasher.verify("secret123", hashed)
+
+        assert await running is True
+        assert await waiting is False
+        assert hasher.metrics.snapshot()["completed"] == 2
+        assert hasher.metrics.rejected == 1
+        assert hasher.metrics.peak_queued == 1
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.anyio
+async def test_reset_password_with_token(client, db_session):
+    """forgot-password issues a token that reset-password accepts exactly once."""
+    from app.utils.security import verify_password
+
+    user = User(username="resetme", email="reset@example.com", password=get_password_hash("old"))
+    db_session.add(user)
+    await db_session.commit()
+
+    token = (
+        await client.post("/api/auth/forgot-password", json={"email": "reset@example.com"})
+    ).json()["token"]
+    body = {"token": token, "new_password": "new-secret"}
+
+    response = await client.post("/api/auth/reset-password", json=body)
+    assert response.status_code == 200
+    await db_session.refresh(user)
+    assert verify_password("new-secret", user.password)
+    assert user.resetTokenHash is None
+
+    response = await client.post("/api/auth/reset-password", json=body)
+    assert response.status_code == 400
+
+
+async def _user_with_reset_token(db_session, name: str, expires_in: timedelta) -> tuple[str, User]:
+    from app.models import utc_now
+    from app.utils.security import generate_reset_token
+
+    token, token_hash = generate_reset_token()
+    user = User(
+        username=name,
+        email=f"{name}@example.com",
+        password="x",
+        resetTokenHash=token_hash,
+        resetTokenExpires=utc_now() + expires_in,
+    )
+    db_session.add(user)
+    await db_session.commit()
+    return token, user
+
+
+@pytest.mark.anyio
+async def test_reset_password_rejects_expired_token(client, db_session):
+    """Expiry is enforced by the lookup itself."""
+    token, _ = await _user_with_reset_token(db_session, "late", timedelta(minutes=-1))
+
+    response = await client.post(
+        "/api/auth/reset-password", json={"token": token, "new_password": "new-secret"}
+    )
+
+    assert response.status_code == 400
+    assert "expired" in response.json()["detail"]
+
+
+@pytest.mark.anyio
+async def test_reset_token_sweeper_clears_expired_in_batches(db_session):
+    """Expired tokens are nulled batch by batch; pending ones are left alone."""
+    from app.database import get_session_factory
+    from app.main import app
+    from app.services.reset_token_sweeper import ResetTokenSweeper
+
+    for n in range(3):
+        await _user_with_reset_token(db_session, f"gone{n}", timedelta(minutes=-5))
+    token, pending = await _user_with_reset_token(db_session, "pending", timedelta(minutes=30))
+
+    sweeper = ResetTokenSweeper(app.dependency_overrides[get_session_factory](), batch_size=2)
+    assert await sweeper.sweep() == 3
+
+    remaining = (
+        (await db_session.execute(select(User.username).where(User.resetTokenHash.isnot(None))))
+        .scalars()
+        .all()
+    )
+    assert remaining == ["pending"]
+    assert await sweeper.sweep() == 0
+
+
+@pytest.mark.anyio
+async def test_decoded_token_cache_respects_exp():
+    """Cached claims are served only until the token's own exp."""
+    from app.utils.tokens import DecodedTokenCache
+
+    now = 1_000_000.0
+    cache = DecodedTokenCache(max_entries=2, clock=lambda: now)
+    cache.put("a.b.c", {"sub": "1", "exp": now + 60})
+    cache.put("no.exp.token", {"sub": "2"})
+
+    assert cache.get("a.b.c") == {"sub": "1", "exp": now + 60}
+    assert cache.get("no.exp.token") is None  # never cached without exp
+
+    now += 60
+    assert cache.get("a.b.c") is None
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("name", ["jose", "pyjwt"])
+async def test_jwt_backends_interoperate(name):
+    """Every backend reads tokens issued by the others and rejects tampered ones."""
+    from datetime import UTC, datetime
+
+    from app.utils.security import ALGORITHM, SECRET_KEY
+    from app.utils.tokens import (
+        DecodedTokenCache,
+        TokenError,
+        available_backends,
+        backend_available,
+        decode_token,
+        get_backend,
+    )
+
+    if not backend_available(name):
+        pytest.skip(f"{name} is not installed")
+    backend = get_backend(name)
+    expires = int(datetime.now(UTC).timestamp()) + 600
+    for other in available_backends():
+        token = get_backend(other).encode({"sub": "7", "exp": expires}, SECRET_KEY, ALGORITHM)
+        assert backend.decode(token, SECRET_KEY, ALGORITHM)["sub"] == "7"
+
+    with pytest.raises(TokenError):
+        backend.decode(token[:-2] + "xx", SECRET_KEY, ALGORITHM)
+
+    cache = DecodedTokenCache()
+    decode_token(token, SECRET_KEY, ALGORITHM, cache)
+    assert decode_token(token, SECRET_KEY, ALGORITHM, cache)["sub"] == "7"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_jwt_backend_defaults_to_jose_even_with_pyjwt_installed():
+    from app.config import settings
+    from app.utils.tokens import get_backend
+
+    assert get_backend("auto").name == "jose"
+    assert get_backend(settings.JWT_BACKEND).name == "jose"
@@ -0,0 +1,59 @@
+"""Golden-file tests: every parser backend must match the recorded output."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.services.chapter_parser import BACKENDS, backend_available, extract_chapter
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PAGES = sorted(FIXTURES.glob("69shuba_chapter_*.html"))
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+@pytest.mark.parametrize("page", PAGES, ids=lambda p: p.stem)
+def test_backend_matches_golden_file(backend, page):
+    if not backend_available(backend):
+        pytest.skip(f"{backend} not installed")
+    expected = json.loads(page.with_suffix(".expected.json").read_text(encoding="utf-8"))
+
+    title, content, next_url = BACKENDS[backend](page.read_text(encoding="utf-8"))
+
+    assert title == expected["title"]
+    assert next_url == expected["next_url"]
+    assert content == expected["content"]
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_backend_rejects_page_without_chapter(backend):
+    if not backend_available(backend):
+        pytest.skip(f"{backend} not installed")
+    challenge = "<html><head><title>Just a moment...</title></head><body></body></html>"
+
+    assert BACKENDS[backend](challenge) is None
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_backend_drops_scraper_junk_and_stops_at_chapter_end(backend):
+    if not backend_available(backend):
+        pytest.skip(f"{backend} not installed")
+    page = """<html><head><title>第1章 开始-69书吧</title></head><body>
+        <div class="mybox"><div class="txtnav">
+            <h3>作者：某人</h3>
+            <div class="tools">加入书签</div>
+            第一段<br>第二段
+            <p>(本章完)</p>
+            <p>求月票</p>
+        </div></div>
+    </body></html>"""
+
+    title, content, next_url = BACKENDS[backend](page)
+
+    assert (title, content, next_url) == ("第1章 开始", "第一段\n\n第二段", None)
+
+
+def test_extract_chapter_uses_configured_backend():
+    html = PAGES[0].read_text(encoding="utf-8")
+
+    assert extract_chapter(html) == BACKENDS["bs4"](html)
@@ -0,0 +1,268 @@
+"""Tests for the crawler helpers (no browser needed)."""
+
+import asyncio
+import contextlib
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.services.browser_pool import HostScheduler
+from app.services.chapter_fetcher import decode_html, find_next_url, is_challenge_page
+from app.services.scraper_crawler import AsyncNovelCrawler
+
+
+@pytest.mark.anyio
+async def test_host_scheduler_spaces_same_host_only():
+    scheduler = HostScheduler(min_delay=0.2, max_delay=0.2)
+    start = time.monotonic()
+
+    async def hit(url):
+        await scheduler.wait(url)
+        return time.monotonic() - start
+
+    a1, a2, b1 = await asyncio.gather(
+        hit("https://www.69shuba.com/txt/1/1"),
+        hit("https://www.69shuba.com/txt/1/2"),
+        hit("https://other.example/txt/1"),
+    )
+
+    assert sorted([a1, a2])[1] >= 0.2
+    assert b1 < 0.1
+
+
+class _FakePage:
+    def __init__(self, pages: dict[str, tuple[str, str | None]]):
+        self.pages = pages
+        self.url = None
+
+    async def goto(self, url, timeout=0):
+        self.url = url
+        await asyncio.sleep(0.01)
+
+    async def wait_for_selector(self, selector, **kwargs):
+        return None
+
+    async def eval_on_selector_all(self, selector, script):
+        return self.pages[self.url][1]
+
+    async def content(self):
+        return self.pages[self.url][0]
+
+
+class _FakePool:
+    def __init__(self, page):
+        self._page = page
+        self.borrowed = 0
+
+    @asynccontextmanager
+    async def page(self):
+        self.borrowed += 1
+        try:
+            yield self._page
+        finally:
+            self.borrowed -= 1
+
+
+def _chapter_html(num: int) -> str:
+    return (
+        f"<html><head><title>第{num}章 标题-书名-69书吧</title></head><body>"
+        f'<div class="txtnav"><h1>第{num}章</h1>正文{num}<br><br>第二段</div></body></html>'
+    )
+
+
+@pytest.mark.anyio
+async def test_pipelined_crawler_yields_chapters_in_order(tmp_path):
+    urls = [f"https://example.test/txt/{n}" for n in range(1, 6)]
+    pages = {
+        url: (_chapter_html(n), urls[n] if n < len(urls) else None)
+        for n, url in enumerate(urls, start=1)
+    }
+    crawler = AsyncNovelCrawler(
+        output_dir=str(tmp_path),
+        pool=_FakePool(_FakePage(pages)),
+        scheduler=HostScheduler(0, 0),
+        prefetch=2,
+        fast_path=False,
+    )
+
+    chapters = [c async for c in crawler.iter_chapters(urls[0], max_chapters=0)]
+
+    assert [c["chapter_num"] for c in chapters] == [1, 2, 3, 4, 5]
+    assert chapters[2]["content"] == "正文3\n\n第二段"
+    assert chapters[2]["source_url"] == urls[2]
+    # The next link is kept so crawl state can resume without re-fetching
+    assert chapters[2]["next_url"] == urls[3]
+    assert chapters[4]["next_url"] is None
+    assert len(list(tmp_path.glob("chapter_*.json"))) == 5
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("stop", ["aclose", "raise"])
+async def test_crawler_stops_cleanly_while_prefetch_queue_is_full(tmp_path, stop):
+    urls = [f"https://example.test/txt/{n}" for n in range(1, 8)]
+    pages = {
+        url: (_chapter_html(n), urls[n] if n < len(urls) else None)
+        for n, url in enumerate(urls, start=1)
+    }
+    pool = _FakePool(_FakePage(pages))
+    crawler = AsyncNovelCrawler(
+        output_dir=str(tmp_path),
+        pool=pool,
+        scheduler=HostScheduler(0, 0),
+        prefetch=1,
+        fast_path=False,
+    )
+    tasks_before = len(asyncio.all_tasks())
+
+    async def consume():
+        async with contextlib.aclosing(crawler.iter_chapters(urls[0], max_chapters=0)) as chapters:
+            await anext(chapters)
+            await asyncio.sleep(0.1)  # let the producer fill the prefetch queue and block
+            if stop == "aclose":
+                await chapters.aclose()
+            else:
+                raise RuntimeError("consumer failed")
+
+    start = time.perf_counter()
+    if stop == "aclose":
+        await asyncio.wait_for(consume(), timeout=2)
+    else:
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(consume(), timeout=2)
+
+    # A hung producer would only be unblocked by wait_for's timeout
+    assert time.perf_counter() - start < 1
+    assert pool.borrowed == 0
+    assert len(asyncio.all_tasks()) == tasks_before
+
+
+def test_decode_html_detects_gbk_from_meta():
+    html = '<html><head><meta charset="gbk"></head><body>师父，徒儿知道</body></html>'
+
+    assert decode_html(html.encode("gbk")) == html
+    assert decode_html(html.encode("gbk"), "text/html; charset=GBK") == html
+
+
+def test_challenge_and_next_link_detection():
+    chapter = _chapter_html(1) + '<div class="page1"><a href="/txt/1/3">下一章</a></div>'
+
+    assert not is_challenge_page(200, chapter)
+    assert is_challenge_page(503, chapter)
+    assert is_challenge_page(200, "<title>Just a moment...</title>")
+    assert find_next_url(chapter, "https://www.69shuba.com/txt/1/2") == (
+        "https://www.69shuba.com/txt/1/3"
+    )
+
+
+class _FakeHttp:
+    """Challenged on the first request, fine once the browser cookies arrive."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.cookies: list[dict] = []
+        self.fetched: list[str] = []
+
+    async def fetch(self, url):
+        if not self.cookies:
+            return None
+        self.fetched.append(url)
+        return self.pages[url][0]
+
+    def load_cookies(self, cookies):
+        self.cookies = cookies
+
+
+class _FakeContext:
+    async def cookies(self):
+        return [{"name": "cf_clearance", "value": "ok", "domain": ".example.test", "path": "/"}]
+
+
+@pytest.mark.anyio
+async def test_crawler_falls_back_to_browser_then_reuses_its_cookies(tmp_path):
+    urls = [f"https://example.test/txt/{n}" for n in range(1, 4)]
+    pages = {
+        url: (
+            _chapter_html(n)
+            + (f'<div class="page1"><a href="{urls[n]}">下一章</a></div>' if n < len(urls) else ""),
+            urls[n] if n < len(urls) else None,
+        )
+        for n, url in enumerate(urls, start=1)
+    }
+    page = _FakePage(pages)
+    page.context = _FakeContext()
+    http = _FakeHttp(pages)
+    crawler = AsyncNovelCrawler(
+        output_dir=str(tmp_path),
+        pool=_FakePool(page),
+        scheduler=HostScheduler(0, 0),
+        http=http,
+        fast_path=True,
+    )
+
+    chapters = [c async for c in crawler.iter_chapters(urls[0], max_chapters=0)]
+
+    assert [c["chapter_num"] for c in chapters] == [1, 2, 3]
+    assert http.cookies[0]["name"] == "cf_clearance"
+    # Only the challenged first page needed the browser
+    assert http.fetched == urls[1:]
+
+
+class _UpperTranslator:
+    completion_tokens = 0
+
+    async def translate(self, text: str) -> str:
+        return text.upper()
+
+
+@pytest.mark.anyio
+async def test_processor_releases_browser_page_when_saving_fails(tmp_path, monkeypatch):
+    from app.database import get_session_factory
+    from app.main import app
+    from app.services import processor as processor_module
+    from app.services.translation_pool import TranslationPool
+
+    urls = [f"https://example.test/txt/{n}" for n in range(1, 8)]
+    pages = {
+        url: (_chapter_html(n), urls[n] if n < len(urls) else None)
+        for n, url in enumerate(urls, start=1)
+    }
+    pool = _FakePool(_FakePage(pages))
+
+    def crawler_factory(output_dir):
+        return AsyncNovelCrawler(
+            output_dir=output_dir,
+            pool=pool,
+            scheduler=HostScheduler(0, 0),
+            prefetch=1,
+            fast_path=False,
+        )
+
+    async def failing_save(*args, **kwargs):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(
+        processor_module, "AsyncSessionLocal", app.dependency_overrides[get_session_factory]()
+    )
+    monkeypatch.setattr(processor_module, "AsyncNovelCrawler", crawler_factory)
+    service = processor_module.NovelProcessorService()
+    service.raw_dir = str(tmp_path)
+    service.pool = TranslationPool(_UpperTranslator(), concurrency=1)
+    monkeypatch.setattr(service, "_save_chapter", failing_save)
+    # Hold on to the generators (as a traceback cycle would) so GC can't close them for us
+    streams = []
+    translate_in_order = service.pool.translate_in_order
+
+    def tracked(jobs):
+        streams.append(translate_in_order(jobs))
+        return streams[-1]
+
+    monkeypatch.setattr(service.pool, "translate_in_order", tracked)
+    tasks_before = len(asyncio.all_tasks())
+
+    await asyncio.wait_for(service.process_novel("leaky", urls[0], "Leaky"), timeout=2)
+
+    # Closed deterministically, not whenever the generators get garbage collected
+    assert pool.borrowed == 0
+    assert len(asyncio.all_tasks()) == tasks_before
+    assert len(streams) == 1
@@ -171,3 +171,199 @@ async def test_get_chapter_content_with_auth_creates_history(client, db_session)
     )
     assert history is not None
     assert history.chapterNum == 1
+
+
+async def _seed_chapters(db_session, count=3):
+    from app.models import Chapter, ChapterTranslation
+
+    novel = Novel(
+        title="Indexed Novel",
+        slug="indexed-novel",
+        originalTitle="Original",
+        status="ONGOING",
+    )
+    db_session.add(novel)
+    await db_session.commit()
+    await db_session.refresh(novel)
+
+    for num in range(1, count + 1):
+        chapter = Chapter(novelId=novel.id, chapterNum=num, rawContent="raw " * 100)
+        db_session.add(chapter)
+        await db_session.commit()
+        await db_session.refresh(chapter)
+        db_session.add(
+            ChapterTranslation(
+                chapterId=chapter.id, language="EN", title=f"Chapter {num}", content="en"
+            )
+        )
+        db_session.add(
+            ChapterTranslation(
+                chapterId=chapter.id, language="ID", title=f"Bab {num}", content="id"
+            )
+        )
+    await db_session.commit()
+    return novel
+
+
+@pytest.mark.anyio
+async def test_get_novel_detail_chapter_index(client, db_session):
+    """Novel detail should list chapters in order with only the EN translation."""
+    await _seed_chapters(db_session, count=3)
+
+    response = await client.get("/api/novels/indexed-novel")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["chapterCount"] == 3
+    assert [c["chapterNum"] for c in data["chapters"]] == [1, 2, 3]
+    for ch in data["chapters"]:
+        assert len(ch["translations"]) == 1
+        assert ch["translations"][0]["language"] == "EN"
+
+
+@pytest.mark.anyio
+async def test_get_novel_chapter_index_paginated(client, db_session):
+    """GET /api/novels/{slug}/chapters should support skip/limit and a number range."""
+    await _seed_chapters(db_session, count=5)
+
+    page = await client.get("/api/novels/indexed-novel/chapters?skip=1&limit=2")
+    assert page.status_code == 200
+    assert [c["chapterNum"] for c in page.json()] == [2, 3]
+
+    ranged = await client.get("/api/novels/indexed-novel/chapters?start=4&end=5")
+    assert [c["chapterNum"] for c in ranged.json()] == [4, 5]
+    assert ranged.json()[0]["translations"][0]["title"] == "Chapter 4"
+
+
+@pytest.mark.anyio
+async def test_get_chapter_content_prev_next(client, db_session):
+    """Reader endpoint should resolve prev/next chapter numbers in one lookup."""
+    await _seed_chapters(db_session, count=3)
+
+    middle = await client.get("/api/novels/indexed-novel/chapters/2")
+    assert middle.status_code == 200
+    assert middle.json()["prevChapterNum"] == 1
+    assert middle.json()["nextChapterNum"] == 3
+    assert middle.json()["novelTitle"] == "Indexed Novel"
+
+    last = await client.get("/api/novels/indexed-novel/chapters/3")
+    assert last.json()["nextChapterNum"] is None
+
+    missing = await client.get("/api/novels/indexed-novel/chapters/9")
+    assert missing.status_code == 404
+    assert missing.json()["detail"] == "Chapter not found"
+
+
+@pytest.mark.anyio
+async def test_track_view_is_buffered_then_flushed(client, db_session):
+    """Views are buffered in memory and applied with one UPDATE per novel on flush."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.services.view_counter import ViewCountBuffer, view_counter
+
+    novel = Novel(title="Viewed", slug="viewed", originalTitle="Original", status="ONGOING")
+    db_session.add(novel)
+    await db_session.commit()
+    await db_session.refresh(novel)
+
+    for _ in range(3):
+        response = await client.post("/api/novels/viewed/track-view")
+        assert response.status_code == 200
+
+    # Nothing written yet
+    await db_session.refresh(novel)
+    assert novel.viewCount == 0
+
+    # Flush the app's buffered counts through the test database
+    buffer = ViewCountBuffer(
+        view_counter.backend, async_sessionmaker(db_session.bind, expire_on_commit=False)
+    )
+    assert await buffer.flush() == 3
+
+    await db_session.refresh(novel)
+    assert novel.viewCount == 3
+    assert await buffer.flush() == 0
+
+
+@pytest.mark.anyio
+async def test_view_flush_loop_survives_backend_errors(db_session):
+    """A failing drain is logged and retried on the next tick, not fatal to the loop."""
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.services.view_counter import InMemoryViewCounterBackend, ViewCountBuffer
+
+    class FlakyBackend(InMemoryViewCounterBackend):
+        failures = 1
+
+        async def drain(self):
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("redis unavailable")
+            return await super().drain()
+
+    novel = Novel(title="Flaky", slug="flaky", originalTitle="Original", status="ONGOING")
+    db_session.add(novel)
+    await db_session.commit()
+
+    backend = FlakyBackend()
+    buffer = ViewCountBuffer(
+        backend, async_sessionmaker(db_session.bind, expire_on_commit=False), flush_interval=0.01
+    )
+    await buffer.record(novel.id, 2)
+    buffer.start()
+    await asyncio.sleep(0.1)
+    await buffer.stop()
+
+    assert backend.failures == 0
+    await db_session.refresh(novel)
+    assert novel.viewCount == 2
+
+
+@pytest.mark.anyio
+async def test_search_novels_fallback(client, db_session):
+    """Search falls back to ILIKE on SQLite and matches title, author or synopsis."""
+    db_session.add_all(
+        [
+            Novel(title="Sword God", slug="sword-god", originalTitle="o", author="Li"),
+            Novel(title="Other", slug="other", originalTitle="o", synopsis="A sword saint."),
+            Novel(title="Unrelated", slug="unrelated", originalTitle="o"),
+        ]
+    )
+    await db_session.commit()
+
+    response = await client.get("/api/novels?q=sword")
+
+    assert response.status_code == 200
+    assert {n["slug"] for n in response.json()} == {"sword-god", "other"}
+
+
+@pytest.mark.anyio
+async def test_get_all_novels_cursor_pagination(client, db_session):
+    """Keyset pages over (sort column, id) should not overlap or skip rows."""
+    db_session.add_all(
+        [
+            Novel(title=f"Novel {i}", slug=f"novel-{i}", originalTitle="o", viewCount=i % 2)
+            for i in range(5)
+        ]
+    )
+    await db_session.commit()
+
+    seen = []
+    cursor = ""
+    while True:
+        response = await client.get(
+            f"/api/novels?sort_by=viewCount&limit=2&cursor={cursor}"
+        )
+        assert response.status_code == 200
+        seen.extend(n["slug"] for n in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+    nullable = await client.get(f"/api/novels?sort_by=author&cursor={cursor or 'x'}")
+    assert nullable.status_code == 400
@@ -2,7 +2,7 @@
 
 import pytest
 
-from app.models import Chapter, Novel, User
+from app.models import Chapter, Novel, Review, User
 from app.utils.security import create_access_token, get_password_hash
 
 
@@ -233,3 +233,83 @@ async def test_comment_sanitization(client, db_session):
     data = response.json()
     assert "<script>" not in data["content"]
     assert "Hello" in data["content"]
+
+
+@pytest.mark.anyio
+async def test_review_update_and_delete_adjust_aggregates(client, db_session):
+    """Editing or deleting a review moves the novel's stored average incrementally."""
+    from app.crud import create_review
+
+    user1 = await _create_user(db_session, email="user1@example.com")
+    user2 = await _create_user(db_session, email="user2@example.com")
+    novel = await _create_novel(db_session)
+    token1 = create_access_token(data={"sub": str(user1.id), "role": user1.role})
+
+    # Seed via crud: POST /reviews is rate limited across the whole test session
+    review = await create_review(
+        db_session, Review(userId=user1.id, novelId=novel.id, score=2, content="Meh")
+    )
+    review_id = review.id
+    await create_review(
+        db_session, Review(userId=user2.id, novelId=novel.id, score=4, content="Good")
+    )
+
+    await client.put(
+        f"/api/reviews/{review_id}",
+        json={"score": 5, "content": "Grew on me"},
+        headers={"Authorization": f"Bearer {token1}"},
+    )
+    await db_session.refresh(novel)
+    assert (novel.ratingSum, novel.ratingCount, novel.averageRating) == (9, 2, 4.5)
+
+    await client.delete(
+        f"/api/reviews/{review_id}", headers={"Authorization": f"Bearer {token1}"}
+    )
+    await db_session.refresh(novel)
+    assert (novel.ratingSum, novel.ratingCount, novel.averageRating) == (4, 1, 4.0)
+
+
+@pytest.mark.anyio
+async def test_reconcile_rating_stats_fixes_drift(db_session):
+    from app.crud import reconcile_novel_rating_stats, upsert_rating
+
+    user1 = await _create_user(db_session, email="user1@example.com")
+    user2 = await _create_user(db_session, email="user2@example.com")
+    novel = await _create_novel(db_session)
+    db_session.add(Review(userId=user1.id, novelId=novel.id, score=5, content="Great"))
+    await db_session.commit()
+    # user1's legacy rating is overridden by their review; user2's still counts
+    await upsert_rating(db_session, user1.id, novel.id, 1)
+    await upsert_rating(db_session, user2.id, novel.id, 2)
+
+    novel.ratingSum, novel.ratingCount, novel.averageRating = 99, 9, 11.0
+    await db_session.commit()
+
+    await reconcile_novel_rating_stats(db_session, [novel.id], commit=True)
+    await db_session.refresh(novel)
+    assert (novel.ratingSum, novel.ratingCount, novel.averageRating) == (7, 2, 3.5)
+
+
+@pytest.mark.anyio
+async def test_update_review_takes_delta_from_stored_score(db_session):
+    """An edit computed from a stale copy of the review must not skew ratingSum."""
+    from app.crud import create_review, update_review
+    from app.database import get_session_factory
+    from app.main import app
+
+    user = await _create_user(db_session)
+    novel = await _create_novel(db_session)
+    review = await create_review(
+        db_session, Review(userId=user.id, novelId=novel.id, score=5, content="Great")
+    )
+
+    # A concurrent request edits the same review first
+    async with app.dependency_overrides[get_session_factory]()() as other:
+        await update_review(other, await other.get(Review, review.id), 3, "Fine")
+
+    # This request still holds the review as it loaded it (score 5)
+    assert review.score == 5
+    await update_review(db_session, review, 4, "Good")
+
+    await db_session.refresh(novel)
+    assert (novel.ratingSum, novel.ratingCount) == (4, 1)
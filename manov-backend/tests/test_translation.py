@@ -0,0 +1,207 @@
+"""Tests for the translation pipeline (no LLM server needed)."""
+
+import asyncio
+
+import pytest
+
+from app.services.translation_pool import TranslationJob, TranslationPool
+from app.services.translator import LLMTranslator, chunk_paragraphs, split_paragraphs
+
+
+class FakeTranslator:
+    """Stands in for LLMTranslator: per-text delays, counts in-flight calls."""
+
+    def __init__(self, delays: dict[str, float] | None = None):
+        self.delays = delays or {}
+        self.completion_tokens = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def translate(self, text: str) -> str:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(text, 0.01))
+            self.completion_tokens += len(text.split())
+            return text.upper()
+        finally:
+            self.in_flight -= 1
+
+
+class EchoLLMTranslator(LLMTranslator):
+    """LLMTranslator with the HTTP call replaced by a tagging echo."""
+
+    def __init__(self, merge_paragraphs: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.merge_paragraphs = merge_paragraphs
+        self.prompts: list[str] = []
+
+    async def _request_llm(self, text: str, system_prompt: str, user_prefix: str) -> str:
+        self.prompts.append(text)
+        paragraphs = split_paragraphs(text)
+        if self.merge_paragraphs and len(paragraphs) > 1:
+            return " ".join(paragraphs)
+        return "\n\n".join(f"EN({p})" for p in paragraphs)
+
+
+def test_chunk_paragraphs_respects_budget_and_order():
+    paragraphs = ["一" * 40, "二" * 40, "三" * 40, "四" * 200]
+
+    chunks = chunk_paragraphs(paragraphs, max_tokens=100)
+
+    assert chunks == [paragraphs[:2], paragraphs[2:3], paragraphs[3:]]
+
+
+@pytest.mark.anyio
+async def test_translate_chunks_long_content_and_keeps_paragraphs():
+    translator = EchoLLMTranslator(chunk_tokens=50)
+    source = "\n\n".join(f"第{n}段" + "字" * 20 for n in range(10))
+
+    result = await translator.translate(source)
+
+    paragraphs = split_paragraphs(result)
+    assert len(paragraphs) == 10
+    assert paragraphs[3] == "EN(EN(第3段" + "字" * 20 + "))"
+    # Several prompts, none carrying the whole chapter
+    assert all(len(split_paragraphs(p)) < 10 for p in translator.prompts)
+
+
+@pytest.mark.anyio
+async def test_translate_retries_per_paragraph_when_model_merges():
+    translator = EchoLLMTranslator(merge_paragraphs=True, chunk_tokens=1000)
+
+    result = await translator.translate("甲\n\n乙\n\n丙")
+
+    assert split_paragraphs(result) == ["EN(EN(甲))", "EN(EN(乙))", "EN(EN(丙))"]
+
+
+@pytest.mark.anyio
+async def test_pool_yields_results_in_chapter_order():
+    # Chapter 1 is the slowest, so it finishes last but must still come first
+    translator = FakeTranslator({"content 1": 0.1, "content 2": 0.05})
+    pool = TranslationPool(translator, concurrency=3, timeout=5)
+    jobs = [TranslationJob(n, f"title {n}", f"content {n}") for n in range(1, 6)]
+
+    results = [r async for r in pool.translate_in_order(jobs)]
+
+    assert [r.job.chapter_num for r in results] == [1, 2, 3, 4, 5]
+    assert results[0].content == "CONTENT 1" and results[0].title == "TITLE 1"
+    assert 1 < translator.max_in_flight <= 3
+    assert pool.metrics.chapters == 5
+    assert pool.metrics.tokens == 20
+    assert pool.metrics.chapters_per_min > 0
+
+
+@pytest.mark.anyio
+async def test_pool_reports_timeouts_without_stopping():
+    translator = FakeTranslator({"content 2": 1.0})
+    pool = TranslationPool(translator, concurrency=2, timeout=0.2)
+    jobs = [TranslationJob(n, f"title {n}", f"content {n}") for n in range(1, 4)]
+
+    results = [r async for r in pool.translate_in_order(jobs)]
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert "timed out" in results[1].error
+    assert pool.metrics.failed == 1
+
+
+@pytest.mark.anyio
+async def test_pool_consumes_async_stream_with_backpressure():
+    translator = FakeTranslator()
+    pool = TranslationPool(translator, concurrency=2, timeout=5)
+    produced: list[int] = []
+
+    async def crawl():
+        for n in range(1, 21):
+            produced.append(n)
+            yield TranslationJob(n, f"title {n}", f"content {n}")
+        raise RuntimeError("crawler died")
+
+    seen = []
+    with pytest.raises(RuntimeError, match="crawler died"):
+        async for result in pool.translate_in_order(crawl()):
+            if result.job.chapter_num == 1:
+                # A slow consumer: the producer may only run a few jobs ahead
+                await asyncio.sleep(0.1)
+                assert len(produced) <= 10
+            seen.append(result.job.chapter_num)
+
+    # Everything produced before the failure is still delivered, in order
+    assert seen == list(range(1, 21))
+
+
+@pytest.mark.anyio
+async def test_translation_cache_makes_warm_rerun_free(tmp_path):
+    from app.services.translation_cache import TranslationCache
+
+    cache = TranslationCache(str(tmp_path / "tm.db"))
+    source = "第一章\n\n作者的话\n\n正文"
+
+    cold = EchoLLMTranslator(cache=cache)
+    first = await cold.translate(source)
+    assert cold.prompts and cache.misses > 0
+
+    warm = EchoLLMTranslator(cache=cache)
+    assert await warm.translate(source) == first
+    assert warm.prompts == []
+
+    # Recurring paragraph (author note) is served from paragraph-level memory
+    partial = EchoLLMTranslator(cache=cache)
+    result = await partial.translate("第二章\n\n作者的话")
+    assert split_paragraphs(result)[1] == "EN(EN(作者的话))"
+    assert all("作者的话" not in p for p in partial.prompts)
+
+
+def test_translation_cache_evicts_least_recently_used(tmp_path):
+    from app.services.translation_cache import TranslationCache
+
+    cache = TranslationCache(str(tmp_path / "tm.db"), max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+    cache.evict()
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+@pytest.mark.anyio
+async def test_translate_fails_chapter_instead_of_dropping_cached_paragraphs(tmp_path):
+    from app.services.translation_cache import TranslationCache
+
+    cache = TranslationCache(str(tmp_path / "tm.db"))
+    await EchoLLMTranslator(cache=cache).translate("作者的话")
+
+    class LosingTranslator(EchoLLMTranslator):
+        async def _translate_chunk(self, paragraphs):
+            return (await super()._translate_chunk(paragraphs))[:-1]
+
+    translator = LosingTranslator(cache=cache)
+    with pytest.raises(RuntimeError, match="paragraph count mismatch"):
+        await translator.translate("第一章\n\n作者的话\n\n正文")
+
+    # Nothing half-translated was remembered for the chapter
+    assert cache.get(translator._cache_key("第一章\n\n作者的话\n\n正文")) is None
+    cache.close()
+
+
+@pytest.mark.anyio
+async def test_translation_cache_commits_once_per_translate(tmp_path):
+    from app.services.translation_cache import TranslationCache
+
+    cache = TranslationCache(str(tmp_path / "tm.db"))
+    await EchoLLMTranslator(cache=cache).translate("甲\n\n乙")
+    statements: list[str] = []
+    cache._conn.set_trace_callback(statements.append)
+
+    # Two paragraph hits, two misses, three puts (two paragraphs + the chapter)
+    await EchoLLMTranslator(cache=cache).translate("甲\n\n丙\n\n乙\n\n丁")
+
+    writes = [s for s in statements if not s.lstrip().upper().startswith("SELECT")]
+    assert sum(s.upper() == "COMMIT" for s in writes) == 1
+    assert len([s for s in statements if "SELECT key" in s]) == 2
+    assert len(cache) == 6
+    cache.close()
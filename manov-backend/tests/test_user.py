@@ -132,3 +132,205 @@ async def test_get_history(client, db_session):
     assert len(data) == 1
     assert data[0]["lastReadChapter"] == 5
     assert data[0]["id"] == novel.id
+
+
+@pytest.mark.anyio
+async def test_notifications_cursor_pagination(client, db_session):
+    from datetime import datetime, timedelta
+
+    from app.models import Notification
+
+    user = await _create_user(db_session)
+    token = create_access_token(data={"sub": str(user.id), "role": user.role})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    base = datetime(2026, 1, 1)
+    for i in range(5):
+        db_session.add(
+            Notification(
+                userId=user.id,
+                type="NEW_CHAPTER",
+                message=f"n{i}",
+                createdAt=base + timedelta(minutes=i),
+            )
+        )
+    await db_session.commit()
+
+    first = await client.get("/api/user/notifications?limit=2", headers=headers)
+    assert [n["message"] for n in first.json()] == ["n4", "n3"]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = await client.get(f"/api/user/notifications?limit=2&cursor={cursor}", headers=headers)
+    assert [n["message"] for n in second.json()] == ["n2", "n1"]
+
+    last = await client.get(
+        f"/api/user/notifications?limit=2&cursor={second.headers['X-Next-Cursor']}",
+        headers=headers,
+    )
+    assert [n["message"] for n in last.json()] == ["n0"]
+    assert "X-Next-Cursor" not in last.headers
+
+    bad = await client.get("/api/user/notifications?cursor=not-a-cursor", headers=headers)
+    assert bad.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_chapter_notifier_fans_out_to_library_in_background(client, db_session):
+    from app.database import get_session_factory
+    from app.main import app
+    from app.models import Chapter, Library
+    from app.services.notifier import ChapterEvent, ChapterNotifier
+
+    novel = await _create_novel(db_session)
+    follower = await _create_user(db_session)
+    other = await _create_user(db_session, email="other@example.com")
+    db_session.add(Library(userId=follower.id, novelId=novel.id))
+    chapter = Chapter(novelId=novel.id, chapterNum=7, rawContent="raw")
+    db_session.add(chapter)
+    await db_session.commit()
+
+    notifier = ChapterNotifier(app.dependency_overrides[get_session_factory]())
+    notifier.publish(ChapterEvent(novel.id, novel.title, chapter.id, 7))
+    await notifier.stop()
+
+    for user, expected in ((follower, 1), (other, 0)):
+        token = create_access_token(data={"sub": str(user.id), "role": user.role})
+        headers = {"Authorization": f"Bearer {token}"}
+        count = await client.get("/api/user/notifications/unread-count", headers=headers)
+        assert count.json()["count"] == expected
+
+    token = create_access_token(data={"sub": str(follower.id), "role": follower.role})
+    feed = await client.get("/api/user/notifications", headers={"Authorization": f"Bearer {token}"})
+    [item] = feed.json()
+    assert item["message"] == "Test Novel — Chapter 7 is now available!"
+    assert item["chapterId"] == chapter.id
+    assert item["isRead"] is False
+
+
+@pytest.mark.anyio
+async def test_fanin_notifications_share_feed_and_unread_count(client, db_session, monkeypatch):
+    from datetime import timedelta
+
+    from sqlmodel import select
+
+    from app.config import settings
+    from app.database import get_session_factory
+    from app.main import app
+    from app.models import Chapter, Library, Notification, NovelChapterEvent, utc_now
+    from app.services.notifier import ChapterEvent, ChapterNotifier
+
+    monkeypatch.setattr(settings, "NOTIFICATION_MODE", "fanin")
+    novel = await _create_novel(db_session)
+    follower = await _create_user(db_session)
+    db_session.add(
+        Library(userId=follower.id, novelId=novel.id, createdAt=utc_now() - timedelta(days=1))
+    )
+    # A row left over from fan-out mode still shows up
+    db_session.add(
+        Notification(
+            userId=follower.id,
+            type="NEW_CHAPTER",
+            message="legacy",
+            createdAt=utc_now() - timedelta(hours=1),
+        )
+    )
+    chapters = [Chapter(novelId=novel.id, chapterNum=n, rawContent="raw") for n in (1, 2)]
+    db_session.add_all(chapters)
+    await db_session.commit()
+
+    notifier = ChapterNotifier(app.dependency_overrides[get_session_factory]())
+    for chapter in chapters:
+        notifier.publish(ChapterEvent(novel.id, novel.title, chapter.id, chapter.chapterNum))
+    await notifier.stop()
+
+    # One row per chapter, none per follower
+    events = (await db_session.scalars(select(NovelChapterEvent))).all()
+    assert len(events) == 2
+
+    token = create_access_token(data={"sub": str(follower.id), "role": follower.role})
+    headers = {"Authorization": f"Bearer {token}"}
+    count = await client.get("/api/user/notifications/unread-count", headers=headers)
+    assert count.json()["count"] == 3
+
+    feed = (await client.get("/api/user/notifications?limit=2", headers=headers)).json()
+    assert [(n["source"], n["message"]) for n in feed] == [
+        ("event", "Test Novel — Chapter 2 is now available!"),
+        ("event", "Test Novel — Chapter 1 is now available!"),
+    ]
+    rest = await client.get("/api/user/notifications?limit=2&skip=2", headers=headers)
+    assert [n["message"] for n in rest.json()] == ["legacy"]
+
+    # Marking chapter 1 read leaves chapter 2 unread
+    chapter_1 = feed[1]["id"]
+    marked = await client.post(
+        f"/api/user/notifications/{chapter_1}/read?source=event", headers=headers
+    )
+    assert marked.status_code == 200
+    count = await client.get("/api/user/notifications/unread-count", headers=headers)
+    assert count.json()["count"] == 2
+
+    await client.post("/api/user/notifications/read-all", headers=headers)
+    count = await client.get("/api/user/notifications/unread-count", headers=headers)
+    assert count.json()["count"] == 0
+    feed = (await client.get("/api/user/notifications", headers=headers)).json()
+    assert all(n["isRead"] for n in feed)
+
+    # Someone who follows after the chapters were released gets nothing
+    late = await _create_user(db_session, email="late@example.com")
+    db_session.add(Library(userId=late.id, novelId=novel.id))
+    await db_session.commit()
+    token = create_access_token(data={"sub": str(late.id), "role": late.role})
+    count = await client.get(
+        "/api/user/notifications/unread-count", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert count.json()["count"] == 0
+
+
+@pytest.mark.anyio
+async def test_fanin_cursor_pages_through_createdat_ties_across_sources(
+    client, db_session, monkeypatch
+):
+    from datetime import timedelta
+
+    from app.config import settings
+    from app.models import Chapter, Library, Notification, NovelChapterEvent, utc_now
+
+    monkeypatch.setattr(settings, "NOTIFICATION_MODE", "fanin")
+    novel = await _create_novel(db_session)
+    user = await _create_user(db_session)
+    db_session.add(
+        Library(userId=user.id, novelId=novel.id, createdAt=utc_now() - timedelta(days=1))
+    )
+    chapters = [Chapter(novelId=novel.id, chapterNum=n, rawContent="raw") for n in (1, 2)]
+    db_session.add_all(chapters)
+    await db_session.commit()
+
+    # Both tables number their rows 1, 2 and every row shares one timestamp
+    tie = utc_now() - timedelta(hours=1)
+    for n in (1, 2):
+        db_session.add(
+            Notification(userId=user.id, type="SYSTEM", message=f"note {n}", createdAt=tie)
+        )
+        chapter = chapters[n - 1]
+        db_session.add(
+            NovelChapterEvent(
+                novelId=novel.id,
+                chapterId=chapter.id,
+                chapterNum=chapter.chapterNum,
+                message=f"event {n}",
+                createdAt=tie,
+            )
+        )
+    await db_session.commit()
+
+    token = create_access_token(data={"sub": str(user.id), "role": user.role})
+    headers = {"Authorization": f"Bearer {token}"}
+    seen, cursor = [], ""
+    while True:
+        page = await client.get(f"/api/user/notifications?limit=1&cursor={cursor}", headers=headers)
+        seen += [n["message"] for n in page.json()]
+        cursor = page.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert seen == ["note 2", "note 1", "event 2", "event 1"]